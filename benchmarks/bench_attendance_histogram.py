@@ -0,0 +1,92 @@
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+import bench_util  # noqa: F401  (menambahkan src ke sys.path)
+
+from database import Database
+from payroll_engine import month_bounds
+
+EMPLOYEES = 5000
+YEAR = 2025
+STATUSES = ("Hadir", "Sakit", "Izin", "Cuti", "Alpha")
+WEIGHTS = (90, 3, 2, 3, 2)
+
+
+def workdays(year):
+    day = date(year, 1, 1)
+    while day.year == year:
+        if day.weekday() < 5:
+            yield day.isoformat()
+        day += timedelta(days=1)
+
+
+def seed(db, employee_count):
+    rng = random.Random(42)
+    db.add_employees([(f"NIP{i:05d}", f"Karyawan {i}", "Staf", "Umum", 5_000_000_00, "2024-01-01", "Aktif")
+                      for i in range(employee_count)])
+    days = list(workdays(YEAR))
+    db.add_attendance_records((employee_id, day, "08:00", "17:00", rng.choices(STATUSES, WEIGHTS)[0])
+                              for day in days for employee_id in range(1, employee_count + 1))
+    return len(days) * employee_count
+
+
+def legacy_counts(db, employee_count):
+    # Cara lama per karyawan per bulan: get_attendance, satu pass untuk Alpha di process_payroll
+    # lalu lima pass (satu per status) di generate_payslip_pdf
+    histogram = {}
+    for month in range(1, 13):
+        start_date, end_date, _ = month_bounds(month, YEAR)
+        for employee_id in range(1, employee_count + 1):
+            attendance_records = db.get_attendance(employee_id, start_date, end_date)
+            sum(1 for r in attendance_records if r[5] == "Alpha")
+            counts = {status: sum(1 for r in attendance_records if r[5] == status) for status in STATUSES}
+            counts = {status: days for status, days in counts.items() if days}
+            if counts:
+                histogram[(employee_id, YEAR, month)] = counts
+    return histogram
+
+
+def histogram_per_month(db, employee_count):
+    # Seperti proses gaji: satu GROUP BY per bulan
+    histogram = {}
+    for month in range(1, 13):
+        start_date, end_date, _ = month_bounds(month, YEAR)
+        histogram.update(db.get_attendance_histogram(start_date, end_date))
+    return histogram
+
+
+def histogram_year(db, employee_count):
+    return db.get_attendance_histogram(f"{YEAR}-01-01", f"{YEAR}-12-31")
+
+
+def normalized(histogram):
+    return {key: dict(sorted(counts.items())) for key, counts in histogram.items()}
+
+
+def main():
+    employee_count = int(sys.argv[1]) if len(sys.argv) > 1 else EMPLOYEES
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'bench.db'))
+        start = time.perf_counter()
+        rows = seed(db, employee_count)
+        print(f"Rekap status absensi {YEAR} untuk {employee_count:,} karyawan ({rows:,} baris, "
+              f"seed {time.perf_counter() - start:.1f} s):")
+        expected = None
+        for label, func in (("GROUP BY setahun", histogram_year),
+                            ("GROUP BY per bulan", histogram_per_month),
+                            ("per karyawan, 6 pass", legacy_counts)):
+            start = time.perf_counter()
+            histogram = normalized(func(db, employee_count))
+            elapsed = time.perf_counter() - start
+            assert expected is None or histogram == expected
+            expected = histogram
+            print(f"  {label:>28}: {elapsed:6.2f} s ({len(histogram):,} karyawan-bulan)")
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+import csv
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+import bench_util  # noqa: F401  (menambahkan src ke sys.path)
+
+from attendance_import import import_punches, parse_punch, read_punches
+from database import Database
+
+EMPLOYEES = 1000
+DAYS = 22  # hari kerja dalam sebulan
+INVALID_EVERY = 500  # satu tap dari NIP tak dikenal per 500 tap untuk menguji file penolakan
+
+
+def seed(db, employee_count):
+    db.add_employees([(f"NIP{i:06d}", f"Karyawan {i}", "Staf", "Umum", 5_000_000_00, "2024-01-01", "Aktif")
+                      for i in range(employee_count)])
+
+
+def punches(employee_count):
+    # Tap masuk pagi + kadang tap ganda + tap keluar sore, diurutkan per waktu seperti log mesin
+    rng = random.Random(42)
+    events = []
+    for day in range(1, DAYS + 1):
+        for i in range(employee_count):
+            nip = f"NIP{i:06d}"
+            check_in = f"2025-06-{day:02d} {7 + rng.randint(0, 1):02d}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}"
+            events.append((check_in, nip, "masuk"))
+            if rng.random() < 0.2:
+                events.append((check_in[:-2] + "59", nip, "masuk"))
+            events.append((f"2025-06-{day:02d} {16 + rng.randint(0, 2):02d}:{rng.randint(0, 59):02d}:00", nip, "keluar"))
+    events.sort()
+    for index in range(INVALID_EVERY - 1, len(events), INVALID_EVERY):
+        events[index] = (events[index][0], "NIP-TIDAK-ADA", events[index][2])
+    return events
+
+
+def write_csv(filepath, events):
+    with open(filepath, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["Waktu", "NIP", "Jenis"])
+        writer.writerows(events)
+
+
+def write_jsonl(filepath, events):
+    with open(filepath, 'w', encoding='utf-8') as f:
+        for timestamp, nip, punch_type in events:
+            f.write(json.dumps({"timestamp": timestamp, "nip": nip, "type": punch_type}) + "\n")
+
+
+def per_punch_form(db, filepath):
+    # Cara lama record_check_in/record_check_out: SELECT lalu INSERT/UPDATE, commit per tap
+    employee_ids = db.get_employee_ids_by_nip(f"NIP{i:06d}" for i in range(EMPLOYEES * 10))
+    for line, values in read_punches(filepath):
+        punch = parse_punch(line, values)
+        employee_id = employee_ids.get(punch.employee)
+        if employee_id is None:
+            continue
+        if punch.punch_type == 'in':
+            db.cursor.execute('SELECT id FROM attendance WHERE employee_id = ? AND date = ?', (employee_id, punch.date))
+            if not db.cursor.fetchone():
+                db.add_attendance(employee_id, punch.date, punch.time, None, "Hadir")
+        else:
+            db.update_check_out(employee_id, punch.date, punch.time)
+
+
+def attendance_rows(db):
+    return db.conn.execute('SELECT employee_id, date, check_in, check_out FROM attendance '
+                           'ORDER BY employee_id, date').fetchall()
+
+
+def main():
+    employee_count = int(sys.argv[1]) if len(sys.argv) > 1 else EMPLOYEES
+    events = punches(employee_count)
+    rejected = len(range(INVALID_EVERY - 1, len(events), INVALID_EVERY))
+    print(f"Impor {len(events):,} tap mesin absensi ({employee_count:,} karyawan x {DAYS} hari):")
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'tap.csv')
+        jsonl_path = os.path.join(tmp, 'tap.jsonl')
+        write_csv(csv_path, events)
+        write_jsonl(jsonl_path, events)
+
+        db = Database(os.path.join(tmp, 'form.db'))
+        seed(db, employee_count)
+        start = time.perf_counter()
+        per_punch_form(db, csv_path)
+        elapsed = time.perf_counter() - start
+        print(f"  {'form per tap':>24}: {elapsed:6.2f} s ({len(events) / elapsed:>10,.0f} tap/detik)")
+        db.close()
+
+        expected = None
+        for label, filepath in (("import_punches CSV", csv_path), ("import_punches JSONL", jsonl_path)):
+            db = Database(os.path.join(tmp, f'{label.split()[-1]}.db'))
+            seed(db, employee_count)
+            report = import_punches(db, filepath)
+            assert report.imported == len(events) - rejected and len(report.errors) == rejected
+            print(f"  {label:>24}: {report.elapsed:6.2f} s ({report.rows_per_second:>10,.0f} tap/detik), "
+                  f"{report.upserts:,} upsert, {len(report.errors)} ditolak")
+            rows = attendance_rows(db)
+            # Impor ulang file yang sama tidak mengubah hasil
+            import_punches(db, filepath)
+            assert attendance_rows(db) == rows
+            # Potongan kecil (hari terbagi di banyak potongan) memberi hasil yang sama
+            small = Database(os.path.join(tmp, f'{label.split()[-1]}_small.db'))
+            seed(small, employee_count)
+            import_punches(small, filepath, chunk_size=97)
+            assert attendance_rows(small) == rows
+            small.close()
+            assert expected is None or rows == expected
+            expected = rows
+            db.close()
+
+
+if __name__ == '__main__':
+    main()
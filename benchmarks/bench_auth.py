@@ -0,0 +1,110 @@
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import bench_util  # noqa: F401  (menambahkan src ke sys.path)
+
+import auth
+from auth import LoginThrottled, check_password
+from database import Database
+
+USERS = 16
+ATTEMPTS = 32
+CONCURRENCY = 4
+COSTS = (10, 12)
+
+
+def legacy_verify_user(db, username, password):
+    # Cara lama: SELECT + bcrypt.checkpw setiap kali, tanpa cache dan tanpa throttle
+    db.cursor.execute('SELECT password, role FROM users WHERE username = ?', (username,))
+    result = db.cursor.fetchone()
+    if result:
+        stored_password, role = result
+        if check_password(password, stored_password):
+            return role
+    return None
+
+
+def verify_user(db, username, password):
+    try:
+        return db.verify_user(username, password)
+    except LoginThrottled:
+        return None
+
+
+def run_attempts(db_path, verify, attempts, workers):
+    # Latensi per percobaan dihitung sejak diajukan, termasuk antre menunggu thread
+    # (workers=1 = login di GUI thread: setiap percobaan menunggu percobaan sebelumnya)
+    local = threading.local()
+
+    def attempt(submitted, username, password):
+        db = getattr(local, 'db', None)
+        if db is None:
+            db = local.db = Database(db_path)
+        role = verify(db, username, password)
+        return time.perf_counter() - submitted, role
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(workers) as executor:
+        futures = [executor.submit(attempt, time.perf_counter(), username, password)
+                   for username, password in attempts]
+        results = [future.result() for future in futures]
+    return time.perf_counter() - start, results
+
+
+def percentile(latencies, p):
+    return statistics.quantiles(latencies, n=100, method='inclusive')[p - 1]
+
+
+def report(label, elapsed, results, expect_role):
+    latencies = [latency for latency, _ in results]
+    assert all((role is not None) == expect_role for _, role in results)
+    print(f"  {label:>34}: p50 {percentile(latencies, 50) * 1000:8.1f} ms, "
+          f"p99 {percentile(latencies, 99) * 1000:8.1f} ms, {len(results) / elapsed:7.1f} login/s")
+
+
+def bench_cost(tmp, rounds, attempt_count, workers):
+    auth.BCRYPT_ROUNDS = rounds
+    auth._guards.clear()
+    db_path = os.path.join(tmp, f'auth_{rounds}.db')
+    db = Database(db_path)
+    with ThreadPoolExecutor(workers) as executor:
+        db.add_users(((f"user{i}", f"sandi{i}", "employee") for i in range(USERS)), executor)
+    valid = [(f"user{i % USERS}", f"sandi{i % USERS}") for i in range(attempt_count)]
+    wrong = [("user0", "salah")] * attempt_count  # tebakan kata sandi untuk satu akun
+
+    print(f"bcrypt cost {rounds}, {attempt_count} percobaan login, {USERS} pengguna:")
+    report("lama, berurutan (GUI thread)", *run_attempts(db_path, legacy_verify_user, valid, 1), True)
+    report(f"lama, {workers} thread", *run_attempts(db_path, legacy_verify_user, valid, workers), True)
+    report(f"verify_user, {workers} thread, cache dingin",
+           *run_attempts(db_path, verify_user, valid, workers), True)
+    report(f"verify_user, {workers} thread, cache hangat",
+           *run_attempts(db_path, verify_user, valid, workers), True)
+    report(f"lama, sandi salah, {workers} thread", *run_attempts(db_path, legacy_verify_user, wrong, workers), False)
+    report("verify_user, sandi salah (throttle)", *run_attempts(db_path, verify_user, wrong, workers), False)
+
+    # Naikkan cost: login berikutnya meng-hash ulang sekali, sesudahnya hash memakai cost baru
+    auth.BCRYPT_ROUNDS = rounds + 1
+    auth._guards.clear()
+    report(f"rehash ke cost {rounds + 1}, {workers} thread",
+           *run_attempts(db_path, verify_user, valid[:USERS], workers), True)
+    assert all(auth.hash_rounds(row[0]) == rounds + 1
+               for row in db.conn.execute("SELECT password FROM users WHERE role = 'employee'"))
+    db.close()
+
+
+def main():
+    attempt_count = int(sys.argv[1]) if len(sys.argv) > 1 else ATTEMPTS
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else CONCURRENCY
+    print(f"{os.cpu_count()} CPU")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rounds in COSTS:
+            bench_cost(tmp, rounds, attempt_count, workers)
+
+
+if __name__ == '__main__':
+    main()
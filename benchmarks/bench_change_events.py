@@ -0,0 +1,73 @@
+import os
+import sys
+import tempfile
+import time
+
+import bench_util  # noqa: F401  (menambahkan src ke sys.path)
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+from PyQt6.QtWidgets import QApplication, QTableView
+
+from database import ATTENDANCE_PAGE_KEY, Database
+from table_models import DatabaseChangeRelay, QueryTableModel
+
+HEADERS = ["ID", "Karyawan", "Tanggal", "Jam Masuk", "Jam Keluar", "Status"]
+EDITS = 50
+
+
+def seed(db, rows):
+    db.add_employees([(f"NIP{i:05d}", f"Karyawan {i}", "Staf", "Umum", 5_000_000_00, "2024-01-01", "Aktif")
+                      for i in range(1000)])
+    db.add_attendance_records((i % 1000 + 1, f"{2025 + i // 336000}-{i // 28000 % 12 + 1:02d}-{i // 1000 % 28 + 1:02d}", "08:00", None, "Hadir")
+                              for i in range(rows))
+
+
+def load(model, loaded_rows):
+    # Memuat ulang sampai posisi scroll pengguna (loaded_rows baris)
+    model.reload()
+    while model.rowCount() < loaded_rows and model.canFetchMore():
+        model.fetchMore()
+
+
+def open_model(db, loaded_rows):
+    table = QTableView()
+    model = QueryTableModel(HEADERS, db.get_all_attendance_with_employee_names,
+                            fetch_rows=lambda ids, **filters: db.get_all_attendance_with_employee_names(ids=ids, **filters),
+                            sort_key=ATTENDANCE_PAGE_KEY, descending=True, parent=table)
+    table.setModel(model)
+    load(model, loaded_rows)
+    return table, model
+
+
+def edit_rows(db, model, refresh):
+    # Edit satu baris absensi per kali, lalu segarkan tabel seperti AdminView
+    start = time.perf_counter()
+    for i in range(EDITS):
+        row = model.row_data(i)
+        db.update_attendance(row[0], i % 1000 + 1, row[2], row[3], f"17:{i % 60:02d}", row[5])
+        refresh()
+    return (time.perf_counter() - start) / EDITS * 1000
+
+
+def main():
+    app = QApplication(sys.argv)
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'bench.db'))
+        seed(db, rows)
+        print(f"{EDITS} edit satu baris, {rows} baris absensi:")
+        for loaded_rows in (200, 2_000, 20_000):
+            table, model = open_model(db, loaded_rows)
+            reload_ms = edit_rows(db, model, lambda: load(model, loaded_rows))
+
+            relay = DatabaseChangeRelay(db, parent=table)
+            relay.changed.connect(model.apply_change)
+            patch_ms = edit_rows(db, model, app.processEvents)
+            print(f"  {model.rowCount():>6} baris dimuat: reload() {reload_ms:7.2f} ms/edit, "
+                  f"apply_change() {patch_ms:5.2f} ms/edit")
+            del table
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from connection import ConnectionManager
+from database import Database
+
+VIEW_COUNT = 4  # LoginWindow, MainWindow, AdminView, EmployeeView
+WRITES = 2000
+
+
+def cold_start(db_path, shared):
+    ConnectionManager._managers.clear()
+    start = time.perf_counter()
+    for _ in range(VIEW_COUNT):
+        if not shared:
+            # Perilaku lama: tiap view membuka koneksi dan inisialisasi skema sendiri
+            ConnectionManager._managers.clear()
+        Database(db_path)
+    return time.perf_counter() - start
+
+
+def contention(connect):
+    # Satu thread menulis absensi (commit per baris), satu thread membaca terus-menerus
+    done = threading.Event()
+    reads = [0]
+    lock_errors = [0]
+
+    def reader():
+        conn = connect()
+        while not done.is_set():
+            try:
+                conn.execute('SELECT COUNT(*) FROM attendance').fetchone()
+                reads[0] += 1
+            except sqlite3.OperationalError:
+                lock_errors[0] += 1
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    conn = connect()
+    start = time.perf_counter()
+    for i in range(WRITES):
+        conn.execute('INSERT INTO attendance (employee_id, date, status) VALUES (?, ?, ?)',
+                     (i // 28 + 1, f"2025-06-{i % 28 + 1:02d}", "Hadir"))
+        conn.commit()
+    elapsed = time.perf_counter() - start
+    done.set()
+    thread.join()
+    return elapsed, reads[0], lock_errors[0]
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path = os.path.join(tmp, 'legacy.db')
+        shared_path = os.path.join(tmp, 'shared.db')
+        Database(legacy_path).close()
+        Database(shared_path).close()
+
+        print(f"Cold start {VIEW_COUNT} view (ms): terpisah={cold_start(legacy_path, False) * 1000:.1f} "
+              f"bersama={cold_start(shared_path, True) * 1000:.1f}")
+
+        # Database lama tanpa WAL (journal_mode default DELETE)
+        rollback_path = os.path.join(tmp, 'rollback.db')
+        conn = sqlite3.connect(rollback_path)
+        conn.execute('CREATE TABLE attendance (id INTEGER PRIMARY KEY AUTOINCREMENT, employee_id INTEGER, '
+                     'date DATE NOT NULL, check_in TIME, check_out TIME, status TEXT NOT NULL)')
+        conn.close()
+        manager = ConnectionManager.for_path(shared_path)
+        for label, connect in (("rollback journal", lambda: sqlite3.connect(rollback_path, timeout=0.1)),
+                               ("WAL + pragma", lambda: manager.acquire().conn)):
+            elapsed, reads, errors = contention(connect)
+            print(f"{label:>16}: {WRITES} tulis dalam {elapsed:.2f} s, {reads} baca, {errors} error 'database is locked'")
+
+
+if __name__ == '__main__':
+    main()
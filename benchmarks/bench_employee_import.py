@@ -0,0 +1,66 @@
+import csv
+import os
+import sys
+import tempfile
+import time
+
+import bench_util  # noqa: F401  (menambahkan src ke sys.path)
+
+from database import Database
+from employee_import import DEFAULT_PASSWORD, import_employees
+
+# bcrypt (cost default 12) mendominasi: ~0.3 s per akun per core
+ROWS = 100
+INVALID_EVERY = 25  # satu baris rusak per 25 baris untuk menguji laporan kesalahan
+
+
+def write_csv(filepath, rows):
+    with open(filepath, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["NIP", "Nama", "Jabatan", "Departemen", "Gaji Pokok", "Tanggal Bergabung", "Status"])
+        for i in range(rows):
+            salary = "bukan angka" if i % INVALID_EVERY == INVALID_EVERY - 1 else 5_000_000 + i
+            writer.writerow([f"NIP{i:06d}", f"Karyawan {i}", "Staf", "Umum", salary, "2024-01-01", "Aktif"])
+
+
+def per_row_form(db, filepath):
+    # Cara lama: add_employee + add_user per orang (dua commit, hashing berurutan)
+    with open(filepath, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        next(reader)
+        for nip, name, position, department, salary, join_date, status in reader:
+            try:
+                salary = float(salary)
+            except ValueError:
+                continue
+            if db.add_employee(nip, name, position, department, salary, join_date, status):
+                db.add_user(nip, DEFAULT_PASSWORD, "employee")
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else ROWS
+    cpus = os.cpu_count() or 1
+    print(f"Impor {rows} karyawan + akun login ({cpus} CPU):")
+    with tempfile.TemporaryDirectory() as tmp:
+        filepath = os.path.join(tmp, 'karyawan.csv')
+        write_csv(filepath, rows)
+        expected = rows - rows // INVALID_EVERY
+
+        db = Database(os.path.join(tmp, 'form.db'))
+        start = time.perf_counter()
+        per_row_form(db, filepath)
+        elapsed = time.perf_counter() - start
+        print(f"  {'form per baris':>22}: {elapsed:.2f} s ({rows / elapsed:,.1f} baris/detik)")
+        db.close()
+
+        for jobs in sorted({1, cpus, cpus * 2}):
+            db = Database(os.path.join(tmp, f'import_{jobs}.db'))
+            report = import_employees(db, filepath, jobs=jobs)
+            assert report.imported == expected and len(report.errors) == rows // INVALID_EVERY
+            label = f"import_employees jobs={jobs}"
+            print(f"  {label:>22}: {report.elapsed:.2f} s ({report.rows_per_second:,.1f} baris/detik)")
+            db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import bench_util  # noqa: F401  (menambahkan src ke sys.path)
+
+from database import Database
+from exporter import SALARY_COMPONENT_COLUMNS, export_salary_components
+
+ROWS = 1_000_000
+EMPLOYEES = 1000
+
+
+def seed(db_path, rows):
+    db = Database(db_path)
+    db.add_employees([(f"NIP{i:05d}", f"Karyawan {i}", "Staf", f"Departemen {i % 10}", 5_000_000_00, "2024-01-01", "Aktif")
+                      for i in range(EMPLOYEES)])
+    db.add_salary_components((i % EMPLOYEES + 1, "Tunjangan", 100_000_00 + i, i % 12 + 1, 2024 + i % 2)
+                             for i in range(rows))
+    db.close()
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 2**10
+
+
+def run_child(mode, db_path, filepath):
+    # Dijalankan di proses terpisah agar puncak RSS tiap cara tidak saling tercampur
+    db = Database(db_path)
+    start = time.perf_counter()
+    if mode == 'pandas':
+        # Cara lama: fetchall + DataFrame + to_excel
+        import pandas as pd
+        pd.DataFrame(db.get_all_salary_components(), columns=SALARY_COMPONENT_COLUMNS).to_excel(filepath, index=False)
+        count = db.cursor.execute('SELECT COUNT(*) FROM salary_components').fetchone()[0]
+    elif mode == 'filter':
+        count = export_salary_components(db, filepath, month=6, year=2025, department="Departemen 3")
+    else:
+        count = export_salary_components(db, filepath)
+    print(f"{count} {time.perf_counter() - start:.2f} {peak_rss_mb():.1f}")
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        run_child(*sys.argv[2:])
+        return
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else ROWS
+    modes = sys.argv[2:] or ['csv', 'xlsx', 'filter', 'pandas']
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.db')
+        seed(db_path, rows)
+        print(f"Ekspor {rows:,} komponen gaji:")
+        for mode in modes:
+            extension = 'csv' if mode == 'csv' else 'xlsx'
+            filepath = os.path.join(tmp, f'export_{mode}.{extension}')
+            result = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', mode, db_path, filepath],
+                                    capture_output=True, text=True, check=True)
+            count, elapsed, peak = result.stdout.split()[-3:]
+            label = {'csv': 'streaming CSV', 'xlsx': 'streaming XLSX', 'filter': 'XLSX 6/2025 + departemen',
+                     'pandas': 'pandas to_excel (lama)'}[mode]
+            print(f"  {label:>26}: {int(count):>9,} baris, {float(elapsed):7.2f} s, puncak RSS {float(peak):7.1f} MB, "
+                  f"file {os.path.getsize(filepath) / 2**20:.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+from bench_util import rss_mb
+
+from database import ATTENDANCE_PAGE_KEY, STREAM_BATCH_SIZE, Database
+
+EMPLOYEES = 2000
+PAGE_SIZE = 200
+REPEAT = 5
+
+
+def seed(db, rows):
+    db.add_employees([(f"NIP{i:05d}", f"Karyawan {i}", "Staf", f"Dept {i % 10}", 5_000_000_00, "2024-01-01", "Aktif")
+                      for i in range(EMPLOYEES)])
+    start = date(2022, 1, 1)
+    db.add_attendance_records((i % EMPLOYEES + 1, (start + timedelta(days=i // EMPLOYEES)).isoformat(), "08:00", "17:00",
+                               "Alpha" if i % 23 == 0 else "Hadir")
+                              for i in range(rows))
+
+
+def offset_page(db, limit, offset):
+    # Cara lama: LIMIT/OFFSET, SQLite tetap membaca dan membuang `offset` baris pertama
+    db.cursor.execute('''
+        SELECT a.id, e.name, a.date, a.check_in, a.check_out, a.status
+        FROM attendance a JOIN employees e ON a.employee_id = e.id
+        ORDER BY a.date DESC, a.id DESC LIMIT ? OFFSET ?
+    ''', (limit, offset))
+    return db.cursor.fetchall()
+
+
+def timed(func, *args, **kwargs):
+    best = float('inf')
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def page_depths(db, rows):
+    # Kunci halaman keyset pada kedalaman tertentu = baris terakhir sebelum kedalaman itu
+    depths = [0, rows // 10, rows // 2, rows - PAGE_SIZE]
+    print(f"Satu halaman {PAGE_SIZE} baris absensi pada kedalaman tertentu (terbaik dari {REPEAT}):")
+    print(f"{'kedalaman':>10} {'OFFSET (ms)':>12} {'keyset (ms)':>12}")
+    for depth in depths:
+        after = None
+        if depth:
+            after = db.conn.execute('SELECT date, employee_id FROM attendance ORDER BY date DESC, employee_id DESC '
+                                    'LIMIT 1 OFFSET ?', (depth - 1,)).fetchone()
+        offset_time, _ = timed(offset_page, db, PAGE_SIZE, depth)
+        keyset_time, _ = timed(db.get_all_attendance_with_employee_names, PAGE_SIZE, after)
+        print(f"{depth:>10,} {offset_time * 1000:>12.2f} {keyset_time * 1000:>12.2f}")
+
+
+def iter_cursor(db):
+    # Cara lama _iter_query: satu cursor + fetchmany yang terbuka sampai ekspor selesai
+    cursor = db.conn.cursor()
+    cursor.execute('''
+        SELECT a.id, e.name, a.date, a.check_in, a.check_out, a.status
+        FROM attendance a JOIN employees e ON a.employee_id = e.id
+        ORDER BY a.date DESC, a.id DESC
+    ''')
+    while True:
+        rows = cursor.fetchmany(STREAM_BATCH_SIZE)
+        if not rows:
+            break
+        yield from rows
+    cursor.close()
+
+
+def iter_fetchall(db):
+    # Cara lama tabel admin: seluruh tabel dibaca sekaligus
+    return iter(offset_page(db, -1, 0))
+
+
+def iter_keyset(db):
+    return db._iter_pages(db.get_all_attendance_with_employee_names, ATTENDANCE_PAGE_KEY)
+
+
+def full_scan(db, rows):
+    print(f"Alirkan seluruh tabel per {STREAM_BATCH_SIZE} baris (seperti ekspor):")
+    for label, iterate in (("keyset", iter_keyset), ("cursor", iter_cursor), ("fetchall", iter_fetchall)):
+        before = rss_mb()
+        peak = before
+        start = time.perf_counter()
+        count = 0
+        for count, _ in enumerate(iterate(db), start=1):
+            if count % 100_000 == 0:
+                peak = max(peak, rss_mb())
+        elapsed = time.perf_counter() - start
+        assert count == rows
+        print(f"  {label:>8}: {elapsed:6.2f} s, RSS puncak +{peak - before:.1f} MB")
+
+
+def filtered(db):
+    print("Halaman pertama dan halaman ke-100 dengan filter (keyset):")
+    for label, filters in (("status Alpha", {'status': 'Alpha'}),
+                           ("departemen", {'department': 'Dept 3'}),
+                           ("satu karyawan", {'employee_id': 42}),
+                           ("satu bulan", {'start_date': '2022-03-01', 'end_date': '2022-03-31'})):
+        first_time, page = timed(db.get_all_attendance_with_employee_names, PAGE_SIZE, None, **filters)
+        after = None
+        for _ in range(99):
+            page = db.get_all_attendance_with_employee_names(PAGE_SIZE, after, **filters)
+            if len(page) < PAGE_SIZE:
+                break
+            after = ATTENDANCE_PAGE_KEY(page[-1])
+        deep_time, _ = timed(db.get_all_attendance_with_employee_names, PAGE_SIZE, after, **filters)
+        print(f"  {label:>14}: {first_time * 1000:7.2f} ms, {deep_time * 1000:7.2f} ms")
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'bench.db'))
+        start = time.perf_counter()
+        seed(db, rows)
+        print(f"{rows:,} baris absensi ({EMPLOYEES:,} karyawan), seed {time.perf_counter() - start:.1f} s")
+        page_depths(db, rows)
+        full_scan(db, rows)
+        filtered(db)
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
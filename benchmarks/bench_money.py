@@ -0,0 +1,91 @@
+import random
+import sqlite3
+import sys
+import time
+from collections import defaultdict
+from fractions import Fraction
+
+import bench_util  # noqa: F401  (menambahkan src ke sys.path)
+
+from money import format_rupiah
+
+ROWS = 1_000_000
+EMPLOYEES = 1000
+
+
+def seed(rows):
+    # Dua tabel berisi komponen yang sama: REAL rupiah (skema lama) dan INTEGER sen (migrasi versi 4)
+    rng = random.Random(42)
+    amounts = [(rng.randint(1, EMPLOYEES), rng.randint(1, 25_000_000_00)) for _ in range(rows)]
+    conn = sqlite3.connect(':memory:')
+    conn.execute('CREATE TABLE components_real (employee_id INTEGER, amount REAL)')
+    conn.execute('CREATE TABLE components_sen (employee_id INTEGER, amount INTEGER)')
+    conn.executemany('INSERT INTO components_real VALUES (?, ?)', ((e, sen / 100) for e, sen in amounts))
+    conn.executemany('INSERT INTO components_sen VALUES (?, ?)', amounts)
+    conn.commit()
+    exact = defaultdict(int)
+    for employee_id, sen in amounts:
+        exact[employee_id] += sen
+    return conn, exact
+
+
+def float_loop(conn):
+    # Cara lama: baca amount REAL lalu jumlahkan per karyawan di Python
+    totals = defaultdict(float)
+    for employee_id, amount in conn.execute('SELECT employee_id, amount FROM components_real'):
+        totals[employee_id] += amount
+    return totals
+
+
+def sql_real_sum(conn):
+    return dict(conn.execute('SELECT employee_id, SUM(amount) FROM components_real GROUP BY employee_id'))
+
+
+def sql_integer_sum(conn):
+    return dict(conn.execute('SELECT employee_id, SUM(amount) FROM components_sen GROUP BY employee_id'))
+
+
+def numpy_int64_sum(conn):
+    import numpy as np
+    rows = np.array(conn.execute('SELECT employee_id, amount FROM components_sen').fetchall(), dtype=np.int64)
+    order = np.argsort(rows[:, 0], kind='stable')
+    ids, amounts = rows[order, 0], rows[order, 1]
+    starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+    return dict(zip(ids[starts].tolist(), np.add.reduceat(amounts, starts).tolist()))
+
+
+def drift(totals, exact, in_sen):
+    # Selisih terhadap total eksak (integer sen), dalam rupiah
+    worst, wrong = Fraction(0), 0
+    for employee_id, sen in exact.items():
+        value = Fraction(totals[employee_id]) / (100 if in_sen else 1)
+        error = abs(value - Fraction(sen, 100))
+        worst = max(worst, error)
+        wrong += error >= Fraction(1, 200)  # tidak lagi sama setelah dibulatkan ke sen
+    return float(worst), wrong
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else ROWS
+    conn, exact = seed(rows)
+    print(f"Agregasi {rows:,} komponen gaji untuk {EMPLOYEES} karyawan "
+          f"(total Rp {format_rupiah(sum(exact.values()))}):")
+    methods = [("loop float Python (lama)", float_loop, False), ("SUM REAL di SQLite", sql_real_sum, False),
+               ("SUM INTEGER sen di SQLite", sql_integer_sum, True)]
+    try:
+        import numpy  # noqa: F401  (opsional, bukan dependensi aplikasi)
+        methods.append(("NumPy int64 reduceat", numpy_int64_sum, True))
+    except ImportError:
+        print("  (numpy tidak terpasang, NumPy dilewati)")
+    for label, func, in_sen in methods:
+        start = time.perf_counter()
+        totals = func(conn)
+        elapsed = time.perf_counter() - start
+        worst, wrong = drift(totals, exact, in_sen)
+        print(f"  {label:>26}: {elapsed * 1000:8.1f} ms, selisih maks Rp {worst:.2e}, "
+              f"{wrong} karyawan salah setelah dibulatkan ke sen")
+    conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+import os
+import tempfile
+import time
+
+import bench_util  # noqa: F401  (menambahkan src ke sys.path)
+from bench_payroll_engine import MONTH, YEAR, seed
+
+from database import Database
+from payroll_engine import month_payroll, payroll_cache
+
+
+def legacy_report(db, month, year, allowance_types):
+    # Salinan salary_report_job sebelum memakai payroll_engine: 1 + N query per laporan
+    rows = []
+    for employee_id, _, name, _, _, basic_salary, _, _ in db.get_all_employees():
+        components = db.get_salary_components(employee_id, month, year)
+        allowances = sum(c[3] for c in components if c[2] in allowance_types)
+        deductions = sum(c[3] for c in components if c[2] in ("Potongan", "Pajak", "Asuransi"))
+        rows.append((name, basic_salary + allowances - deductions))
+    return rows
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    print("Lihat laporan gaji lalu ekspor PDF (ms):")
+    print(f"{'karyawan':>9} {'lama':>9} {'cache':>9} {'miss':>9} {'hit':>7} {'edit+1':>8}")
+    for employee_count in (500, 2000, 5000):
+        with tempfile.TemporaryDirectory() as tmp:
+            db = Database(os.path.join(tmp, 'bench.db'))
+            seed(db, employee_count)
+            # Lama: laporan dan ekspor PDF masing-masing memindai ulang semuanya
+            legacy = (timed(legacy_report, db, MONTH, YEAR, ("Tunjangan", "Lembur", "Bonus"))
+                      + timed(legacy_report, db, MONTH, YEAR, ("Tunjangan", "Bonus")))
+            miss = timed(month_payroll, db, MONTH, YEAR)
+            hit = timed(month_payroll, db, MONTH, YEAR)
+            # Satu komponen berubah: hanya karyawan itu yang dihitung ulang
+            db.add_salary_component(1, "Bonus", 100_000_00, MONTH, YEAR)
+            partial = timed(month_payroll, db, MONTH, YEAR)
+            cache = payroll_cache(db)
+            assert cache.hits == 1 and cache.misses == 2
+            print(f"{employee_count:>9} {legacy:>9.1f} {miss + hit:>9.1f} {miss:>9.1f} {hit:>7.2f} {partial:>8.1f}")
+            db.close()
+
+
+if __name__ == '__main__':
+    main()
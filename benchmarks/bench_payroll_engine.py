@@ -0,0 +1,76 @@
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from database import Database
+from payroll_engine import compute_payroll, month_bounds
+
+MONTH, YEAR = 6, 2025
+COMPONENT_TYPES = ["Tunjangan", "Lembur", "Bonus", "Potongan", "Pajak", "Asuransi"]
+STATUSES = ["Hadir", "Hadir", "Hadir", "Sakit", "Izin", "Cuti", "Alpha"]
+
+
+def seed(db, employee_count):
+    rng = random.Random(42)
+    db.cursor.executemany(
+        'INSERT INTO employees (nip, name, position, department, basic_salary, join_date, status) VALUES (?, ?, ?, ?, ?, ?, ?)',
+        ((f"NIP{i:06d}", f"Karyawan {i}", "Staf", "Umum", rng.randint(4, 20) * 1_000_000_00, "2024-01-01", "Aktif")
+         for i in range(employee_count)))
+    db.cursor.executemany(
+        'INSERT INTO salary_components (employee_id, component_type, amount, month, year) VALUES (?, ?, ?, ?, ?)',
+        ((emp_id, rng.choice(COMPONENT_TYPES), rng.randint(1, 50) * 10_000_00, MONTH, YEAR)
+         for emp_id in range(1, employee_count + 1) for _ in range(4)))
+    db.cursor.executemany(
+        'INSERT INTO attendance (employee_id, date, check_in, check_out, status) VALUES (?, ?, ?, ?, ?)',
+        ((emp_id, f"{YEAR}-{MONTH:02d}-{day:02d}", "08:00", "17:00", rng.choice(STATUSES))
+         for emp_id in range(1, employee_count + 1) for day in range(1, 23)))
+    db.conn.commit()
+
+
+def legacy_payroll(db, month, year):
+    # Salinan loop per karyawan dari AdminView.process_payroll sebelum payroll_engine
+    start_date, end_date, days_in_month = month_bounds(month, year)
+    results = []
+    for employee_id, _, name, _, _, basic_salary, _, _ in db.get_all_employees():
+        components = db.get_salary_components(employee_id, month, year)
+        attendance_records = db.get_attendance(employee_id, start_date, end_date)
+        allowances = sum(c[3] for c in components if c[2] in ["Tunjangan", "Lembur", "Bonus"])
+        deductions = sum(c[3] for c in components if c[2] in ["Potongan", "Pajak", "Asuransi"])
+        alpha_days = sum(1 for r in attendance_records if r[5] == "Alpha")
+        deductions += (basic_salary / days_in_month) * alpha_days
+        results.append((employee_id, basic_salary + allowances - deductions))
+    return results
+
+
+def measure(db, func):
+    statements = []
+    db.conn.set_trace_callback(statements.append)
+    start = time.perf_counter()
+    result = func(db, MONTH, YEAR)
+    elapsed = time.perf_counter() - start
+    db.conn.set_trace_callback(None)
+    return result, elapsed, len(statements)
+
+
+def main():
+    print(f"{'karyawan':>9} {'legacy (s)':>11} {'query':>7} {'engine (s)':>11} {'query':>7}")
+    for employee_count in (500, 2000, 5000):
+        with tempfile.TemporaryDirectory() as tmp:
+            db = Database(os.path.join(tmp, 'bench.db'))
+            seed(db, employee_count)
+            legacy, legacy_time, legacy_queries = measure(db, legacy_payroll)
+            engine, engine_time, engine_queries = measure(db, compute_payroll)
+            assert len(legacy) == len(engine)
+            for (emp_id, net), result in zip(legacy, engine):
+                # legacy menghitung potongan Alpha dalam float; engine membulatkannya ke sen
+                assert emp_id == result.employee_id and abs(net - result.net_salary) <= 0.5
+            print(f"{employee_count:>9} {legacy_time:>11.3f} {legacy_queries:>7} {engine_time:>11.3f} {engine_queries:>7}")
+            db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import bench_util  # noqa: F401  (menambahkan src ke sys.path)
+
+from bench_payroll_engine import MONTH, YEAR, seed
+from database import Database
+from payroll_engine import run_payroll
+
+EMPLOYEES = 2000
+
+
+def timed_run(db, payslip_dir, label, cancel_after=None):
+    # cancel_after: batalkan run setelah sejumlah slip selesai (simulasi proses yang terhenti)
+    done = [0]
+
+    def progress(count, total):
+        done[0] = count
+
+    def cancelled():
+        return cancel_after is not None and done[0] >= cancel_after
+
+    start = time.perf_counter()
+    results, report = run_payroll(db, MONTH, YEAR, payslip_dir, progress=progress, cancelled=cancelled)
+    elapsed = time.perf_counter() - start
+    assert report.ok
+    print(f"  {label:>28}: {elapsed:7.2f} s  run {report.run_id}{' (lanjut)' if report.resumed else '':8} "
+          f"{len(report.rendered):>6} dibuat {len(report.skipped):>6} tidak berubah "
+          f"(cache {report.cache_hits} hit, {report.cache_misses} miss)"
+          f"{'  [dibatalkan]' if report.cancelled else ''}")
+    return report
+
+
+def main():
+    employee_count = int(sys.argv[1]) if len(sys.argv) > 1 else EMPLOYEES
+    print(f"Proses gaji {MONTH}/{YEAR} untuk {employee_count:,} karyawan ({os.cpu_count() or 1} CPU):")
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'bench.db'))
+        seed(db, employee_count)
+        payslip_dir = os.path.join(tmp, 'payslips')
+        os.makedirs(payslip_dir)
+
+        full = timed_run(db, payslip_dir, "run penuh")
+        assert len(full.rendered) == employee_count
+
+        again = timed_run(db, payslip_dir, "ulang tanpa perubahan")
+        assert not again.rendered and len(again.skipped) == employee_count
+
+        # Satu koreksi: tambah lembur untuk satu karyawan
+        db.add_salary_component(employee_count // 2, "Lembur", 250_000_00, MONTH, YEAR)
+        component_id = db.conn.execute('SELECT MAX(id) FROM salary_components').fetchone()[0]
+        corrected = timed_run(db, payslip_dir, "ulang setelah 1 koreksi")
+        assert corrected.rendered == [employee_count // 2] and corrected.cache_misses == 1
+
+        # Koreksi dibatalkan: isi slip kembali ke versi yang sudah ada di cache render
+        db.delete_salary_component(component_id)
+        reverted = timed_run(db, payslip_dir, "koreksi dibatalkan")
+        assert reverted.cache_hits == 1 and reverted.cache_misses == 0
+
+        # Semua PDF slip hilang, cache render masih ada: disalin tanpa reportlab
+        for filename in os.listdir(payslip_dir):
+            if filename.endswith('.pdf'):
+                os.remove(os.path.join(payslip_dir, filename))
+        restored = timed_run(db, payslip_dir, "hapus PDF, cache tetap")
+        assert restored.cache_hits == employee_count and restored.cache_misses == 0
+
+        # Slip dan cache hilang, proses terhenti di tengah jalan, lalu dilanjutkan
+        shutil.rmtree(payslip_dir)
+        os.makedirs(payslip_dir)
+        stopped = timed_run(db, payslip_dir, "hapus PDF + cache, terhenti", cancel_after=employee_count // 2)
+        assert stopped.cancelled
+        resumed = timed_run(db, payslip_dir, "lanjutkan")
+        assert resumed.resumed and len(stopped.rendered) + len(resumed.rendered) == employee_count
+
+        for run in db.get_payroll_runs(MONTH, YEAR):
+            print(f"  run {run.id}: {run.status:>10}, {run.rendered} dibuat, {run.skipped} tidak berubah, {run.failed} gagal dari {run.total}")
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+import os
+import sys
+import tempfile
+import time
+
+import bench_util  # noqa: F401  (menambahkan src ke sys.path)
+
+from bench_payroll_engine import COMPONENT_TYPES, MONTH, YEAR, seed
+from database import Database
+from payroll_engine import ALLOWANCE_TYPES, DEDUCTION_TYPES, compute_payroll, month_bounds
+from payroll_summary import check_summary, rebuild_summary
+
+EMPLOYEES = (1000, 5000, 20000)
+INSERT_ROWS = 20000
+
+
+def aggregate_payroll(db, month, year):
+    # Cara sebelum payroll_monthly_summary: agregasi penuh komponen + absensi setiap laporan
+    start_date, end_date, days_in_month = month_bounds(month, year)
+    allowance_marks = ", ".join("?" * len(ALLOWANCE_TYPES))
+    deduction_marks = ", ".join("?" * len(DEDUCTION_TYPES))
+    db.cursor.execute(f'''
+        SELECT e.id, e.basic_salary, COALESCE(sc.allowances, 0), COALESCE(sc.deductions, 0), COALESCE(a.alpha_days, 0)
+        FROM employees e
+        LEFT JOIN (
+            SELECT employee_id,
+                   SUM(CASE WHEN component_type IN ({allowance_marks}) THEN amount ELSE 0 END) AS allowances,
+                   SUM(CASE WHEN component_type IN ({deduction_marks}) THEN amount ELSE 0 END) AS deductions
+            FROM salary_components WHERE month = ? AND year = ? GROUP BY employee_id
+        ) sc ON sc.employee_id = e.id
+        LEFT JOIN (
+            SELECT employee_id, SUM(status = 'Alpha') AS alpha_days
+            FROM attendance WHERE date BETWEEN ? AND ? GROUP BY employee_id
+        ) a ON a.employee_id = e.id
+        ORDER BY e.id
+    ''', (*ALLOWANCE_TYPES, *DEDUCTION_TYPES, month, year, start_date, end_date))
+    return [(employee_id, basic + allowances - deductions - (basic * alpha * 2 + days_in_month) // (2 * days_in_month))
+            for employee_id, basic, allowances, deductions, alpha in db.cursor.fetchall()]
+
+
+def best_of(func, *args, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        times.append(time.perf_counter() - start)
+    return result, min(times)
+
+
+def insert_components(db, rows, employee_count):
+    with db.transaction():
+        db.add_salary_components((i % employee_count + 1, COMPONENT_TYPES[i % len(COMPONENT_TYPES)], 10_000_00,
+                                  MONTH % 12 + 1, YEAR) for i in range(rows))
+
+
+def drop_triggers(db):
+    for (name,) in db.conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'").fetchall():
+        db.conn.execute(f'DROP TRIGGER {name}')
+    db.conn.commit()
+
+
+def main():
+    counts = [int(arg) for arg in sys.argv[1:]] or EMPLOYEES
+    print(f"Laporan gaji {MONTH}/{YEAR} (terbaik dari 5):")
+    print(f"{'karyawan':>9} {'agregasi (ms)':>14} {'ringkasan (ms)':>15} {'rebuild (s)':>12}")
+    for employee_count in counts:
+        with tempfile.TemporaryDirectory() as tmp:
+            db = Database(os.path.join(tmp, 'bench.db'))
+            seed(db, employee_count)
+            aggregate, aggregate_time = best_of(aggregate_payroll, db, MONTH, YEAR)
+            summary, summary_time = best_of(compute_payroll, db, MONTH, YEAR)
+            for (employee_id, net), result in zip(aggregate, summary):
+                assert employee_id == result.employee_id and net == result.net_salary
+            start = time.perf_counter()
+            rebuild_summary(db)
+            rebuild_time = time.perf_counter() - start
+            assert check_summary(db) == []
+            print(f"{employee_count:>9} {aggregate_time * 1000:>14.1f} {summary_time * 1000:>15.1f} {rebuild_time:>12.2f}")
+            db.close()
+
+    # Biaya trigger: add_salary_components massal dengan dan tanpa trigger ringkasan
+    employee_count = counts[0]
+    print(f"\nInsert {INSERT_ROWS:,} komponen gaji ({employee_count} karyawan):")
+    for label, with_triggers in (("dengan trigger", True), ("tanpa trigger", False)):
+        with tempfile.TemporaryDirectory() as tmp:
+            db = Database(os.path.join(tmp, 'bench.db'))
+            seed(db, employee_count)
+            if not with_triggers:
+                drop_triggers(db)
+            start = time.perf_counter()
+            insert_components(db, INSERT_ROWS, employee_count)
+            elapsed = time.perf_counter() - start
+            print(f"  {label:>15}: {elapsed:.2f} s ({INSERT_ROWS / elapsed:,.0f} baris/detik)")
+            db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+import os
+import random
+import sys
+import tempfile
+import time
+
+import bench_util  # noqa: F401  (menambahkan src ke sys.path)
+
+from bench_payroll_engine import MONTH, YEAR, seed
+from database import Database
+from payroll_engine import run_payroll
+from payslip_archive import read_member
+
+EMPLOYEES = 2000
+LOOKUPS = 200
+
+
+def backup(payslip_dir):
+    # Simulasi backup: telusuri folder slip dan baca semua file
+    files = size = 0
+    for root, _, filenames in os.walk(payslip_dir):
+        for filename in filenames:
+            with open(os.path.join(root, filename), 'rb') as source:
+                size += len(source.read())
+            files += 1
+    return files, size
+
+
+def open_slips(db, employee_ids):
+    # Ambil satu slip per karyawan seperti tombol "Lihat PDF"
+    for employee_id in employee_ids:
+        pdf_path, archive_member = db.get_processed_payslip(employee_id, MONTH, YEAR)
+        if archive_member:
+            read_member(pdf_path, archive_member)
+        else:
+            with open(pdf_path, 'rb') as source:
+                source.read()
+
+
+def main():
+    employee_count = int(sys.argv[1]) if len(sys.argv) > 1 else EMPLOYEES
+    rng = random.Random(42)
+    lookups = [rng.randint(1, employee_count) for _ in range(LOOKUPS)]
+    print(f"Slip gaji {MONTH}/{YEAR} untuk {employee_count:,} karyawan:")
+    print(f"{'mode':>8} {'proses (s)':>11} {'file':>7} {'ukuran (MB)':>12} {'backup (s)':>11} "
+          f"{'buka slip (ms)':>15}")
+    for label, archive in (("file", False), ("arsip", True)):
+        with tempfile.TemporaryDirectory() as tmp:
+            db = Database(os.path.join(tmp, 'bench.db'))
+            seed(db, employee_count)
+            payslip_dir = os.path.join(tmp, 'payslips')
+            os.makedirs(payslip_dir)
+
+            start = time.perf_counter()
+            _, report = run_payroll(db, MONTH, YEAR, payslip_dir, archive=archive)
+            run_time = time.perf_counter() - start
+            assert report.ok and len(report.rendered) == employee_count
+
+            start = time.perf_counter()
+            files, size = backup(payslip_dir)
+            backup_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            open_slips(db, lookups)
+            lookup_time = (time.perf_counter() - start) / LOOKUPS
+
+            print(f"{label:>8} {run_time:>11.2f} {files:>7,} {size / 1e6:>12.1f} {backup_time:>11.3f} "
+                  f"{lookup_time * 1000:>15.2f}")
+            db.close()
+
+
+if __name__ == '__main__':
+    main()
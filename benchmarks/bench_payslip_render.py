@@ -0,0 +1,43 @@
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from payslip_renderer import PayslipRecord, render_payslips
+
+PAYSLIPS = 500
+
+
+def make_records(payslip_dir):
+    return [PayslipRecord(
+        employee_id=i,
+        employee_name=f"Karyawan {i}",
+        month=6,
+        year=2025,
+        basic_salary=8_000_000_00,
+        components=(("Tunjangan", 1_500_000_00), ("Lembur", 350_000_00), ("Pajak", 400_000_00)),
+        deduction_for_alpha=266_666_67,
+        net_salary=9_183_333_33,
+        attendance_counts={"Hadir": 20, "Sakit": 1, "Alpha": 1},
+        days_in_month=30,
+        filepath=os.path.join(payslip_dir, f"slip_gaji_{i}_6_2025.pdf"),
+    ) for i in range(PAYSLIPS)]
+
+
+def main():
+    cpus = os.cpu_count() or 1
+    print(f"Render {PAYSLIPS} slip gaji ({cpus} CPU):")
+    for jobs in sorted({1, cpus}):
+        with tempfile.TemporaryDirectory() as tmp:
+            records = make_records(tmp)
+            start = time.perf_counter()
+            report = render_payslips(records, jobs=jobs)
+            elapsed = time.perf_counter() - start
+            assert report.ok and len(report.rendered) == PAYSLIPS
+            print(f"  jobs={jobs:<3} {elapsed:.2f} s ({PAYSLIPS / elapsed:,.0f} slip/detik)")
+
+
+if __name__ == '__main__':
+    main()
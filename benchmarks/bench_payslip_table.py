@@ -0,0 +1,80 @@
+import os
+import sys
+import tempfile
+import time
+
+from bench_util import rss_mb
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+from PyQt6.QtWidgets import QApplication, QPushButton, QTableView, QTableWidget, QTableWidgetItem
+
+from database import PAYSLIP_PAGE_KEY, Database
+from table_models import ButtonDelegate, QueryTableModel
+
+HEADERS = ["Nama Karyawan", "Bulan", "Tahun", "Gaji Bersih", "Aksi"]
+
+
+def seed(db, payslips):
+    employees = max(1, payslips // 12)
+    db.add_employees([(f"NIP{i:06d}", f"Karyawan {i}", "Staf", "Umum", 5_000_000_00, "2024-01-01", "Aktif")
+                      for i in range(employees)])
+    db.add_processed_payslips((i % employees + 1, i // employees % 12 + 1, 2020 + i // (employees * 12), 5_000_000_00,
+                               f"resources/payslips/slip_gaji_{i}.pdf") for i in range(payslips))
+
+
+def legacy_widgets(db):
+    # Cara lama load_processed_payslips: QTableWidgetItem + QPushButton per baris
+    table = QTableWidget()
+    table.setColumnCount(len(HEADERS))
+    table.setHorizontalHeaderLabels(HEADERS)
+    for row_num, payslip in enumerate(db.get_all_processed_payslips()):
+        table.insertRow(row_num)
+        table.setItem(row_num, 0, QTableWidgetItem(str(payslip[1])))
+        table.setItem(row_num, 1, QTableWidgetItem(str(payslip[2])))
+        table.setItem(row_num, 2, QTableWidgetItem(str(payslip[3])))
+        table.setItem(row_num, 3, QTableWidgetItem(f"{payslip[4]:,.2f}"))
+        view_button = QPushButton("Lihat PDF")
+        view_button.clicked.connect(lambda _, f=payslip[5]: print(f))
+        table.setCellWidget(row_num, 4, view_button)
+    return table
+
+
+def delegate_view(db, fetch_all):
+    table = QTableView()
+    model = QueryTableModel(HEADERS, db.get_all_processed_payslips, columns=[1, 2, 3, 4, 5],
+                            formatters={3: lambda net_salary: f"{net_salary:,.2f}", 4: lambda _: "Lihat PDF"},
+                            sort_key=PAYSLIP_PAGE_KEY, descending=True, parent=table)
+    table.setModel(model)
+    table.setItemDelegateForColumn(4, ButtonDelegate("Lihat PDF", table))
+    model.reload()
+    while fetch_all and model.canFetchMore():
+        model.fetchMore()
+    return table
+
+
+def main():
+    app = QApplication(sys.argv)
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+    for payslips in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            db = Database(os.path.join(tmp, 'bench.db'))
+            seed(db, payslips)
+            # RSS hanya naik, jadi urutan dari yang paling hemat
+            for label, open_table in (("delegate (lazy)", lambda: delegate_view(db, False)),
+                                      ("delegate (semua baris)", lambda: delegate_view(db, True)),
+                                      ("QPushButton per baris", lambda: legacy_widgets(db))):
+                before = rss_mb()
+                start = time.perf_counter()
+                table = open_table()
+                table.resize(800, 600)
+                table.show()
+                app.processEvents()
+                elapsed = time.perf_counter() - start
+                print(f"{payslips:>7} slip  {label:>22}: buka {elapsed:.3f} s, RSS +{rss_mb() - before:.1f} MB")
+                table.close()
+                del table
+            db.close()
+
+
+if __name__ == '__main__':
+    main()
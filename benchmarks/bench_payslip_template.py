@@ -0,0 +1,103 @@
+import os
+import sys
+import tempfile
+import time
+
+import bench_util  # noqa: F401  (menambahkan src ke sys.path)
+
+from bench_payslip_render import make_records
+from database import ATTENDANCE_STATUSES
+from money import format_rupiah
+from payslip_renderer import render_payslip
+
+SLIPS = 300
+
+
+def platypus_payslip(record):
+    # Salinan render_payslip sebelum PayslipTemplate (layout platypus per slip)
+    from reportlab.lib.enums import TA_CENTER, TA_RIGHT
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+    from reportlab.lib.units import inch
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+    doc = SimpleDocTemplate(record.filepath, pagesize=letter)
+    styles = getSampleStyleSheet()
+    normal_style = styles['Normal']
+    right_style = ParagraphStyle(name='RightAlign', alignment=TA_RIGHT)
+    center_style = ParagraphStyle(name='CenterAlign', alignment=TA_CENTER)
+
+    story = []
+
+    story.append(Paragraph("SLIP GAJI KARYAWAN", center_style))
+    story.append(Spacer(1, 0.2 * inch))
+    story.append(Paragraph(f"Bulan: {record.month} Tahun: {record.year}", center_style))
+    story.append(Spacer(1, 0.2 * inch))
+
+    story.append(Paragraph(f"Nama Karyawan: {record.employee_name}", normal_style))
+    story.append(Paragraph(f"Gaji Pokok: Rp {format_rupiah(record.basic_salary)}", normal_style))
+    story.append(Spacer(1, 0.1 * inch))
+
+    # Components Table
+    data = [['Tipe Komponen', 'Jumlah']]
+    for comp_type, amount in record.components:
+        data.append([comp_type, f"Rp {format_rupiah(amount)}"])
+
+    # Add attendance deduction to components table for clarity
+    if record.deduction_for_alpha > 0:
+        data.append(['Potongan Absensi (Alpha)', f"Rp {format_rupiah(record.deduction_for_alpha)}"])
+
+    # Add a total row
+    data.append(['<b>Total Gaji Bersih</b>', f'<b>Rp {format_rupiah(record.net_salary)}</b>'])
+
+    table = Table(data, colWidths=[3.5 * inch, 2.0 * inch])
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), '#CCCCCC'),
+        ('GRID', (0, 0), (-1, -1), 1, 'black'),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('ALIGN', (1, 0), (-1, -1), 'RIGHT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'), # Bold total row
+        ('BACKGROUND', (0, -1), (-1, -1), '#EEEEEE'), # Grey background for total row
+    ]))
+    story.append(table)
+    story.append(Spacer(1, 0.2 * inch))
+
+    # Attendance Summary in PDF
+    story.append(Paragraph("Ringkasan Absensi:", normal_style))
+    story.append(Paragraph(f"Total Hari Kerja Bulan Ini: {record.days_in_month} hari", normal_style))
+    for status in ATTENDANCE_STATUSES:
+        story.append(Paragraph(f"{status}: {record.attendance_counts.get(status, 0)} hari", normal_style))
+    story.append(Spacer(1, 0.5 * inch))
+
+    story.append(Paragraph("Hormat kami,", right_style))
+    story.append(Paragraph("Admin Perusahaan", right_style))
+
+    doc.build(story)
+    return record.employee_id
+
+
+
+def ms_per_slip(render, records):
+    render(records[0])  # import reportlab dan template pertama tidak ikut diukur
+    start = time.perf_counter()
+    for record in records:
+        render(record)
+    return (time.perf_counter() - start) * 1000 / len(records)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else SLIPS
+    print(f"Render {count} slip gaji, satu proses:")
+    timings = {}
+    for label, render in (("platypus (lama)", platypus_payslip), ("PayslipTemplate", render_payslip)):
+        with tempfile.TemporaryDirectory() as tmp:
+            records = make_records(tmp)[:count]
+            timings[label] = ms_per_slip(render, records)
+            size = sum(os.path.getsize(record.filepath) for record in records) / len(records)
+            print(f"  {label:>16}: {timings[label]:6.2f} ms/slip, {size / 1024:.1f} KB/slip")
+    print(f"  percepatan: {timings['platypus (lama)'] / timings['PayslipTemplate']:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+
+import bench_util  # noqa: F401  (menambahkan src ke sys.path)
+
+from bench_keyset_pagination import EMPLOYEES, seed
+from database import Attendance, Database
+
+START_DATE = '2000-01-01'
+END_DATE = '2999-12-31'
+
+
+class AttendanceSlots:
+    # Pembanding: objek biasa dengan __slots__ (dataclass(slots=True) butuh Python 3.10)
+    __slots__ = ('id', 'employee_id', 'date', 'check_in', 'check_out', 'status')
+
+    def __init__(self, id, employee_id, date, check_in, check_out, status):
+        self.id = id
+        self.employee_id = employee_id
+        self.date = date
+        self.check_in = check_in
+        self.check_out = check_out
+        self.status = status
+
+
+SQL = '''
+    SELECT id, employee_id, date, check_in, check_out, status FROM attendance
+    WHERE date BETWEEN ? AND ? ORDER BY date, employee_id
+'''
+
+
+def load_tuples(db):
+    # Cara lama: fetchall tuple mentah, dibaca per posisi (record[5] == "Alpha")
+    return db.conn.execute(SQL, (START_DATE, END_DATE)).fetchall()
+
+
+def load_make(db):
+    return list(map(Attendance._make, db.conn.execute(SQL, (START_DATE, END_DATE)).fetchall()))
+
+
+def load_row_factory(db):
+    return db._select(Attendance, SQL, (START_DATE, END_DATE)).fetchall()
+
+
+def load_slots(db):
+    cursor = db.conn.cursor()
+    cursor.row_factory = lambda cursor, row: AttendanceSlots(*row)
+    return cursor.execute(SQL, (START_DATE, END_DATE)).fetchall()
+
+
+def alpha_by_index(rows):
+    return Counter(record[1] for record in rows if record[5] == "Alpha")
+
+
+def alpha_by_attribute(rows):
+    return Counter(record.employee_id for record in rows if record.status == "Alpha")
+
+
+VARIANTS = (
+    ("tuple (fetchall)", load_tuples, alpha_by_index),
+    ("NamedTuple (_make)", load_make, alpha_by_attribute),
+    ("NamedTuple (row_factory)", load_row_factory, alpha_by_attribute),
+    ("__slots__ (row_factory)", load_slots, alpha_by_attribute),
+)
+
+
+def measure(db, load, scan):
+    # Waktu diukur tanpa tracemalloc, memori diukur pada pemanggilan kedua
+    start = time.perf_counter()
+    rows = load(db)
+    load_time = time.perf_counter() - start
+    start = time.perf_counter()
+    alpha = scan(rows)
+    scan_time = time.perf_counter() - start
+    del rows
+    gc.collect()
+
+    tracemalloc.start()
+    rows = load(db)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(rows), load_time, scan_time, retained, peak, alpha
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'bench.db'))
+        seed(db, rows)
+        print(f"{rows:,} baris absensi ({EMPLOYEES:,} karyawan) dimuat ke memori:")
+        print(f"{'bentuk baris':>26} {'muat (s)':>9} {'hitung Alpha (s)':>17} {'tersimpan (MB)':>15} "
+              f"{'puncak (MB)':>12} {'byte/baris':>11}")
+        expected = None
+        for label, load, scan in VARIANTS:
+            count, load_time, scan_time, retained, peak, alpha = measure(db, load, scan)
+            assert count == rows and (expected is None or alpha == expected)
+            expected = alpha
+            print(f"{label:>26} {load_time:>9.2f} {scan_time:>17.3f} {retained / 2**20:>15.1f} "
+                  f"{peak / 2**20:>12.1f} {retained / rows:>11.0f}")
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
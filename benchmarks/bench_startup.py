@@ -0,0 +1,91 @@
+import os
+import subprocess
+import sys
+import tempfile
+
+from bench_util import SRC_DIR
+
+# Modul berat yang hanya boleh dimuat saat ekspor/PDF/tema dipakai, bukan saat startup
+LAZY_MODULES = ("pandas", "numpy", "reportlab", "openpyxl", "qt_material", "jinja2")
+
+# Dijalankan di proses baru: waktu sampai jendela login tampil (tanpa tema qt_material)
+STARTUP_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+from PyQt6.QtWidgets import QApplication
+import main
+app = QApplication(sys.argv)
+window = main.MainWindow()
+window.show()
+app.processEvents()
+print(f"login {(time.perf_counter() - start) * 1000:.1f}")
+print("loaded " + ",".join(name for name in LAZY_MODULES if name in sys.modules))
+"""
+
+
+def python_env():
+    env = dict(os.environ, PYTHONPATH=SRC_DIR)
+    env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    return env
+
+
+def import_times(module='main'):
+    # -X importtime: kolom ketiga adalah waktu kumulatif (mikrodetik) per modul
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            env=python_env(), capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def time_to_login_window(workdir):
+    result = subprocess.run([sys.executable, '-c', STARTUP_SCRIPT.replace('LAZY_MODULES', repr(LAZY_MODULES))],
+                            env=python_env(), cwd=workdir, capture_output=True, text=True, check=True)
+    values = dict(line.split(' ', 1) for line in result.stdout.splitlines()
+                  if line.startswith(('login ', 'loaded ')))
+    return float(values['login']), [name for name in values['loaded'].strip().split(',') if name]
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    times = import_times()
+    print(f"import main: {times['main'] / 1000:.1f} ms (-X importtime, kumulatif)")
+    for name, micros in sorted(times.items(), key=lambda item: -item[1])[1:8]:
+        print(f"  {name:<28} {micros / 1000:7.1f} ms")
+
+    samples = []
+    with tempfile.TemporaryDirectory() as tmp:
+        os.makedirs(os.path.join(tmp, 'database'))
+        # Proses pertama membuat database dan admin default (bcrypt); tidak ikut diukur
+        time_to_login_window(tmp)
+        for _ in range(runs):
+            elapsed, loaded = time_to_login_window(tmp)
+            samples.append(elapsed)
+    samples.sort()
+    print(f"Waktu sampai jendela login: median {samples[len(samples) // 2]:.1f} ms, "
+          f"min {samples[0]:.1f} ms ({runs} proses)")
+
+    # Regression check: modul berat tidak boleh kembali dimuat saat startup
+    eager = sorted(set(loaded) | {name for name in LAZY_MODULES if name in times})
+    if eager:
+        print(f"GAGAL: modul berat dimuat saat startup: {', '.join(eager)}")
+        sys.exit(1)
+    print("OK: " + ", ".join(LAZY_MODULES) + " tidak dimuat sebelum jendela login tampil")
+
+    # CLI (cron) tidak boleh memuat Qt sama sekali
+    cli_times = import_times('cli')
+    gui_modules = sorted(name for name in cli_times if name.split('.')[0] in ('PyQt6', 'qt_material'))
+    print(f"import cli: {cli_times['cli'] / 1000:.1f} ms")
+    if gui_modules:
+        print(f"GAGAL: cli memuat modul GUI: {', '.join(gui_modules[:5])}")
+        sys.exit(1)
+    print("OK: cli tidak memuat PyQt6/qt_material")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+import os
+import sys
+import tempfile
+import time
+
+from bench_util import rss_mb
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+from PyQt6.QtWidgets import QApplication, QTableView, QTableWidget, QTableWidgetItem
+
+from database import ATTENDANCE_PAGE_KEY, Database
+from table_models import QueryTableModel
+
+HEADERS = ["ID", "Karyawan", "Tanggal", "Jam Masuk", "Jam Keluar", "Status"]
+
+
+def seed(db, rows):
+    db.add_employees([(f"NIP{i:05d}", f"Karyawan {i}", "Staf", "Umum", 5_000_000_00, "2024-01-01", "Aktif")
+                      for i in range(1000)])
+    db.add_attendance_records((i % 1000 + 1, f"{2025 + i // 336000}-{i // 28000 % 12 + 1:02d}-{i // 1000 % 28 + 1:02d}", "08:00", "17:00", "Hadir")
+                              for i in range(rows))
+
+
+def open_table_widget(db):
+    # Cara lama load_admin_attendance: fetchall lalu setItem per sel
+    table = QTableWidget()
+    table.setColumnCount(len(HEADERS))
+    table.setHorizontalHeaderLabels(HEADERS)
+    for row_num, record in enumerate(db.get_all_attendance_with_employee_names()):
+        table.insertRow(row_num)
+        for col_num, data in enumerate(record[:len(HEADERS)]):
+            table.setItem(row_num, col_num, QTableWidgetItem('' if data is None else str(data)))
+    return table
+
+
+def open_table_view(db):
+    table = QTableView()
+    model = QueryTableModel(HEADERS, db.get_all_attendance_with_employee_names,
+                            sort_key=ATTENDANCE_PAGE_KEY, descending=True, parent=table)
+    table.setModel(model)
+    model.reload()
+    return table
+
+
+def main():
+    app = QApplication(sys.argv)
+    rows_list = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+    for rows in rows_list:
+        with tempfile.TemporaryDirectory() as tmp:
+            db = Database(os.path.join(tmp, 'bench.db'))
+            seed(db, rows)
+            # Model dulu: RSS hanya naik, jadi cara lama diukur setelahnya
+            for label, open_table in (("QTableView + model", open_table_view), ("QTableWidget", open_table_widget)):
+                before = rss_mb()
+                start = time.perf_counter()
+                table = open_table(db)
+                app.processEvents()
+                elapsed = time.perf_counter() - start
+                print(f"{rows:>8} baris  {label:>18}: buka {elapsed:.3f} s, RSS +{rss_mb() - before:.1f} MB")
+                del table
+            db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from database import Database
+
+ROWS = 10_000
+
+
+def component_rows():
+    return [(i % 100 + 1, "Tunjangan", 100_000_00 + i, 6, 2025) for i in range(ROWS)]
+
+
+def per_row_commit(db, rows):
+    for row in rows:
+        db.add_salary_component(*row)
+
+
+def single_transaction(db, rows):
+    with db.transaction():
+        for row in rows:
+            db.add_salary_component(*row)
+
+
+def bulk_executemany(db, rows):
+    db.add_salary_components(rows)
+
+
+def main():
+    rows = component_rows()
+    print(f"Insert {ROWS} komponen gaji:")
+    for label, insert in (("commit per baris", per_row_commit),
+                          ("db.transaction()", single_transaction),
+                          ("add_salary_components", bulk_executemany)):
+        with tempfile.TemporaryDirectory() as tmp:
+            db = Database(os.path.join(tmp, 'bench.db'))
+            start = time.perf_counter()
+            insert(db, rows)
+            elapsed = time.perf_counter() - start
+            count = db.cursor.execute('SELECT COUNT(*) FROM salary_components').fetchone()[0]
+            assert count == ROWS
+            print(f"{label:>22}: {elapsed:.3f} s ({ROWS / elapsed:,.0f} baris/detik)")
+            db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+import sys
+
+import bench_util  # noqa: F401  (menambahkan src ke sys.path)
+
+from auth import (LOCKOUT_SECONDS, MAX_FAILED_ATTEMPTS, MAX_LOCKOUT_SECONDS, LoginGuard,
+                  LoginThrottled)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def allowed(guard, username='admin'):
+    try:
+        guard.begin(username)
+    except LoginThrottled:
+        return False
+    return True
+
+
+def fail(guard, username='admin'):
+    assert allowed(guard, username)
+    guard.end(username, False)
+
+
+def check_expiry_and_doubling():
+    clock = FakeClock()
+    guard = LoginGuard(clock)
+    for _ in range(MAX_FAILED_ATTEMPTS):
+        fail(guard)
+    assert not allowed(guard), "harus dikunci setelah MAX_FAILED_ATTEMPTS"
+    clock.now += LOCKOUT_SECONDS - 1
+    assert not allowed(guard), "masih dalam masa kunci"
+
+    # Setiap kegagalan sesudah kunci habis menggandakan kunci sampai batas MAX_LOCKOUT_SECONDS
+    lockout = LOCKOUT_SECONDS
+    for _ in range(8):
+        clock.now += lockout + 1
+        fail(guard)
+        lockout = min(lockout * 2, MAX_LOCKOUT_SECONDS)
+        clock.now += lockout - 1
+        assert not allowed(guard), f"kunci harus {lockout} s"
+    assert lockout == MAX_LOCKOUT_SECONDS
+
+    # Login benar sesudah kunci habis berhasil dan mengosongkan hitungan gagal
+    clock.now += lockout + 1
+    assert allowed(guard)
+    guard.end('admin', True)
+    for _ in range(MAX_FAILED_ATTEMPTS - 1):
+        fail(guard)
+    assert allowed(guard)
+
+
+def check_single_probe_after_expiry():
+    clock = FakeClock()
+    guard = LoginGuard(clock)
+    for _ in range(MAX_FAILED_ATTEMPTS):
+        fail(guard)
+    clock.now += LOCKOUT_SECONDS + 1
+    assert allowed(guard)
+    assert not allowed(guard), "hanya satu percobaan boleh lewat setelah kunci habis"
+    guard.end('admin', True)
+    assert allowed(guard)
+
+
+def check_concurrent():
+    guard = LoginGuard(FakeClock())
+    passed = sum(allowed(guard) for _ in range(50))
+    assert passed == MAX_FAILED_ATTEMPTS, f"{passed} percobaan paralel lolos"
+    assert allowed(guard, 'lain'), "username lain tidak terpengaruh"
+
+    guard = LoginGuard(FakeClock())
+    fail(guard)
+    fail(guard)
+    passed = sum(allowed(guard) for _ in range(50))
+    assert passed == MAX_FAILED_ATTEMPTS - 2, f"{passed} percobaan paralel lolos setelah 2 gagal"
+
+
+def main():
+    failures = 0
+    for check in (check_expiry_and_doubling, check_single_probe_after_expiry, check_concurrent):
+        try:
+            check()
+        except AssertionError as e:
+            print(f"FAIL {check.__name__}: {e}")
+            failures += 1
+        else:
+            print(f"OK   {check.__name__}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,118 @@
+import os
+import re
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from database import Database
+from payroll_engine import employee_payroll
+
+# Jalur panas yang harus dilayani index, bukan full scan. Method Database yang sebenarnya
+# dipanggil dan setiap statement yang dijalankannya direkam lewat set_trace_callback, jadi
+# yang diperiksa selalu SQL yang sedang dipakai, bukan salinan.
+HOT_CALLS = {
+    "get_salary_components": lambda db: db.get_salary_components(1, 6, 2025),
+    "get_attendance": lambda db: db.get_attendance(1, '2025-06-01', '2025-06-30'),
+    "add_check_in": lambda db: db.add_check_in(1, '2025-06-03', '08:00', 'Hadir'),
+    "update_check_out": lambda db: db.update_check_out(1, '2025-06-03', '17:00'),
+    "upsert_attendance_punches": lambda db: db.upsert_attendance_punches([(1, '2025-06-02', '07:55', '17:05', 'Hadir')]),
+    "get_employee_ids_by_nip (impor absensi)": lambda db: db.get_employee_ids_by_nip(['NIP1', 'NIP2']),
+    "get_month_salary_components (proses gaji)": lambda db: db.get_month_salary_components(6, 2025),
+    "get_attendance_histogram (proses gaji)": lambda db: db.get_attendance_histogram('2025-06-01', '2025-06-30'),
+    "get_attendance_histogram (rekap absensi karyawan)":
+        lambda db: db.get_attendance_histogram('2025-01-01', '2025-12-31', 1),
+    "employee_payroll (ringkasan bulanan)": lambda db: employee_payroll(db, 1, 6, 2025),
+    "run_payroll (hash slip per bulan)": lambda db: db.get_processed_payslip_hashes(6, 2025),
+    "get_processed_payslip (buka slip satu bulan)": lambda db: db.get_processed_payslip(1, 6, 2025),
+    "get_payslip_cache_paths (cache render slip)": lambda db: db.get_payslip_cache_paths(['a' * 64, 'b' * 64]),
+    "run proses gaji (mulai, checkpoint, selesai)": lambda db: run_checkpoint(db),
+    "get_all_employees (halaman keyset per departemen)":
+        lambda db: db.get_all_employees(100, after=1000, department='Umum'),
+    "get_all_salary_components (halaman keyset per periode)":
+        lambda db: db.get_all_salary_components(100, after=1000, month=6, year=2025),
+    "get_all_attendance_with_employee_names (halaman keyset)":
+        lambda db: db.get_all_attendance_with_employee_names(100, after=('2025-06-02', 10)),
+    "get_all_attendance_with_employee_names (halaman keyset per karyawan)":
+        lambda db: db.get_all_attendance_with_employee_names(100, after=('2025-06-02', 1), employee_id=1,
+                                                             start_date='2025-01-01'),
+    "get_all_processed_payslips (halaman keyset per tahun)":
+        lambda db: db.get_all_processed_payslips(100, after=(2025, 6, 1000), year=2025),
+}
+
+# Statement kontrol transaksi tidak punya rencana query
+SKIPPED = re.compile(r'\s*(BEGIN|COMMIT|ROLLBACK|SAVEPOINT|RELEASE|PRAGMA)\b', re.IGNORECASE)
+
+# Nilai contoh untuk kolom NEW./OLD. saat isi trigger dijelaskan sebagai statement biasa
+TRIGGER_VALUES = {'id': '1', 'employee_id': '1', 'month': '6', 'year': '2025', 'date': "'2025-06-02'",
+                  'basic_salary': '100'}
+
+
+def run_checkpoint(db):
+    run_id, _ = db.start_payroll_run(6, 2025, 1)
+    db.set_payroll_run_items(run_id, [(1, 'a' * 64, 'pending')])
+    db.checkpoint_payroll_run(run_id, [(1, 6, 2025, 100, 'slip.pdf', None, 'a' * 64)], {})
+    db.finish_payroll_run(run_id, 'completed')
+
+
+def seed(db):
+    db.add_employee('NIP1', 'Karyawan 1', 'Staf', 'Umum', 100, '2025-01-01', 'Aktif')
+    db.add_salary_component(1, 'Tunjangan', 10, 6, 2025)
+    db.add_attendance(1, '2025-06-02', '08:00', None, 'Hadir')
+
+
+def traced_statements(db, call):
+    statements = []
+    db.conn.set_trace_callback(statements.append)
+    try:
+        call(db)
+    finally:
+        db.conn.set_trace_callback(None)
+    # Statement yang sama muncul sekali per baris executemany dan sekali per statement trigger
+    return [sql for sql in dict.fromkeys(statements) if not SKIPPED.match(sql)]
+
+
+def trigger_statements(db):
+    # Isi setiap trigger (BEGIN ... END) dari sqlite_master, NEW./OLD. diganti nilai contoh
+    triggers = db.conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'trigger' ORDER BY name").fetchall()
+    for name, sql in triggers:
+        body = sql[re.search(r'\bBEGIN\b', sql, re.IGNORECASE).end():sql.upper().rindex('END')]
+        body = re.sub(r'\b(?:NEW|OLD)\.(\w+)', lambda match: TRIGGER_VALUES[match.group(1)], body)
+        for statement in dict.fromkeys(filter(str.strip, body.split(';'))):
+            yield f"trigger {name}", statement
+
+
+def query_plan(conn, sql):
+    return [row[3] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}')]
+
+
+def check(conn, name, sql):
+    plan = query_plan(conn, sql)
+    uses_index = all('USING' in step and ('INDEX' in step or 'PRIMARY KEY' in step)
+                     for step in plan if step.startswith(('SEARCH', 'SCAN')))
+    print(f"{'OK  ' if uses_index else 'FAIL'} {name}: {' | '.join(plan) or '(tanpa pencarian)'}")
+    if not uses_index:
+        print(f"     {' '.join(sql.split())}")
+    return uses_index
+
+
+def main():
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'plans.db'))
+        seed(db)
+        for name, call in HOT_CALLS.items():
+            statements = traced_statements(db, call)
+            if not statements:
+                print(f"FAIL {name}: tidak ada statement yang terekam")
+                failures += 1
+            for sql in statements:
+                failures += not check(db.conn, name, sql)
+        for name, sql in trigger_statements(db):
+            failures += not check(db.conn, name, sql)
+        db.close()
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
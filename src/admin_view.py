@@ -1,25 +1,33 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-                            QPushButton, QTableWidget, QTableWidgetItem,
+                            QPushButton, QTableWidget, QTableWidgetItem, QTableView,
                             QComboBox, QLineEdit, QDateEdit, QMessageBox,
-                            QTabWidget, QFormLayout, QFileDialog, QHeaderView)
+                            QTabWidget, QFormLayout, QFileDialog, QHeaderView, QMenu, QCheckBox)
 from PyQt6.QtCore import Qt, QDate
-from database import Database
+from attendance_import import import_punches
+from database import (Database, INSERTED, DELETED, ATTENDANCE_PAGE_KEY, EMPLOYEE_PAGE_KEY,
+                      PAYSLIP_PAGE_KEY, SALARY_COMPONENT_PAGE_KEY)
+from employee_import import import_employees
+from exporter import export_employees, export_salary_components
+from jobs import JobManager, JobPanel
+from money import format_rupiah, to_rupiah, to_sen
+from payroll_engine import PAYSLIP_DIR, month_bounds, run_payroll
+from payslip_archive import payslip_file
+from salary_report import salary_report_rows, write_salary_report_pdf
+from table_models import ButtonDelegate, DatabaseChangeRelay, QueryTableModel
 from datetime import datetime
-import pandas as pd
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
-from reportlab.lib.units import inch
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.enums import TA_CENTER, TA_RIGHT
 import os
 
 class AdminView(QWidget):
-    def __init__(self, main_window=None):
+    def __init__(self, main_window=None, db=None):
         super().__init__()
         self.main_window = main_window # Store reference to main_window
-        self.db = Database()
+        self.db = db or Database()
+        # Proses panjang (penggajian, laporan, ekspor) berjalan di luar GUI thread
+        self.job_manager = JobManager(self.db.manager.db_path, parent=self)
         self.init_ui()
+        # Tabel ditambal dari ChangeEvent database, bukan dimuat ulang setiap mutasi
+        self.change_relay = DatabaseChangeRelay(self.db, parent=self)
+        self.change_relay.changed.connect(self.on_database_change)
 
     def init_ui(self):
         layout = QVBoxLayout()
@@ -72,12 +80,15 @@ class AdminView(QWidget):
         employee_layout.addLayout(form_layout)
         
         # Employee List Table
-        self.employee_table = QTableWidget()
-        self.employee_table.setColumnCount(8)
-        self.employee_table.setHorizontalHeaderLabels([
+        self.employee_table = QTableView()
+        self.employee_model = QueryTableModel([
             "ID", "NIP", "Nama", "Jabatan", "Departemen",
             "Gaji Pokok", "Tanggal Bergabung", "Status"
-        ])
+        ], lambda limit, after, **filters: self.db.get_all_employees(limit, after, **filters),
+            formatters={5: format_rupiah},
+            fetch_rows=lambda ids, **filters: self.db.get_all_employees(ids=ids, **filters),
+            sort_key=EMPLOYEE_PAGE_KEY, parent=self)
+        self.employee_table.setModel(self.employee_model)
         self.employee_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
         self.employee_table.horizontalHeader().setMinimumSectionSize(160)
         employee_layout.addWidget(self.employee_table)
@@ -93,10 +104,20 @@ class AdminView(QWidget):
         employee_buttons_layout.addWidget(self.delete_employee_button)
         employee_layout.addLayout(employee_buttons_layout)
 
-        # Export to Excel Button for Employees
-        export_employee_button = QPushButton("Ekspor Karyawan ke Excel")
+        # Export to Excel/CSV Button for Employees (optional department filter)
+        export_employee_layout = QHBoxLayout()
+        export_employee_layout.addWidget(QLabel("Departemen:"))
+        self.export_department_combo = QComboBox()
+        export_employee_layout.addWidget(self.export_department_combo, 1)
+        export_employee_button = QPushButton("Ekspor Karyawan ke Excel/CSV")
         export_employee_button.clicked.connect(self.export_employees_to_excel)
-        employee_layout.addWidget(export_employee_button)
+        export_employee_layout.addWidget(export_employee_button, 2)
+        employee_layout.addLayout(export_employee_layout)
+
+        # Import Employees from CSV/Excel Button
+        import_employee_button = QPushButton("Impor Karyawan dari CSV/Excel")
+        import_employee_button.clicked.connect(self.import_employees_from_file)
+        employee_layout.addWidget(import_employee_button)
         
         employee_tab.setLayout(employee_layout)
         
@@ -136,11 +157,14 @@ class AdminView(QWidget):
         salary_layout.addLayout(salary_form)
         
         # Salary Components Table
-        self.salary_table = QTableWidget()
-        self.salary_table.setColumnCount(6)
-        self.salary_table.setHorizontalHeaderLabels([
+        self.salary_table = QTableView()
+        self.salary_model = QueryTableModel([
             "ID", "Karyawan", "Tipe Komponen", "Jumlah", "Bulan", "Tahun"
-        ])
+        ], lambda limit, after, **filters: self.db.get_all_salary_components(limit, after, **filters),
+            formatters={3: format_rupiah},
+            fetch_rows=lambda ids, **filters: self.db.get_all_salary_components(ids=ids, **filters),
+            sort_key=SALARY_COMPONENT_PAGE_KEY, parent=self)
+        self.salary_table.setModel(self.salary_model)
         self.salary_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
         self.salary_table.horizontalHeader().setMinimumSectionSize(160)
         salary_layout.addWidget(self.salary_table)
@@ -156,10 +180,27 @@ class AdminView(QWidget):
         salary_buttons_layout.addWidget(self.delete_component_button)
         salary_layout.addLayout(salary_buttons_layout)
 
-        # Export to Excel Button for Salary Components
-        export_salary_button = QPushButton("Ekspor Komponen Gaji ke Excel")
+        # Export to Excel/CSV Button for Salary Components (optional month/year/department filter)
+        export_salary_layout = QHBoxLayout()
+        export_salary_layout.addWidget(QLabel("Bulan:"))
+        self.export_month_combo = QComboBox()
+        self.export_month_combo.addItem("Semua", None)
+        for i in range(1, 13):
+            self.export_month_combo.addItem(str(i), i)
+        export_salary_layout.addWidget(self.export_month_combo)
+        export_salary_layout.addWidget(QLabel("Tahun:"))
+        self.export_year_combo = QComboBox()
+        self.export_year_combo.addItem("Semua", None)
+        for i in range(2020, datetime.now().year + 1):
+            self.export_year_combo.addItem(str(i), i)
+        export_salary_layout.addWidget(self.export_year_combo)
+        export_salary_layout.addWidget(QLabel("Departemen:"))
+        self.export_salary_department_combo = QComboBox()
+        export_salary_layout.addWidget(self.export_salary_department_combo, 1)
+        export_salary_button = QPushButton("Ekspor Komponen Gaji ke Excel/CSV")
         export_salary_button.clicked.connect(self.export_salary_components_to_excel)
-        salary_layout.addWidget(export_salary_button)
+        export_salary_layout.addWidget(export_salary_button, 2)
+        salary_layout.addLayout(export_salary_layout)
         
         salary_tab.setLayout(salary_layout)
 
@@ -187,6 +228,10 @@ class AdminView(QWidget):
         self.payroll_month_combo.setCurrentText(str(today.month))
         self.payroll_year_combo.setCurrentText(str(today.year))
 
+        # Semua slip bulan ini dalam satu file zip, bukan satu PDF per karyawan
+        self.payroll_archive_check = QCheckBox("Simpan sebagai arsip zip")
+        payroll_filter_layout.addWidget(self.payroll_archive_check)
+
         process_payroll_button = QPushButton("Proses Gaji")
         process_payroll_button.clicked.connect(self.process_payroll)
         payroll_filter_layout.addWidget(process_payroll_button)
@@ -194,11 +239,23 @@ class AdminView(QWidget):
         payroll_layout.addLayout(payroll_filter_layout)
 
         # Processed Payslips Table
-        self.payslip_table = QTableWidget()
-        self.payslip_table.setColumnCount(5) # Employee, Month, Year, Net Salary, Action (View PDF)
-        self.payslip_table.setHorizontalHeaderLabels([
+        self.payslip_table = QTableView()
+        # payslip: pp.id, e.name, pp.month, pp.year, pp.net_salary, pp.pdf_path, pp.archive_member
+        self.payslip_model = QueryTableModel([
             "Nama Karyawan", "Bulan", "Tahun", "Gaji Bersih", "Aksi"
-        ])
+        ], lambda limit, after, **filters: self.db.get_all_processed_payslips(limit, after, **filters),
+            columns=[1, 2, 3, 4, 5],
+            formatters={3: format_rupiah, 4: lambda _: "Lihat PDF"},
+            fetch_rows=lambda ids, **filters: self.db.get_all_processed_payslips(ids=ids, **filters),
+            sort_key=PAYSLIP_PAGE_KEY, descending=True, parent=self)
+        self.payslip_table.setModel(self.payslip_model)
+        # "Lihat PDF" digambar oleh delegate; klik dua kali atau menu klik kanan juga membuka PDF
+        self.payslip_button_delegate = ButtonDelegate("Lihat PDF", self.payslip_table)
+        self.payslip_button_delegate.clicked.connect(self.open_payslip_pdf)
+        self.payslip_table.setItemDelegateForColumn(4, self.payslip_button_delegate)
+        self.payslip_table.doubleClicked.connect(self.on_payslip_double_clicked)
+        self.payslip_table.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.payslip_table.customContextMenuRequested.connect(self.show_payslip_context_menu)
         self.payslip_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
         self.payslip_table.horizontalHeader().setMinimumSectionSize(160)
         payroll_layout.addWidget(self.payslip_table)
@@ -282,12 +339,46 @@ class AdminView(QWidget):
 
         attendance_admin_layout.addLayout(attendance_form) # Directly add the form layout
 
+        # Import punch logs from time-clock machines
+        import_punches_button = QPushButton("Impor Log Mesin Absensi (CSV/JSONL)")
+        import_punches_button.clicked.connect(self.import_punches_from_file)
+        attendance_admin_layout.addWidget(import_punches_button)
+
+        # Attendance list filters (server-side, so only matching rows are paged in)
+        attendance_filter_layout = QHBoxLayout()
+        attendance_filter_layout.addWidget(QLabel("Status:"))
+        self.attendance_filter_status_combo = QComboBox()
+        self.attendance_filter_status_combo.addItem("Semua", None)
+        for status in ["Hadir", "Sakit", "Izin", "Cuti", "Alpha"]:
+            self.attendance_filter_status_combo.addItem(status, status)
+        attendance_filter_layout.addWidget(self.attendance_filter_status_combo)
+        attendance_filter_layout.addWidget(QLabel("Bulan:"))
+        self.attendance_filter_month_combo = QComboBox()
+        self.attendance_filter_month_combo.addItem("Semua", None)
+        for i in range(1, 13):
+            self.attendance_filter_month_combo.addItem(str(i), i)
+        self.attendance_filter_month_combo.setEnabled(False)
+        attendance_filter_layout.addWidget(self.attendance_filter_month_combo)
+        attendance_filter_layout.addWidget(QLabel("Tahun:"))
+        self.attendance_filter_year_combo = QComboBox()
+        self.attendance_filter_year_combo.addItem("Semua", None)
+        for i in range(2020, datetime.now().year + 1):
+            self.attendance_filter_year_combo.addItem(str(i), i)
+        attendance_filter_layout.addWidget(self.attendance_filter_year_combo)
+        attendance_filter_layout.addStretch()
+        for combo in (self.attendance_filter_status_combo, self.attendance_filter_month_combo,
+                      self.attendance_filter_year_combo):
+            combo.currentIndexChanged.connect(self.apply_attendance_filters)
+        attendance_admin_layout.addLayout(attendance_filter_layout)
+
         # Attendance List Table
-        self.admin_attendance_table = QTableWidget()
-        self.admin_attendance_table.setColumnCount(6) # ID, Employee, Date, Check In, Check Out, Status
-        self.admin_attendance_table.setHorizontalHeaderLabels([
+        self.admin_attendance_table = QTableView()
+        self.admin_attendance_model = QueryTableModel([
             "ID", "Karyawan", "Tanggal", "Jam Masuk", "Jam Keluar", "Status"
-        ])
+        ], lambda limit, after, **filters: self.db.get_all_attendance_with_employee_names(limit, after, **filters),
+            fetch_rows=lambda ids, **filters: self.db.get_all_attendance_with_employee_names(ids=ids, **filters),
+            sort_key=ATTENDANCE_PAGE_KEY, descending=True, parent=self)
+        self.admin_attendance_table.setModel(self.admin_attendance_model)
         self.admin_attendance_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
         self.admin_attendance_table.horizontalHeader().setMinimumSectionSize(160)
         attendance_admin_layout.addWidget(self.admin_attendance_table)
@@ -301,6 +392,10 @@ class AdminView(QWidget):
         tabs.addTab(attendance_admin_tab, "Manajemen Absensi")
         
         layout.addWidget(tabs)
+
+        # Job Status Panel
+        self.job_panel = JobPanel(self.job_manager)
+        layout.addWidget(self.job_panel)
         self.setLayout(layout)
         
         # Load initial data
@@ -309,6 +404,7 @@ class AdminView(QWidget):
         self.load_processed_payslips()
         self.load_admin_attendance()
         self.load_attendance_employee_combo()
+        self.load_department_combos()
 
     def logout(self):
         if self.main_window:
@@ -322,7 +418,7 @@ class AdminView(QWidget):
             department = self.department_input.text()
             
             try:
-                basic_salary = float(self.salary_input.text())
+                basic_salary = to_sen(self.salary_input.text())
             except ValueError:
                 QMessageBox.warning(self, "Error", "Gaji Pokok harus berupa angka.")
                 return
@@ -338,12 +434,10 @@ class AdminView(QWidget):
                 # Also add the employee as a user with a default password
                 if self.db.add_user(nip, "123456", "employee"):
                     QMessageBox.information(self, "Berhasil", "Karyawan dan akun login berhasil ditambahkan!")
-                    self.load_employees()
-                    self.load_attendance_employee_combo()
                     self.clear_employee_form()
                 else:
                     # If user creation fails (e.g., NIP already used as username), remove employee
-                    self.db.delete_employee(self.db.get_employee(nip=nip)[0]) # Assuming get_employee by NIP returns (id, ...)
+                    self.db.delete_employee(self.db.get_employee(nip=nip).id)
                     QMessageBox.warning(self, "Error", "Gagal menambahkan akun login karyawan. NIP mungkin sudah digunakan sebagai username.")
             else:
                 QMessageBox.warning(self, "Error", "Gagal menambahkan karyawan. NIP mungkin sudah ada.")
@@ -357,17 +451,17 @@ class AdminView(QWidget):
             return
         
         row = selected_rows[0].row()
-        employee_id = int(self.employee_table.item(row, 0).text())
+        employee_id = self.employee_model.row_id(row)
         employee = self.db.get_employee(employee_id=employee_id)
         
         if employee:
-            self.nip_input.setText(employee[1])
-            self.name_input.setText(employee[2])
-            self.position_input.setText(employee[3])
-            self.department_input.setText(employee[4])
-            self.salary_input.setText(str(employee[5]).replace(",", ""))
-            self.join_date_input.setDate(QDate.fromString(employee[6], "yyyy-MM-dd"))
-            self.status_input.setCurrentText(employee[7])
+            self.nip_input.setText(employee.nip)
+            self.name_input.setText(employee.name)
+            self.position_input.setText(employee.position)
+            self.department_input.setText(employee.department)
+            self.salary_input.setText(str(to_rupiah(employee.basic_salary)))
+            self.join_date_input.setDate(QDate.fromString(employee.join_date, "yyyy-MM-dd"))
+            self.status_input.setCurrentText(employee.status)
             self.current_employee_id = employee_id
             # Store the current add_button text to revert later
             self._original_add_button_text = self.add_button.text()
@@ -389,7 +483,7 @@ class AdminView(QWidget):
             department = self.department_input.text()
             
             try:
-                basic_salary = float(self.salary_input.text().replace(",", ""))
+                basic_salary = to_sen(self.salary_input.text())
                 print(f"[DEBUG] Gaji Pokok dari input field (setelah bersih): {basic_salary}")
             except ValueError:
                 QMessageBox.warning(self, "Error", "Gaji Pokok harus berupa angka.")
@@ -404,8 +498,6 @@ class AdminView(QWidget):
 
             if self.db.update_employee(employee_id, nip, name, position, department, basic_salary, join_date, status):
                 QMessageBox.information(self, "Berhasil", "Data karyawan berhasil diperbarui")
-                self.load_employees()
-                self.load_attendance_employee_combo()
                 self.clear_employee_form()
                 # Revert button text and connection
                 self.add_button.setText(self._original_add_button_text) 
@@ -431,12 +523,10 @@ class AdminView(QWidget):
         
         if reply == QMessageBox.StandardButton.Yes:
             row = selected_rows[0].row()
-            employee_id = int(self.employee_table.item(row, 0).text())
+            employee_id = self.employee_model.row_id(row)
             
             if self.db.delete_employee(employee_id):
                 QMessageBox.information(self, "Berhasil", "Karyawan berhasil dihapus")
-                self.load_employees()
-                self.load_attendance_employee_combo()
                 self.clear_employee_form()
             else:
                 QMessageBox.warning(self, "Error", "Gagal menghapus karyawan.")
@@ -447,7 +537,7 @@ class AdminView(QWidget):
             component_type = self.component_type.currentText()
             
             try:
-                amount = float(self.amount_input.text())
+                amount = to_sen(self.amount_input.text())
             except ValueError:
                 QMessageBox.warning(self, "Error", "Jumlah harus berupa angka.")
                 return
@@ -467,7 +557,6 @@ class AdminView(QWidget):
             
             self.db.add_salary_component(employee_id, component_type, amount, month, year)
             QMessageBox.information(self, "Berhasil", "Komponen gaji berhasil ditambahkan")
-            self.load_salary_components()
             self.clear_salary_form()
         except Exception as e:
             QMessageBox.warning(self, "Error", f"Terjadi kesalahan tak terduga: {e}")
@@ -479,7 +568,7 @@ class AdminView(QWidget):
             return
 
         row = selected_rows[0].row()
-        component_id = int(self.salary_table.item(row, 0).text())
+        component_id, employee_name, component_type, amount, month, year = self.salary_model.row_data(row)
         # We need to get the full component data including employee_id
         # The current get_salary_components method only fetches by employee_id, month, year.
         # We need a method to get a single component by its ID.
@@ -487,15 +576,14 @@ class AdminView(QWidget):
         # Ideally, we should add a get_salary_component_by_id to database.py
 
         # Find the employee in the combo box by name
-        employee_name = self.salary_table.item(row, 1).text()
         index = self.employee_combo.findText(employee_name, Qt.MatchFlag.MatchContains)
         if index != -1:
             self.employee_combo.setCurrentIndex(index)
 
-        self.component_type.setCurrentText(self.salary_table.item(row, 2).text())
-        self.amount_input.setText(self.salary_table.item(row, 3).text().replace(",", "")) # Remove comma for float conversion
-        self.month_input.setCurrentText(self.salary_table.item(row, 4).text())
-        self.year_input.setCurrentText(self.salary_table.item(row, 5).text())
+        self.component_type.setCurrentText(component_type)
+        self.amount_input.setText(str(to_rupiah(amount)))
+        self.month_input.setCurrentText(str(month))
+        self.year_input.setCurrentText(str(year))
 
         self.current_component_id = component_id
         self._original_add_component_button_text = self.add_component_button.text()
@@ -514,7 +602,7 @@ class AdminView(QWidget):
             component_type = self.component_type.currentText()
             
             try:
-                amount = float(self.amount_input.text())
+                amount = to_sen(self.amount_input.text())
             except ValueError:
                 QMessageBox.warning(self, "Error", "Jumlah harus berupa angka.")
                 return
@@ -528,7 +616,6 @@ class AdminView(QWidget):
 
             if self.db.update_salary_component(component_id, employee_id, component_type, amount, month, year):
                 QMessageBox.information(self, "Berhasil", "Komponen gaji berhasil diperbarui")
-                self.load_salary_components()
                 self.clear_salary_form()
                 self.add_component_button.setText(self._original_add_component_button_text)
                 self.add_component_button.disconnect()
@@ -553,34 +640,25 @@ class AdminView(QWidget):
         
         if reply == QMessageBox.StandardButton.Yes:
             row = selected_rows[0].row()
-            component_id = int(self.salary_table.item(row, 0).text())
+            component_id = self.salary_model.row_id(row)
             
             if self.db.delete_salary_component(component_id):
                 QMessageBox.information(self, "Berhasil", "Komponen gaji berhasil dihapus")
-                self.load_salary_components()
                 self.clear_salary_form()
             else:
                 QMessageBox.warning(self, "Error", "Gagal menghapus komponen gaji.")
 
     def load_employees(self):
-        self.employee_table.setRowCount(0)
-        employees = self.db.cursor.execute("SELECT * FROM employees").fetchall()
+        self.employee_model.reload()
+        self.load_employee_combo()
+
+    def load_employee_combo(self):
         self.employee_combo.clear()
-        self.attendance_employee_combo.clear()
-        for row_num, employee in enumerate(employees):
-            self.employee_table.insertRow(row_num)
-            for col_num, data in enumerate(employee):
-                self.employee_table.setItem(row_num, col_num, QTableWidgetItem(str(data)))
-            self.employee_combo.addItem(f"{employee[2]} ({employee[1]})", employee[0]) # Name (NIP), ID
-            self.attendance_employee_combo.addItem(f"{employee[2]} ({employee[1]})", employee[0])
+        for employee in self.db.get_all_employees():
+            self.employee_combo.addItem(f"{employee.name} ({employee.nip})", employee.id) # Name (NIP), ID
 
     def load_salary_components(self):
-        self.salary_table.setRowCount(0)
-        salary_components = self.db.cursor.execute("SELECT sc.id, e.name, sc.component_type, sc.amount, sc.month, sc.year FROM salary_components sc JOIN employees e ON sc.employee_id = e.id").fetchall()
-        for row_num, component in enumerate(salary_components):
-            self.salary_table.insertRow(row_num)
-            for col_num, data in enumerate(component):
-                self.salary_table.setItem(row_num, col_num, QTableWidgetItem(str(data)))
+        self.salary_model.reload()
 
     def clear_employee_form(self):
         self.nip_input.clear()
@@ -597,117 +675,99 @@ class AdminView(QWidget):
         self.month_input.setCurrentIndex(0)
         self.year_input.setCurrentIndex(0)
 
+    def export_file_dialog(self, title, default_name):
+        filepath, selected_filter = QFileDialog.getSaveFileName(
+            self, title, default_name, "Excel Files (*.xlsx);;CSV Files (*.csv)")
+        if filepath and os.path.splitext(filepath)[1].lower() not in ('.xlsx', '.csv'):
+            filepath += '.csv' if 'csv' in selected_filter.lower() else '.xlsx'
+        return filepath
+
     def export_employees_to_excel(self):
-        try:
-            filepath, _ = QFileDialog.getSaveFileName(self, "Ekspor Data Karyawan", "karyawan_data.xlsx", "Excel Files (*.xlsx)")
-            if filepath:
-                employees = self.db.get_all_employees()
-                # Define column names based on the SELECT query in get_all_employees
-                columns = ["ID", "NIP", "Nama", "Jabatan", "Departemen", "Gaji Pokok", "Tanggal Bergabung", "Status"]
-                df = pd.DataFrame(employees, columns=columns)
-                df.to_excel(filepath, index=False)
-                QMessageBox.information(self, "Berhasil", "Data karyawan berhasil diekspor ke Excel!")
-        except Exception as e:
-            QMessageBox.warning(self, "Error", f"Gagal mengekspor data karyawan: {e}")
+        filepath = self.export_file_dialog("Ekspor Data Karyawan", "karyawan_data.xlsx")
+        if filepath:
+            department = self.export_department_combo.currentData()
+            self.job_manager.submit(
+                f"Ekspor karyawan ke {os.path.basename(filepath)}", export_employees_job, filepath, department,
+                on_finished=lambda count: QMessageBox.information(self, "Berhasil", f"{count} data karyawan berhasil diekspor!"),
+                on_failed=lambda error: QMessageBox.warning(self, "Error", f"Gagal mengekspor data karyawan: {error}"))
+
+    def import_employees_from_file(self):
+        filepath, _ = QFileDialog.getOpenFileName(self, "Impor Data Karyawan", "", "CSV/Excel Files (*.csv *.xlsx)")
+        if filepath:
+            self.job_manager.submit(
+                f"Impor karyawan dari {os.path.basename(filepath)}", import_employees_job, filepath,
+                on_finished=self.on_import_employees_finished,
+                on_failed=lambda error: QMessageBox.warning(self, "Error", f"Gagal mengimpor data karyawan: {error}"))
+
+    def on_import_employees_finished(self, result):
+        report, error_path = result
+        message = (f"{report.imported} dari {report.total} karyawan berhasil diimpor "
+                   f"({report.rows_per_second:,.0f} baris/detik).")
+        if report.cancelled:
+            message += "\nImpor dibatalkan sebelum selesai."
+        if report.errors:
+            message += f"\n{len(report.errors)} baris gagal, rincian disimpan di:\n{error_path}"
+            QMessageBox.warning(self, "Sebagian Gagal", message)
+        else:
+            QMessageBox.information(self, "Berhasil", message)
+
+    def import_punches_from_file(self):
+        filepath, _ = QFileDialog.getOpenFileName(self, "Impor Log Mesin Absensi", "",
+                                                  "Log Absensi (*.csv *.jsonl *.ndjson *.json)")
+        if filepath:
+            self.job_manager.submit(
+                f"Impor absensi dari {os.path.basename(filepath)}", import_punches_job, filepath,
+                on_finished=self.on_import_punches_finished,
+                on_failed=lambda error: QMessageBox.warning(self, "Error", f"Gagal mengimpor log absensi: {error}"))
+
+    def on_import_punches_finished(self, result):
+        report, error_path = result
+        message = (f"{report.imported} dari {report.total} tap berhasil diimpor ({report.upserts} upsert absensi, "
+                   f"{report.rows_per_second:,.0f} tap/detik).")
+        if report.cancelled:
+            message += "\nImpor dibatalkan sebelum selesai."
+        if report.errors:
+            message += f"\n{len(report.errors)} tap ditolak, rincian disimpan di:\n{error_path}"
+            QMessageBox.warning(self, "Sebagian Gagal", message)
+        else:
+            QMessageBox.information(self, "Berhasil", message)
 
     def export_salary_components_to_excel(self):
-        try:
-            filepath, _ = QFileDialog.getSaveFileName(self, "Ekspor Data Komponen Gaji", "komponen_gaji_data.xlsx", "Excel Files (*.xlsx)")
-            if filepath:
-                salary_components = self.db.get_all_salary_components()
-                # Define column names based on the SELECT query in get_all_salary_components
-                columns = ["ID Komponen", "Nama Karyawan", "Tipe Komponen", "Jumlah", "Bulan", "Tahun"]
-                df = pd.DataFrame(salary_components, columns=columns)
-                df.to_excel(filepath, index=False)
-                QMessageBox.information(self, "Berhasil", "Data komponen gaji berhasil diekspor ke Excel!")
-        except Exception as e:
-            QMessageBox.warning(self, "Error", f"Gagal mengekspor data komponen gaji: {e}")
+        filepath = self.export_file_dialog("Ekspor Data Komponen Gaji", "komponen_gaji_data.xlsx")
+        if filepath:
+            month = self.export_month_combo.currentData()
+            year = self.export_year_combo.currentData()
+            department = self.export_salary_department_combo.currentData()
+            self.job_manager.submit(
+                f"Ekspor komponen gaji ke {os.path.basename(filepath)}", export_salary_components_job,
+                filepath, month, year, department,
+                on_finished=lambda count: QMessageBox.information(self, "Berhasil", f"{count} data komponen gaji berhasil diekspor!"),
+                on_failed=lambda error: QMessageBox.warning(self, "Error", f"Gagal mengekspor data komponen gaji: {error}"))
 
     def generate_salary_report(self):
-        self.report_table.setRowCount(0)
         month = int(self.report_month_combo.currentText())
         year = int(self.report_year_combo.currentText())
+        self.job_manager.submit(
+            f"Laporan gaji {month}/{year}", salary_report_job, month, year,
+            on_finished=self.show_salary_report,
+            on_failed=lambda error: QMessageBox.warning(self, "Error", f"Gagal membuat laporan gaji: {error}"))
 
-        # Fetch all employees
-        employees = self.db.get_all_employees()
-        
-        # Prepare data for the report table
-        report_data = []
-        for employee_id, _, name, _, _, basic_salary, _, _ in employees:
-            components = self.db.get_salary_components(employee_id, month, year)
-            
-            total_allowances_bonuses = 0.0
-            total_deductions_taxes = 0.0
-            
-            for comp_id, emp_id, comp_type, amount, comp_month, comp_year in components:
-                if comp_type in ["Tunjangan", "Lembur", "Bonus"]:
-                    total_allowances_bonuses += amount
-                elif comp_type in ["Potongan", "Pajak", "Asuransi"]:
-                    total_deductions_taxes += amount
-            
-            total_gross_salary = basic_salary + total_allowances_bonuses
-            total_net_salary = total_gross_salary - total_deductions_taxes
-
-            report_data.append([
-                name,
-                f"{basic_salary:,.2f}",
-                f"{total_allowances_bonuses:,.2f}",
-                f"{total_net_salary:,.2f}"
-            ])
-
+    def show_salary_report(self, report_data):
+        self.report_table.setRowCount(0)
         for row_num, row_data in enumerate(report_data):
             self.report_table.insertRow(row_num)
             for col_num, data in enumerate(row_data):
                 self.report_table.setItem(row_num, col_num, QTableWidgetItem(str(data)))
 
     def export_salary_report_to_pdf(self):
-        try:
-            filepath, _ = QFileDialog.getSaveFileName(self, "Ekspor Laporan Gaji ke PDF", "laporan_gaji.pdf", "PDF Files (*.pdf)")
-            if filepath:
-                month = int(self.report_month_combo.currentText())
-                year = int(self.report_year_combo.currentText())
-                employees = self.db.get_all_employees()
-                report_data = []
-                for employee_id, _, name, _, _, basic_salary, _, _ in employees:
-                    components = self.db.get_salary_components(employee_id, month, year)
-                    total_allowances_bonuses = 0.0
-                    total_deductions_taxes = 0.0
-                    for comp_id, emp_id, comp_type, amount, comp_month, comp_year in components:
-                        if comp_type in ["Tunjangan", "Bonus"]:
-                            total_allowances_bonuses += amount
-                        elif comp_type in ["Potongan", "Pajak", "Asuransi"]:
-                            total_deductions_taxes += amount
-                    total_gross_salary = basic_salary + total_allowances_bonuses
-                    total_net_salary = total_gross_salary - total_deductions_taxes
-                    report_data.append([
-                        name,
-                        f"{basic_salary:,.2f}",
-                        f"{total_allowances_bonuses:,.2f}",
-                        f"{total_net_salary:,.2f}"
-                    ])
-                from reportlab.lib.pagesizes import letter
-                from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-                from reportlab.lib.styles import getSampleStyleSheet
-                from reportlab.lib.units import inch
-                doc = SimpleDocTemplate(filepath, pagesize=letter)
-                styles = getSampleStyleSheet()
-                story = []
-                story.append(Paragraph(f"Laporan Rekapitulasi Gaji Bulan {month} Tahun {year}", styles['Title']))
-                story.append(Spacer(1, 0.2 * inch))
-                data = [["Nama Karyawan", "Gaji Pokok", "Total Tunjangan/Bonus", "Total Gaji Bersih"]] + report_data
-                table = Table(data, colWidths=[2.5*inch, 1.5*inch, 1.5*inch, 1.5*inch])
-                table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), '#CCCCCC'),
-                    ('GRID', (0, 0), (-1, -1), 1, 'black'),
-                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                    ('ALIGN', (1, 0), (-1, -1), 'RIGHT'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ]))
-                story.append(table)
-                doc.build(story)
-                QMessageBox.information(self, "Berhasil", "Laporan gaji berhasil diekspor ke PDF!")
-        except Exception as e:
-            QMessageBox.warning(self, "Error", f"Gagal mengekspor laporan gaji ke PDF: {e}")
+        filepath, _ = QFileDialog.getSaveFileName(self, "Ekspor Laporan Gaji ke PDF", "laporan_gaji.pdf", "PDF Files (*.pdf)")
+        if filepath:
+            month = int(self.report_month_combo.currentText())
+            year = int(self.report_year_combo.currentText())
+            self.job_manager.submit(
+                f"Ekspor laporan gaji {month}/{year} ke PDF", export_salary_report_pdf_job, month, year, filepath,
+                on_finished=lambda _: QMessageBox.information(self, "Berhasil", "Laporan gaji berhasil diekspor ke PDF!"),
+                on_failed=lambda error: QMessageBox.warning(self, "Error", f"Gagal mengekspor laporan gaji ke PDF: {error}"))
 
     def process_payroll(self):
         month = int(self.payroll_month_combo.currentText())
@@ -721,140 +781,57 @@ class AdminView(QWidget):
         if reply == QMessageBox.StandardButton.No:
             return
 
-        employees = self.db.get_all_employees()
-        processed_count = 0
-
         # Create a directory for payslips if it doesn't exist
-        payslip_dir = os.path.join('resources', 'payslips')
-        if not os.path.exists(payslip_dir):
-            os.makedirs(payslip_dir)
-
-        for employee_id, _, name, _, _, basic_salary, _, _ in employees:
-            components = self.db.get_salary_components(employee_id, month, year)
-            attendance_records = self.db.get_attendance(employee_id, 
-                                                      QDate(year, month, 1).toString("yyyy-MM-dd"), 
-                                                      QDate(year, month, QDate(year, month, 1).daysInMonth()).toString("yyyy-MM-dd"))
-
-            total_allowances_bonuses = 0.0
-            total_deductions_taxes = 0.0
-            total_alpha_days = 0
-            days_in_month = QDate(year, month, 1).daysInMonth()
-
-            for comp_id, emp_id, comp_type, amount, comp_month, comp_year in components:
-                if comp_type in ["Tunjangan", "Lembur", "Bonus"]:
-                    total_allowances_bonuses += amount
-                elif comp_type in ["Potongan", "Pajak", "Asuransi"]:
-                    total_deductions_taxes += amount
-            
-            # Calculate deductions based on attendance
-            for record in attendance_records:
-                if record[5] == "Alpha": # Assuming index 5 is status
-                    total_alpha_days += 1
-            
-            # Simple deduction for Alpha days (e.g., basic_salary / days_in_month * alpha_days)
-            deduction_for_alpha = 0.0
-            if days_in_month > 0:
-                deduction_for_alpha = (basic_salary / days_in_month) * total_alpha_days
-            
-            # Add attendance deduction to total_deductions_taxes
-            total_deductions_taxes += deduction_for_alpha
-
-            total_gross_salary = basic_salary + total_allowances_bonuses
-            total_net_salary = total_gross_salary - total_deductions_taxes
+        if not os.path.exists(PAYSLIP_DIR):
+            os.makedirs(PAYSLIP_DIR)
+
+        self.job_manager.submit(
+            f"Proses gaji {month}/{year}", payroll_job, month, year, PAYSLIP_DIR,
+            self.payroll_archive_check.isChecked(),
+            on_finished=self.on_payroll_finished,
+            on_failed=lambda error: QMessageBox.warning(self, "Error", f"Gagal memproses gaji: {error}"))
+
+    def on_payroll_finished(self, payroll):
+        results, report = payroll
+        if report.failures:
+            names = {result.employee_id: result.name for result in results}
+            failed = "\n".join(f"- {names.get(employee_id, employee_id)}: {error}" for employee_id, error in report.failures.items())
+            QMessageBox.warning(self, "Sebagian Gagal",
+                                f"{len(report.rendered)} slip gaji berhasil dibuat, {len(report.failures)} gagal:\n{failed}")
+        elif report.cancelled:
+            QMessageBox.information(self, "Dibatalkan", f"Proses gaji dibatalkan. {len(report.rendered)} slip gaji sudah dibuat; "
+                                                        "jalankan Proses Gaji lagi untuk melanjutkan.")
+        else:
+            skipped = f"\n{len(report.skipped)} slip gaji tidak berubah dan tidak dibuat ulang." if report.skipped else ""
+            cache = f"\nCache slip: {report.cache_hits} hit, {report.cache_misses} miss." if report.rendered else ""
+            QMessageBox.information(self, "Berhasil", f"{len(report.rendered)} slip gaji berhasil diproses dan dibuat!{skipped}{cache}")
 
-            # Generate PDF Payslip
-            pdf_filename = f"slip_gaji_{name.replace(' ','_')}_{month}_{year}.pdf"
-            pdf_filepath = os.path.join(payslip_dir, pdf_filename)
-            self.generate_payslip_pdf(name, month, year, basic_salary, components, 
-                                      total_net_salary, pdf_filepath, attendance_records, deduction_for_alpha)
-            
-            # Store processed payslip info in DB
-            self.db.add_processed_payslip(employee_id, month, year, total_net_salary, pdf_filepath)
-            processed_count += 1
+    def load_processed_payslips(self):
+        self.payslip_model.reload()
 
-        QMessageBox.information(self, "Berhasil", f"{processed_count} slip gaji berhasil diproses dan dibuat!")
-        self.load_processed_payslips()
+    def open_payslip_pdf(self, row):
+        payslip = self.payslip_model.row_data(row)
+        try:
+            # Slip dalam arsip zip diekstrak satu per satu saat dibuka
+            filepath = payslip_file(payslip.pdf_path, payslip.archive_member)
+        except Exception as e:
+            QMessageBox.warning(self, "Error", f"Gagal membaca slip gaji: {e}")
+            return
+        self.open_pdf(filepath)
 
-    def generate_payslip_pdf(self, employee_name, month, year, basic_salary, components, net_salary, filepath, attendance_records, deduction_for_alpha):
-        doc = SimpleDocTemplate(filepath, pagesize=letter)
-        styles = getSampleStyleSheet()
-        title_style = styles['h1']
-        normal_style = styles['Normal']
-        right_style = ParagraphStyle(name='RightAlign', alignment=TA_RIGHT)
-        center_style = ParagraphStyle(name='CenterAlign', alignment=TA_CENTER)
-
-        story = []
-
-        story.append(Paragraph("SLIP GAJI KARYAWAN", center_style))
-        story.append(Spacer(1, 0.2 * inch))
-        story.append(Paragraph(f"Bulan: {month} Tahun: {year}", center_style))
-        story.append(Spacer(1, 0.2 * inch))
-
-        story.append(Paragraph(f"Nama Karyawan: {employee_name}", normal_style))
-        story.append(Paragraph(f"Gaji Pokok: Rp {basic_salary:,.2f}", normal_style))
-        story.append(Spacer(1, 0.1 * inch))
-
-        # Components Table
-        data = [['Tipe Komponen', 'Jumlah']]
-        for comp_id, emp_id, comp_type, amount, comp_month, comp_year in components:
-            data.append([comp_type, f"Rp {amount:,.2f}"])
-        
-        # Add attendance deduction to components table for clarity
-        if deduction_for_alpha > 0:
-            data.append(['Potongan Absensi (Alpha)', f"Rp {deduction_for_alpha:,.2f}"])
-
-        # Add a total row
-        data.append(['<b>Total Gaji Bersih</b>', f'<b>Rp {net_salary:,.2f}</b>'])
-
-        table = Table(data, colWidths=[3.5 * inch, 2.0 * inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), '#CCCCCC'),
-            ('GRID', (0, 0), (-1, -1), 1, 'black'),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (-1, -1), 'RIGHT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'), # Bold total row
-            ('BACKGROUND', (0, -1), (-1, -1), '#EEEEEE'), # Grey background for total row
-        ]))
-        story.append(table)
-        story.append(Spacer(1, 0.2 * inch))
-
-        # Attendance Summary in PDF
-        total_days = QDate(year, month, 1).daysInMonth()
-        hadir_days = sum(1 for r in attendance_records if r[5] == "Hadir")
-        sakit_days = sum(1 for r in attendance_records if r[5] == "Sakit")
-        izin_days = sum(1 for r in attendance_records if r[5] == "Izin")
-        cuti_days = sum(1 for r in attendance_records if r[5] == "Cuti")
-        alpha_days = sum(1 for r in attendance_records if r[5] == "Alpha")
-
-        story.append(Paragraph("Ringkasan Absensi:", normal_style))
-        story.append(Paragraph(f"Total Hari Kerja Bulan Ini: {total_days} hari", normal_style))
-        story.append(Paragraph(f"Hadir: {hadir_days} hari", normal_style))
-        story.append(Paragraph(f"Sakit: {sakit_days} hari", normal_style))
-        story.append(Paragraph(f"Izin: {izin_days} hari", normal_style))
-        story.append(Paragraph(f"Cuti: {cuti_days} hari", normal_style))
-        story.append(Paragraph(f"Alpha: {alpha_days} hari", normal_style))
-        story.append(Spacer(1, 0.5 * inch))
-
-        story.append(Paragraph("Hormat kami,", right_style))
-        story.append(Paragraph("Admin Perusahaan", right_style))
-
-        doc.build(story)
+    def on_payslip_double_clicked(self, index):
+        # Kolom "Aksi" sudah ditangani ButtonDelegate saat klik pertama
+        if index.column() != 4:
+            self.open_payslip_pdf(index.row())
 
-    def load_processed_payslips(self):
-        self.payslip_table.setRowCount(0)
-        processed_payslips = self.db.get_all_processed_payslips()
-        for row_num, payslip in enumerate(processed_payslips):
-            self.payslip_table.insertRow(row_num)
-            # payslip: pp.id, e.name, pp.month, pp.year, pp.net_salary, pp.pdf_path
-            self.payslip_table.setItem(row_num, 0, QTableWidgetItem(str(payslip[1])))
-            self.payslip_table.setItem(row_num, 1, QTableWidgetItem(str(payslip[2])))
-            self.payslip_table.setItem(row_num, 2, QTableWidgetItem(str(payslip[3])))
-            self.payslip_table.setItem(row_num, 3, QTableWidgetItem(f"{payslip[4]:,.2f}"))
-            
-            view_button = QPushButton("Lihat PDF")
-            view_button.clicked.connect(lambda _, f=payslip[5]: self.open_pdf(f))
-            self.payslip_table.setCellWidget(row_num, 4, view_button)
+    def show_payslip_context_menu(self, pos):
+        index = self.payslip_table.indexAt(pos)
+        if not index.isValid():
+            return
+        menu = QMenu(self)
+        view_action = menu.addAction("Lihat PDF")
+        if menu.exec(self.payslip_table.viewport().mapToGlobal(pos)) == view_action:
+            self.open_payslip_pdf(index.row())
 
     def open_pdf(self, filepath):
         try:
@@ -873,17 +850,11 @@ class AdminView(QWidget):
                 QMessageBox.warning(self, "Error", "Pilih karyawan terlebih dahulu.")
                 return
 
-            # Check if an attendance record for this employee and date already exists.
-            self.db.cursor.execute('SELECT id FROM attendance WHERE employee_id = ? AND date = ?', (employee_id, date))
-            if self.db.cursor.fetchone():
-                QMessageBox.warning(self, "Error", f"Absensi untuk karyawan ini pada tanggal {date} sudah ada.")
-                return
-
-            if self.db.add_attendance(employee_id, date, check_in_time, None, status):
+            # Absensi ganda ditolak oleh index unik (employee_id, date), tanpa SELECT terpisah
+            if self.db.add_check_in(employee_id, date, check_in_time, status):
                 QMessageBox.information(self, "Berhasil", f"Jam masuk untuk {self.attendance_employee_combo.currentText()} berhasil dicatat pada {check_in_time}.")
-                self.load_admin_attendance()
             else:
-                QMessageBox.warning(self, "Error", "Gagal mencatat jam masuk.")
+                QMessageBox.warning(self, "Error", f"Gagal mencatat jam masuk. Absensi untuk karyawan ini pada tanggal {date} mungkin sudah ada.")
 
         except Exception as e:
             QMessageBox.warning(self, "Error", f"Terjadi kesalahan tak terduga: {e}")
@@ -900,7 +871,6 @@ class AdminView(QWidget):
 
             if self.db.update_check_out(employee_id, date, check_out_time):
                  QMessageBox.information(self, "Berhasil", f"Jam keluar untuk {self.attendance_employee_combo.currentText()} berhasil dicatat pada {check_out_time}.")
-                 self.load_admin_attendance()
             else:
                  QMessageBox.warning(self, "Error", "Gagal mencatat jam keluar. Pastikan sudah ada catatan jam masuk untuk karyawan dan tanggal yang dipilih, dan jam keluar belum diisi.")
 
@@ -908,16 +878,20 @@ class AdminView(QWidget):
             QMessageBox.warning(self, "Error", f"Terjadi kesalahan tak terduga: {e}")
 
     def load_admin_attendance(self):
-        self.admin_attendance_table.setRowCount(0)
-        all_attendance = self.db.get_all_attendance_with_employee_names()
-
-        for row_num, record in enumerate(all_attendance):
-            self.admin_attendance_table.insertRow(row_num)
-            for col_num, data in enumerate(record):
-                # Handle None values for check_in and check_out
-                if data is None:
-                    data = ''
-                self.admin_attendance_table.setItem(row_num, col_num, QTableWidgetItem(str(data)))
+        self.admin_attendance_model.reload()
+
+    def apply_attendance_filters(self):
+        status = self.attendance_filter_status_combo.currentData()
+        month = self.attendance_filter_month_combo.currentData()
+        year = self.attendance_filter_year_combo.currentData()
+        # Bulan hanya berlaku jika tahun dipilih
+        self.attendance_filter_month_combo.setEnabled(year is not None)
+        start_date = end_date = None
+        if year is not None and month is not None:
+            start_date, end_date, _ = month_bounds(month, year)
+        elif year is not None:
+            start_date, end_date = f"{year:04d}-01-01", f"{year:04d}-12-31"
+        self.admin_attendance_model.set_filters(status=status, start_date=start_date, end_date=end_date)
 
     def clear_attendance_form(self):
         self.attendance_employee_combo.setCurrentIndex(0)
@@ -927,6 +901,112 @@ class AdminView(QWidget):
     def load_attendance_employee_combo(self):
         self.attendance_employee_combo.clear()
         self.attendance_employee_combo.addItem("Pilih Karyawan", None) # Add a default empty item
-        employees = self.db.get_all_employees()
-        for emp_id, _, name, _, _, _, _, _ in employees:
-            self.attendance_employee_combo.addItem(f"{name} ({emp_id})", emp_id) 
\ No newline at end of file
+        for employee in self.db.get_all_employees():
+            self.attendance_employee_combo.addItem(f"{employee.name} ({employee.id})", employee.id)
+
+    def load_department_combos(self):
+        departments = self.db.get_departments()
+        for combo in (self.export_department_combo, self.export_salary_department_combo):
+            selected = combo.currentData()
+            combo.clear()
+            combo.addItem("Semua Departemen", None)
+            for department in departments:
+                combo.addItem(department, department)
+            index = combo.findData(selected)
+            combo.setCurrentIndex(max(index, 0))
+
+    def on_database_change(self, event):
+        models = {
+            'employees': self.employee_model,
+            'salary_components': self.salary_model,
+            'processed_payslips': self.payslip_model,
+            'attendance': self.admin_attendance_model,
+        }
+        model = models.get(event.table)
+        if model is None:
+            return
+        model.apply_change(event)
+        if event.table == 'employees':
+            self.patch_employee_combos(event)
+            self.load_department_combos()
+            if event.kind != INSERTED:
+                # Nama karyawan ikut tampil (JOIN) di tabel lain
+                self.salary_model.reload()
+                self.payslip_model.reload()
+                self.admin_attendance_model.reload()
+
+    def patch_employee_combos(self, event):
+        if event.row_ids is None:
+            self.load_employee_combo()
+            self.load_attendance_employee_combo()
+            return
+        if event.kind == DELETED:
+            employees = []
+            for employee_id in event.row_ids:
+                for combo in (self.employee_combo, self.attendance_employee_combo):
+                    index = combo.findData(employee_id)
+                    if index != -1:
+                        combo.removeItem(index)
+        else:
+            employees = self.db.get_all_employees(ids=event.row_ids)
+        for employee in employees:
+            for combo, text in ((self.employee_combo, f"{employee.name} ({employee.nip})"),
+                                (self.attendance_employee_combo, f"{employee.name} ({employee.id})")):
+                index = combo.findData(employee.id)
+                if index == -1:
+                    combo.addItem(text, employee.id)
+                else:
+                    combo.setItemText(index, text)
+
+
+# Fungsi job di bawah ini berjalan di worker thread lewat JobManager:
+# hanya memakai job.db dan tidak boleh menyentuh widget Qt.
+
+def payroll_job(job, month, year, payslip_dir, archive=False):
+    return run_payroll(job.db, month, year, payslip_dir,
+                       progress=job.report_progress, cancelled=job.is_cancelled, archive=archive)
+
+
+def salary_report_job(job, month, year):
+    report_rows = salary_report_rows(job.db, month, year)
+    job.check_cancelled()
+    job.report_progress(len(report_rows), len(report_rows))
+    return report_rows
+
+
+def export_salary_report_pdf_job(job, month, year, filepath):
+    report_rows = salary_report_job(job, month, year)
+    job.check_cancelled()
+    return write_salary_report_pdf(report_rows, month, year, filepath)
+
+
+def export_progress(job):
+    # Progres ekspor sekaligus titik pembatalan; file setengah jadi dihapus oleh exporter
+    def progress(done, total):
+        job.check_cancelled()
+        job.report_progress(done, total)
+    return progress
+
+
+def export_employees_job(job, filepath, department=None):
+    return export_employees(job.db, filepath, department, progress=export_progress(job))
+
+
+def import_employees_job(job, filepath):
+    report = import_employees(job.db, filepath, progress=job.report_progress, cancelled=job.is_cancelled)
+    error_path = None
+    if report.errors:
+        error_path = report.write_errors(os.path.splitext(filepath)[0] + "_kesalahan.csv")
+    return report, error_path
+
+
+def import_punches_job(job, filepath):
+    report = import_punches(job.db, filepath, progress=job.report_progress, cancelled=job.is_cancelled)
+    error_path = None
+    if report.errors:
+        error_path = report.write_errors(os.path.splitext(filepath)[0] + "_ditolak.csv")
+    return report, error_path
+
+
+def export_salary_components_job(job, filepath, month=None, year=None, department=None):
+    return export_salary_components(job.db, filepath, month, year, department, progress=export_progress(job))
@@ -0,0 +1,207 @@
+import json
+import os
+import time
+from datetime import datetime
+from typing import NamedTuple
+
+from employee_import import ImportReport, RowError, chunks, read_csv
+
+# Tap mesin absensi per potongan; semakin besar potongan, semakin banyak tap yang sudah
+# dipasangkan di memori sebelum ditulis (satu baris absensi per karyawan per hari)
+CHUNK_SIZE = 5000
+DEFAULT_STATUS = "Hadir"  # status absensi baru dari mesin; status yang sudah ada tidak diubah
+
+JSONL_EXTENSIONS = ('.jsonl', '.ndjson', '.json')
+
+# Nama kolom CSV / key JSONL -> field. Karyawan dikenali lewat NIP atau ID;
+# waktu tap lewat satu kolom timestamp atau kolom tanggal + jam terpisah.
+HEADER_ALIASES = {
+    'nip': 'nip',
+    'id': 'employee_id', 'employee_id': 'employee_id', 'id karyawan': 'employee_id',
+    'waktu': 'timestamp', 'timestamp': 'timestamp', 'datetime': 'timestamp',
+    'tanggal': 'date', 'date': 'date',
+    'jam': 'time', 'time': 'time',
+    'jenis': 'punch_type', 'type': 'punch_type', 'tipe': 'punch_type', 'punch': 'punch_type',
+}
+
+# Jenis tap; kolom jenis boleh kosong/tidak ada: tap paling awal menjadi jam masuk dan
+# tap paling akhir (jika lebih akhir) menjadi jam keluar
+PUNCH_IN = 'in'
+PUNCH_OUT = 'out'
+PUNCH_ANY = None
+PUNCH_TYPES = {
+    '': PUNCH_ANY,
+    'in': PUNCH_IN, 'masuk': PUNCH_IN, 'check_in': PUNCH_IN, 'checkin': PUNCH_IN, '0': PUNCH_IN,
+    'out': PUNCH_OUT, 'keluar': PUNCH_OUT, 'check_out': PUNCH_OUT, 'checkout': PUNCH_OUT, '1': PUNCH_OUT,
+}
+
+
+class Punch(NamedTuple):
+    line: int
+    employee: str  # NIP, atau ID karyawan sebagai teks
+    by_nip: bool
+    date: str  # YYYY-MM-DD
+    time: str  # HH:MM, sama dengan format jam di form absensi
+    punch_type: str
+
+
+class PunchImportReport(ImportReport):
+    ERROR_HEADER = ("Baris", "Karyawan", "Kesalahan")
+
+    def __init__(self):
+        super().__init__()
+        # Jumlah record (karyawan, tanggal) yang di-upsert; hari yang tapnya terbagi di dua potongan dihitung dua kali
+        self.upserts = 0
+
+
+def _read_csv(filepath):
+    rows = read_csv(filepath)
+    header = next(rows, None)
+    if header is None:
+        return
+    fields = [HEADER_ALIASES.get(name.strip().lower()) for name in header]
+    if 'nip' not in fields and 'employee_id' not in fields:
+        raise ValueError("Kolom NIP atau ID karyawan tidak ditemukan")
+    if 'timestamp' not in fields and not ('date' in fields and 'time' in fields):
+        raise ValueError("Kolom Waktu (atau Tanggal dan Jam) tidak ditemukan")
+    for line, values in enumerate(rows, start=2):
+        if not any(value.strip() for value in values):
+            continue
+        yield line, {field: value for field, value in zip(fields, values) if field}
+
+
+def _read_jsonl(filepath):
+    # Satu objek JSON per baris; baris yang bukan objek JSON dikembalikan sebagai None
+    with open(filepath, encoding='utf-8-sig') as f:
+        for line, text in enumerate(f, start=1):
+            if not text.strip():
+                continue
+            try:
+                record = json.loads(text)
+            except ValueError:
+                record = None
+            if not isinstance(record, dict):
+                yield line, None
+                continue
+            values = {}
+            for key, value in record.items():
+                field = HEADER_ALIASES.get(str(key).strip().lower())
+                if field:
+                    values[field] = '' if value is None else str(value)
+            yield line, values
+
+
+def read_punches(filepath):
+    # Membaca log tap baris demi baris (streaming); menghasilkan (nomor_baris, dict field atau None)
+    if os.path.splitext(filepath)[1].lower() in JSONL_EXTENSIONS:
+        return _read_jsonl(filepath)
+    return _read_csv(filepath)
+
+
+def count_rows(filepath):
+    # Perkiraan jumlah tap untuk progres (header CSV tidak dihitung)
+    with open(filepath, 'rb') as f:
+        lines = sum(block.count(b'\n') for block in iter(lambda: f.read(1 << 20), b''))
+    if os.path.splitext(filepath)[1].lower() in JSONL_EXTENSIONS:
+        return lines
+    return max(lines - 1, 0)
+
+
+def parse_punch(line, values):
+    # Mengembalikan Punch atau ValueError; karyawan belum dicocokkan ke database
+    employee_id = values.get('employee_id', '').strip()
+    nip = values.get('nip', '').strip()
+    if not employee_id and not nip:
+        raise ValueError("NIP atau ID karyawan harus diisi")
+    if employee_id:
+        if not employee_id.isdigit():
+            raise ValueError("ID karyawan harus berupa angka")
+        employee_id = str(int(employee_id))
+
+    timestamp = values.get('timestamp', '').strip()
+    if not timestamp:
+        timestamp = f"{values.get('date', '').strip()} {values.get('time', '').strip()}"
+    try:
+        moment = datetime.fromisoformat(timestamp)
+    except ValueError:
+        raise ValueError("Waktu harus berformat YYYY-MM-DD HH:MM[:SS]")
+
+    punch_type = values.get('punch_type', '').strip().lower()
+    if punch_type not in PUNCH_TYPES:
+        raise ValueError("Jenis tap harus masuk/keluar (in/out)")
+    return Punch(line, employee_id or nip, not employee_id, moment.date().isoformat(),
+                 f"{moment.hour:02d}:{moment.minute:02d}", PUNCH_TYPES[punch_type])
+
+
+def pair_punches(punches):
+    # punches: iterable of (employee_id, Punch). Satu record per (karyawan, tanggal) untuk
+    # Database.upsert_attendance_punches, dengan aturan gabung yang sama seperti di database
+    days = {}
+    for employee_id, punch in punches:
+        day = days.setdefault((employee_id, punch.date), [None, None])
+        if punch.punch_type != PUNCH_OUT and (day[0] is None or punch.time < day[0]):
+            day[0] = punch.time
+        if punch.punch_type != PUNCH_IN and (day[1] is None or punch.time > day[1]):
+            day[1] = punch.time
+    records = []
+    for (employee_id, date), (check_in, check_out) in sorted(days.items()):
+        if check_in is not None and check_out is not None and check_out <= check_in:
+            check_out = None
+        records.append((employee_id, date, check_in, check_out, DEFAULT_STATUS))
+    return records
+
+
+def _resolve_employees(db, punches):
+    # {(by_nip, NIP/ID di file): employee_id} untuk karyawan yang terdaftar
+    nips = {punch.employee for punch in punches if punch.by_nip}
+    ids = {int(punch.employee) for punch in punches if not punch.by_nip}
+    resolved = {(True, nip): employee_id for nip, employee_id in db.get_employee_ids_by_nip(nips).items()}
+    resolved.update(((False, str(employee_id)), employee_id) for employee_id in db.get_existing_employee_ids(ids))
+    return resolved
+
+
+def import_punches(db, filepath, chunk_size=CHUNK_SIZE, progress=None, cancelled=None):
+    # Impor log tap mesin absensi (CSV/JSONL) ke tabel attendance. Tap dipasangkan per
+    # (karyawan, tanggal) di setiap potongan, lalu di-upsert lewat index unik dalam satu
+    # transaksi per potongan; tap yang ditolak dicatat di report.errors.
+    report = PunchImportReport()
+    start = time.perf_counter()
+    total = count_rows(filepath) if progress else 0
+
+    for chunk in chunks(read_punches(filepath), chunk_size):
+        if cancelled and cancelled():
+            report.cancelled = True
+            break
+        punches = []
+        for line, values in chunk:
+            report.total += 1
+            if values is None:
+                report.errors.append(RowError(line, '', "Baris bukan objek JSON yang valid"))
+                continue
+            try:
+                punches.append(parse_punch(line, values))
+            except ValueError as e:
+                report.errors.append(RowError(line, values.get('employee_id') or values.get('nip', ''), str(e)))
+
+        resolved = _resolve_employees(db, punches)
+        valid = []
+        for punch in punches:
+            employee_id = resolved.get((punch.by_nip, punch.employee))
+            if employee_id is None:
+                report.errors.append(RowError(punch.line, punch.employee, "Karyawan tidak ditemukan"))
+            else:
+                valid.append((employee_id, punch))
+
+        records = pair_punches(valid)
+        if records:
+            db.upsert_attendance_punches(records)
+            report.imported += len(valid)
+            report.upserts += len(records)
+        if progress:
+            progress(report.total, max(total, report.total))
+
+    report.elapsed = time.perf_counter() - start
+    report.errors.sort()
+    print(f"[DEBUG] Impor absensi: {report.imported}/{report.total} tap -> {report.upserts} upsert absensi "
+          f"dalam {report.elapsed:.2f} s ({report.rows_per_second:,.1f} tap/detik), {len(report.errors)} ditolak")
+    return report
@@ -0,0 +1,137 @@
+import hashlib
+import hmac
+import os
+import threading
+import time
+
+import bcrypt
+
+# Cost bcrypt untuk hash baru (2^rounds iterasi, setiap +1 menggandakan waktu login).
+# Bisa diubah lewat environment PAYROLL_BCRYPT_ROUNDS; hash lama dengan cost berbeda
+# di-hash ulang otomatis saat pemiliknya berhasil login (Database.verify_user).
+BCRYPT_ROUNDS = int(os.environ.get('PAYROLL_BCRYPT_ROUNDS', 12))
+
+# Throttle per username: setelah MAX_FAILED_ATTEMPTS kegagalan berturut-turut login ditolak
+# tanpa bcrypt selama LOCKOUT_SECONDS. Setelah kunci habis satu percobaan boleh lewat; jika gagal
+# lagi kunci berlipat dua (maks MAX_LOCKOUT_SECONDS). Percobaan yang sedang berjalan ikut dihitung,
+# jadi paling banyak MAX_FAILED_ATTEMPTS - kegagalan percobaan paralel untuk satu username.
+MAX_FAILED_ATTEMPTS = 5
+LOCKOUT_SECONDS = 30
+MAX_LOCKOUT_SECONDS = 15 * 60
+MAX_TRACKED_USERNAMES = 10000
+
+# Login yang berhasil diingat selama VERIFIED_CACHE_SECONDS sebagai HMAC (kunci acak per proses)
+# dari kata sandi + hash tersimpan; login ulang dengan kata sandi yang sama melewati bcrypt.
+# Entri otomatis basi begitu hash di tabel users berubah (ganti kata sandi atau rehash).
+VERIFIED_CACHE_SECONDS = 10 * 60
+
+
+class LoginThrottled(Exception):
+    def __init__(self, username, retry_after):
+        super().__init__(f"Terlalu banyak percobaan login untuk '{username}'. "
+                         f"Coba lagi dalam {retry_after} detik.")
+        self.username = username
+        self.retry_after = retry_after
+
+
+def hash_password(password, rounds=None):
+    salt = bcrypt.gensalt(BCRYPT_ROUNDS if rounds is None else rounds)
+    return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+
+def check_password(password, hashed):
+    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+
+
+def hash_rounds(hashed):
+    # Format bcrypt: $2b$12$<salt+hash>
+    try:
+        return int(hashed.split('$')[2])
+    except (IndexError, ValueError):
+        return None
+
+
+def needs_rehash(hashed):
+    return hash_rounds(hashed) != BCRYPT_ROUNDS
+
+
+class LoginGuard:
+    # Status throttle dan cache login per file database, dibagi semua thread dalam proses
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._key = os.urandom(32)
+        self._attempts = {}  # username -> [gagal berturut-turut, sedang berjalan, dikunci sampai]
+        self._verified = {}  # username -> (hmac, berlaku sampai)
+
+    def begin(self, username):
+        # Dipanggil sebelum memeriksa kata sandi; LoginThrottled jika username sedang dikunci
+        now = self._clock()
+        with self._lock:
+            state = self._attempts.get(username)
+            if state is None:
+                if len(self._attempts) >= MAX_TRACKED_USERNAMES:
+                    self._forget_idle(now)
+                state = self._attempts[username] = [0, 0, 0.0]
+            failures, pending, locked_until = state
+            if locked_until > now:
+                raise LoginThrottled(username, int(locked_until - now) + 1)
+            if failures >= MAX_FAILED_ATTEMPTS:
+                # Kunci sudah habis: tepat satu percobaan boleh lewat; jika gagal lagi kunci berlipat dua
+                if pending:
+                    raise LoginThrottled(username, 1)
+            elif failures + pending >= MAX_FAILED_ATTEMPTS:
+                # Percobaan paralel dibatasi sisa jatah kegagalan
+                raise LoginThrottled(username, 1)
+            state[1] += 1
+
+    def end(self, username, success):
+        now = self._clock()
+        with self._lock:
+            state = self._attempts.get(username)
+            if state is None:
+                return
+            state[1] -= 1
+            if success:
+                if not state[1]:
+                    del self._attempts[username]
+                else:
+                    state[0], state[2] = 0, 0.0
+                return
+            state[0] += 1
+            if state[0] >= MAX_FAILED_ATTEMPTS:
+                lockout = LOCKOUT_SECONDS * 2 ** min(state[0] - MAX_FAILED_ATTEMPTS, 16)
+                state[2] = now + min(lockout, MAX_LOCKOUT_SECONDS)
+
+    def _forget_idle(self, now):
+        # Username yang tidak sedang dicoba dan tidak dikunci dilupakan agar memori tidak tumbuh
+        for username in [username for username, (_, pending, locked_until) in self._attempts.items()
+                         if not pending and locked_until <= now]:
+            del self._attempts[username]
+
+    def _digest(self, password, hashed):
+        return hmac.new(self._key, f"{hashed}\0{password}".encode('utf-8'), hashlib.sha256).digest()
+
+    def is_verified(self, username, password, hashed):
+        with self._lock:
+            entry = self._verified.get(username)
+        if entry is None or entry[1] <= self._clock():
+            return False
+        return hmac.compare_digest(entry[0], self._digest(password, hashed))
+
+    def remember(self, username, password, hashed):
+        digest = self._digest(password, hashed)
+        with self._lock:
+            self._verified[username] = (digest, self._clock() + VERIFIED_CACHE_SECONDS)
+
+
+_guards = {}
+_guards_lock = threading.Lock()
+
+
+def login_guard(db_path):
+    with _guards_lock:
+        guard = _guards.get(db_path)
+        if guard is None:
+            guard = _guards[db_path] = LoginGuard()
+        return guard
@@ -0,0 +1,321 @@
+import argparse
+import contextlib
+import json
+import os
+import signal
+import sys
+import time
+import traceback
+
+if __package__:
+    # python -m src.cli: modul di src saling mengimpor secara datar (import database),
+    # jadi folder ini harus ada di sys.path seperti saat dijalankan sebagai python src/cli.py
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import payslip_archive
+from attendance_import import import_punches
+from database import DB_PATH, Database
+from employee_import import EMPLOYEE_STATUSES, import_employees
+from exporter import export_employees, export_salary_components
+from money import format_rupiah
+from payroll_engine import PAYSLIP_DIR, month_payroll, run_payroll
+from salary_report import REPORT_COLUMNS, salary_report_rows, write_salary_report_pdf
+
+# Antarmuka baris perintah tanpa Qt: proses gaji, laporan, ekspor dan impor bisa dijadwalkan (cron).
+# Contoh (dari root project; python src/cli.py ... juga bisa):
+#   python -m src.cli payroll run --month 6 --year 2025 --jobs 4 --json
+#   python -m src.cli payroll runs --month 6 --year 2025
+#   python -m src.cli payroll run --month 6 --year 2025 --archive
+#   python -m src.cli payroll extract --month 6 --year 2025 --employee-id 12 slip.pdf
+#   python -m src.cli report --month 6 --year 2025 --pdf laporan.pdf
+#   python -m src.cli export salary-components komponen.csv --month 6 --year 2025
+#   python -m src.cli import employees karyawan.xlsx
+#   python -m src.cli import attendance tap_mesin.jsonl
+# Exit code: 0 berhasil, 1 sebagian gagal atau dibatalkan, 2 argumen salah.
+# Dengan --json, stdout hanya berisi satu objek JSON (hasil + waktu per tahap);
+# pesan [DEBUG] dari modul lain dialihkan ke stderr.
+
+
+class Timer:
+    def __init__(self):
+        self.timings = {}
+        self.start = time.perf_counter()
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = round(time.perf_counter() - start, 4)
+
+    def report(self):
+        return dict(self.timings, total=round(time.perf_counter() - self.start, 4))
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+class Cancellation:
+    # SIGINT/SIGTERM menghentikan proses dengan rapi: pekerjaan yang sudah selesai tetap disimpan
+    def __init__(self):
+        self.requested = False
+
+    def install(self):
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, self._handle)
+
+    def _handle(self, signum, frame):
+        self.requested = True
+
+    def __call__(self):
+        return self.requested
+
+
+def progress_printer(label):
+    # Progres ke stderr hanya saat dijalankan interaktif, bukan dari cron
+    if not sys.stderr.isatty():
+        return None
+    def progress(done, total):
+        text = f"{done}/{total}" if total else str(done)
+        print(f"\r{label}: {text}", end='' if done != total else '\n', file=sys.stderr, flush=True)
+    return progress
+
+
+def payroll_run(db, args, timer, cancelled):
+    os.makedirs(args.output_dir, exist_ok=True)
+    with timer.phase('compute'):
+        month_payroll(db, args.month, args.year)
+    with timer.phase('render_and_save'):
+        results, report = run_payroll(db, args.month, args.year, args.output_dir, jobs=args.jobs,
+                                      progress=progress_printer("Slip gaji"), cancelled=cancelled,
+                                      archive=args.archive)
+    names = {result.employee_id: result.name for result in results}
+    total_net = sum(result.net_salary for result in results)
+    result = {
+        'month': args.month, 'year': args.year, 'output_dir': args.output_dir,
+        'archive': payslip_archive.archive_path(args.output_dir, args.month, args.year) if args.archive else None,
+        'run_id': report.run_id, 'resumed': report.resumed,
+        'employees': len(results), 'rendered': len(report.rendered), 'skipped': len(report.skipped),
+        'cache_hits': report.cache_hits, 'cache_misses': report.cache_misses, 'cancelled': report.cancelled,
+        'failures': {names.get(employee_id, str(employee_id)): error for employee_id, error in report.failures.items()},
+        'total_net_salary_sen': total_net,
+    }
+    lines = [f"Run {report.run_id}{' (dilanjutkan)' if report.resumed else ''}: "
+             f"{len(report.rendered)}/{len(results)} slip gaji {args.month}/{args.year} dibuat di "
+             f"{result['archive'] or args.output_dir}, "
+             f"{len(report.skipped)} tidak berubah",
+             f"Cache slip: {report.cache_hits} hit, {report.cache_misses} miss",
+             f"Total gaji bersih: Rp {format_rupiah(total_net)}"]
+    lines += [f"GAGAL {name}: {error}" for name, error in result['failures'].items()]
+    if report.cancelled:
+        lines.append("Proses gaji dibatalkan sebelum selesai; jalankan lagi untuk melanjutkan.")
+    return (1 if report.failures or report.cancelled else 0), result, lines
+
+
+def payroll_extract(db, args, timer, cancelled):
+    payslip = db.get_processed_payslip(args.employee_id, args.month, args.year)
+    if payslip is None:
+        return 1, {'error': 'slip gaji belum diproses'}, [f"Slip gaji karyawan {args.employee_id} "
+                                                          f"{args.month}/{args.year} belum diproses."]
+    if payslip.archive_member:
+        data = payslip_archive.read_member(payslip.pdf_path, payslip.archive_member)
+    else:
+        with open(payslip.pdf_path, 'rb') as source:
+            data = source.read()
+    with open(args.output, 'wb') as output:
+        output.write(data)
+    result = {'employee_id': args.employee_id, 'source': payslip.pdf_path, 'member': payslip.archive_member,
+              'output': args.output}
+    return 0, result, [f"Slip gaji disimpan ke {args.output}"]
+
+
+def payroll_runs(db, args, timer, cancelled):
+    runs = db.get_payroll_runs(args.month, args.year, args.limit)
+    lines = [f"#{run.id} {run.month}/{run.year} {run.status}: {run.rendered} dibuat, "
+             f"{run.skipped} tidak berubah, {run.failed} gagal dari {run.total} "
+             f"({run.started_at} - {run.finished_at or '...'})" for run in runs]
+    return 0, {'runs': [run._asdict() for run in runs]}, lines or ["Belum ada proses gaji."]
+
+
+def salary_report(db, args, timer, cancelled):
+    with timer.phase('compute'):
+        rows = salary_report_rows(db, args.month, args.year)
+    result = {'month': args.month, 'year': args.year, 'columns': REPORT_COLUMNS, 'rows': rows}
+    if args.pdf:
+        with timer.phase('pdf'):
+            write_salary_report_pdf(rows, args.month, args.year, args.pdf)
+        result['pdf'] = args.pdf
+        return 0, result, [f"Laporan gaji {args.month}/{args.year} ({len(rows)} karyawan) disimpan ke {args.pdf}"]
+    widths = [max(len(str(row[i])) for row in [REPORT_COLUMNS] + rows) for i in range(len(REPORT_COLUMNS))]
+    lines = ["  ".join(str(value).ljust(width) if i == 0 else str(value).rjust(width)
+                       for i, (value, width) in enumerate(zip(row, widths)))
+             for row in [REPORT_COLUMNS] + rows]
+    return 0, result, lines
+
+
+def export_file(db, args, timer, cancelled):
+    def progress(done, total):
+        if cancelled():
+            raise ExportCancelled()
+        if printer:
+            printer(done, total)
+    printer = progress_printer("Baris diekspor")
+
+    try:
+        with timer.phase('export'):
+            if args.table == 'employees':
+                count = export_employees(db, args.file, args.department, progress=progress, status=args.status)
+            else:
+                count = export_salary_components(db, args.file, args.month, args.year, args.department,
+                                                 progress=progress, component_type=args.component_type)
+    except ExportCancelled:
+        # exporter sudah menghapus file setengah jadi
+        return 1, {'table': args.table, 'file': args.file, 'cancelled': True}, ["Ekspor dibatalkan."]
+    result = {'table': args.table, 'file': args.file, 'rows': count}
+    return 0, result, [f"{count} baris {args.table} diekspor ke {args.file}"]
+
+
+def import_file(db, args, timer, cancelled):
+    with timer.phase('import'):
+        report = import_employees(db, args.file, jobs=args.jobs,
+                                  progress=progress_printer("Baris diimpor"), cancelled=cancelled)
+    error_path = None
+    if report.errors:
+        error_path = report.write_errors(args.errors or os.path.splitext(args.file)[0] + "_kesalahan.csv")
+    result = {
+        'file': args.file, 'total': report.total, 'imported': report.imported, 'errors': len(report.errors),
+        'errors_file': error_path, 'cancelled': report.cancelled,
+        'rows_per_second': round(report.rows_per_second, 1),
+    }
+    lines = [f"{report.imported} dari {report.total} karyawan diimpor ({report.rows_per_second:,.0f} baris/detik)"]
+    if error_path:
+        lines.append(f"{len(report.errors)} baris gagal, rincian di {error_path}")
+    if report.cancelled:
+        lines.append("Impor dibatalkan sebelum selesai.")
+    return (1 if report.errors or report.cancelled else 0), result, lines
+
+
+def import_attendance(db, args, timer, cancelled):
+    with timer.phase('import'):
+        report = import_punches(db, args.file, progress=progress_printer("Tap diimpor"), cancelled=cancelled)
+    error_path = None
+    if report.errors:
+        error_path = report.write_errors(args.errors or os.path.splitext(args.file)[0] + "_ditolak.csv")
+    result = {
+        'file': args.file, 'total': report.total, 'imported': report.imported, 'upserts': report.upserts,
+        'errors': len(report.errors), 'errors_file': error_path, 'cancelled': report.cancelled,
+        'rows_per_second': round(report.rows_per_second, 1),
+    }
+    lines = [f"{report.imported} dari {report.total} tap diimpor ({report.upserts} upsert absensi, "
+             f"{report.rows_per_second:,.0f} tap/detik)"]
+    if error_path:
+        lines.append(f"{len(report.errors)} tap ditolak, rincian di {error_path}")
+    if report.cancelled:
+        lines.append("Impor dibatalkan sebelum selesai.")
+    return (1 if report.errors or report.cancelled else 0), result, lines
+
+
+def build_parser():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--db', default=DB_PATH, help=f"path database (default {DB_PATH})")
+    common.add_argument('--json', action='store_true', help="cetak hasil dan waktu per tahap sebagai JSON")
+
+    period = argparse.ArgumentParser(add_help=False)
+    period.add_argument('--month', type=int, required=True, choices=range(1, 13), metavar='BULAN')
+    period.add_argument('--year', type=int, required=True, metavar='TAHUN')
+
+    jobs = argparse.ArgumentParser(add_help=False)
+    jobs.add_argument('--jobs', type=int, default=None, metavar='N',
+                      help="jumlah proses/thread paralel (default jumlah CPU)")
+
+    parser = argparse.ArgumentParser(prog='cli', description="Sistem Penggajian Karyawan tanpa GUI")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    payroll = commands.add_parser('payroll', help="proses gaji").add_subparsers(dest='action', required=True)
+    run = payroll.add_parser('run', parents=[common, period, jobs], help="hitung gaji dan buat slip gaji PDF")
+    run.add_argument('--output-dir', default=PAYSLIP_DIR, help=f"folder slip gaji (default {PAYSLIP_DIR})")
+    run.add_argument('--archive', action='store_true',
+                     help="simpan semua slip bulan ini dalam satu zip, bukan satu PDF per karyawan")
+    run.set_defaults(handler=payroll_run)
+    extract = payroll.add_parser('extract', parents=[common, period], help="ambil satu slip gaji (juga dari arsip zip)")
+    extract.add_argument('--employee-id', type=int, required=True, metavar='ID')
+    extract.add_argument('output', help="file PDF tujuan")
+    extract.set_defaults(handler=payroll_extract)
+    runs = payroll.add_parser('runs', parents=[common], help="riwayat proses gaji (checkpoint)")
+    runs.add_argument('--month', type=int, choices=range(1, 13), metavar='BULAN')
+    runs.add_argument('--year', type=int, metavar='TAHUN')
+    runs.add_argument('--limit', type=int, default=20, help="jumlah run terbaru (default 20)")
+    runs.set_defaults(handler=payroll_runs)
+
+    report = commands.add_parser('report', parents=[common, period], help="laporan rekapitulasi gaji")
+    report.add_argument('--pdf', metavar='FILE', help="simpan laporan ke PDF alih-alih mencetak tabel")
+    report.set_defaults(handler=salary_report)
+
+    export = commands.add_parser('export', help="ekspor data ke CSV/XLSX").add_subparsers(dest='table', required=True)
+    export_employees_parser = export.add_parser('employees', parents=[common], help="data karyawan")
+    export_components_parser = export.add_parser('salary-components', parents=[common], help="komponen gaji")
+    export_components_parser.add_argument('--month', type=int, choices=range(1, 13), metavar='BULAN')
+    export_components_parser.add_argument('--year', type=int, metavar='TAHUN')
+    export_components_parser.add_argument('--component-type', metavar='TIPE',
+                                          help="hanya tipe komponen ini (mis. Tunjangan)")
+    export_employees_parser.add_argument('--status', choices=EMPLOYEE_STATUSES, help="hanya karyawan dengan status ini")
+    for export_parser in (export_employees_parser, export_components_parser):
+        export_parser.add_argument('file', help="file tujuan (.csv atau .xlsx)")
+        export_parser.add_argument('--department', help="hanya departemen ini")
+        export_parser.set_defaults(handler=export_file)
+
+    import_parser = commands.add_parser('import', help="impor data dari CSV/XLSX/JSONL").add_subparsers(dest='table', required=True)
+    import_employees_parser = import_parser.add_parser('employees', parents=[common, jobs],
+                                                       help="karyawan + akun login (username = NIP)")
+    import_employees_parser.add_argument('file', help="file sumber (.csv atau .xlsx)")
+    import_employees_parser.add_argument('--errors', metavar='FILE',
+                                         help="file laporan baris gagal (default <file>_kesalahan.csv)")
+    import_employees_parser.set_defaults(handler=import_file)
+    import_attendance_parser = import_parser.add_parser('attendance', parents=[common],
+                                                        help="log tap mesin absensi, digabung per karyawan per hari")
+    import_attendance_parser.add_argument('file', help="file sumber (.csv atau .jsonl)")
+    import_attendance_parser.add_argument('--errors', metavar='FILE',
+                                          help="file laporan tap yang ditolak (default <file>_ditolak.csv)")
+    import_attendance_parser.set_defaults(handler=import_attendance)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if getattr(args, 'jobs', None) is not None and args.jobs < 1:
+        print("--jobs harus minimal 1", file=sys.stderr)
+        return 2
+    timer = Timer()
+    cancelled = Cancellation()
+    cancelled.install()
+
+    # stdout disimpan untuk hasil; print() dari modul lain masuk ke stderr
+    with contextlib.redirect_stdout(sys.stderr):
+        with timer.phase('open_db'):
+            db = Database(args.db)
+        try:
+            status, result, lines = args.handler(db, args, timer, cancelled)
+        except Exception as e:
+            traceback.print_exc()
+            status, result, lines = 1, {'error': str(e)}, []
+            print(f"Gagal: {e}", file=sys.stderr)
+        finally:
+            db.close()
+
+    if args.json:
+        command = " ".join(part for part in (args.command, getattr(args, 'action', None),
+                                             getattr(args, 'table', None)) if part)
+        json.dump(dict(result, command=command, status=status, timings=timer.report()),
+                  sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        for line in lines:
+            print(line)
+        print(f"Selesai dalam {timer.report()['total']:.2f} s", file=sys.stderr)
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
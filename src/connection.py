@@ -0,0 +1,84 @@
+import sqlite3
+import threading
+import time
+
+# Pragma untuk setiap koneksi: WAL agar pembaca tidak memblokir penulis,
+# synchronous NORMAL (aman dengan WAL), cache 20 MB dan mmap 256 MB.
+CONNECTION_PRAGMAS = (
+    'PRAGMA journal_mode = WAL',
+    'PRAGMA synchronous = NORMAL',
+    'PRAGMA cache_size = -20000',
+    'PRAGMA mmap_size = 268435456',
+    'PRAGMA temp_store = MEMORY',
+)
+BUSY_TIMEOUT_SECONDS = 5.0
+
+
+class ThreadConnection:
+    # Koneksi satu thread beserta status transaksinya. Semua instance Database di thread itu
+    # memakai objek yang sama, jadi transaksi bersarang dan ChangeEvent yang tertunda ikut dibagi;
+    # koneksi baru ditutup saat instance terakhir di-close.
+    def __init__(self, conn):
+        self.conn = conn
+        self.transaction_depth = 0
+        self.pending_changes = []
+        self.users = 0
+
+
+class ConnectionManager:
+    # Satu manager per file database dalam satu proses
+    _managers = {}
+    _managers_lock = threading.Lock()
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.timings = {}
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+        self.listeners = []  # pendengar ChangeEvent, lihat Database.subscribe
+
+    @classmethod
+    def for_path(cls, db_path):
+        with cls._managers_lock:
+            manager = cls._managers.get(db_path)
+            if manager is None:
+                manager = cls._managers[db_path] = cls(db_path)
+            return manager
+
+    def acquire(self):
+        # ThreadConnection milik thread ini; sqlite3.Connection tidak boleh dipakai lintas thread.
+        # Setiap acquire() harus dipasangkan dengan release().
+        state = getattr(self._local, 'state', None)
+        if state is None:
+            start = time.perf_counter()
+            conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT_SECONDS)
+            for pragma in CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            state = self._local.state = ThreadConnection(conn)
+            self.timings.setdefault('connect', time.perf_counter() - start)
+        state.users += 1
+        return state
+
+    def initialize(self, init_schema):
+        # Buat tabel, migrasi dan admin default hanya sekali per proses
+        if self._initialized:
+            return
+        with self._init_lock:
+            if self._initialized:
+                return
+            start = time.perf_counter()
+            init_schema()
+            self.timings['schema_init'] = time.perf_counter() - start
+            self._initialized = True
+
+    def release(self, state):
+        # Tutup koneksi thread ini setelah pemakai terakhirnya selesai
+        state.users -= 1
+        if state.users == 0:
+            if getattr(self._local, 'state', None) is state:
+                self._local.state = None
+            state.conn.close()
+
+    def startup_report(self):
+        return ", ".join(f"{name}={seconds * 1000:.1f} ms" for name, seconds in self.timings.items())
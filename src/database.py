@@ -1,11 +1,182 @@
 import sqlite3
-import bcrypt
+from contextlib import contextmanager
 from datetime import datetime
+from operator import attrgetter
+from typing import NamedTuple
+from auth import check_password, hash_password, login_guard, needs_rehash
+from migrations import SUMMARY_SELECT, migrate
+from connection import ConnectionManager
+
+DB_PATH = 'database/payroll.db'
+
+# Jumlah baris per halaman keyset saat hasil query dialirkan (ekspor)
+STREAM_BATCH_SIZE = 1000
+
+# Status absensi, urutan kolom rekap (get_attendance_histogram) di halaman karyawan dan slip gaji
+ATTENDANCE_STATUSES = ("Hadir", "Sakit", "Izin", "Cuti", "Alpha")
+
+# Jenis perubahan untuk ChangeEvent
+INSERTED = 'inserted'
+UPDATED = 'updated'
+DELETED = 'deleted'
+
+
+class ChangeEvent(NamedTuple):
+    table: str
+    kind: str
+    row_ids: tuple  # None jika id tidak diketahui (insert massal); pendengar sebaiknya memuat ulang
+    # (employee_id, bulan, tahun) yang terdampak untuk salary_components/attendance, termasuk
+    # periode lama pada update/delete; None jika tidak diketahui
+    periods: tuple = None
+    # data_changes.version setelah perubahan ini; versi sebelumnya adalah version - 1
+    version: int = None
+
+
+# Baris ringan untuk tabel admin dan ekspor. Tetap tuple, jadi kode yang membaca row[0] dst. tetap jalan.
+class EmployeeRow(NamedTuple):
+    id: int
+    nip: str
+    name: str
+    position: str
+    department: str
+    basic_salary: int
+    join_date: str
+    status: str
+
+
+class SalaryComponentRow(NamedTuple):
+    id: int
+    employee_name: str
+    component_type: str
+    amount: int
+    month: int
+    year: int
+
+
+class AttendanceRow(NamedTuple):
+    id: int
+    employee_name: str
+    date: str
+    check_in: str
+    check_out: str
+    status: str
+    employee_id: int
+
+
+class PayslipRow(NamedTuple):
+    id: int
+    employee_name: str
+    month: int
+    year: int
+    net_salary: int
+    pdf_path: str
+    archive_member: str
+
+
+# Baris tabel tanpa JOIN (halaman karyawan, proses gaji, CLI). Baris employees memakai EmployeeRow.
+class SalaryComponent(NamedTuple):
+    id: int
+    employee_id: int
+    component_type: str
+    amount: int
+    month: int
+    year: int
+
+
+class Attendance(NamedTuple):
+    id: int
+    employee_id: int
+    date: str
+    check_in: str
+    check_out: str
+    status: str
+
+
+class PayslipFile(NamedTuple):
+    pdf_path: str
+    archive_member: str  # None jika slip berupa file PDF sendiri
+
+
+class PayrollRun(NamedTuple):
+    id: int
+    month: int
+    year: int
+    status: str
+    total: int
+    rendered: int
+    skipped: int
+    failed: int
+    started_at: str
+    finished_at: str
+
+
+def row_factory(row_type):
+    # row_factory sqlite3: setiap baris langsung menjadi row_type (NamedTuple) saat dibaca, jadi
+    # tidak ada list tuple mentah yang hidup bersamaan dengan list hasil seperti map(_make, fetchall())
+    new = tuple.__new__
+    return lambda cursor, row: new(row_type, row)
+
+
+# Kunci halaman per tabel = nilai kolom ORDER BY baris terakhir; diteruskan sebagai `after`
+# untuk halaman berikutnya (keyset pagination, tanpa OFFSET)
+EMPLOYEE_PAGE_KEY = attrgetter('id')
+SALARY_COMPONENT_PAGE_KEY = attrgetter('id')
+ATTENDANCE_PAGE_KEY = attrgetter('date', 'employee_id')
+PAYSLIP_PAGE_KEY = attrgetter('year', 'month', 'id')
+
+
+def _page_query(conditions, order, after=None, descending=False):
+    # conditions: (kolom, operator, nilai); nilai None dilewati, tuple untuk IN.
+    # order: kolom ORDER BY, sama dengan kunci halaman. Kolom awal yang sudah dikunci filter "="
+    # tidak ikut perbandingan keyset agar SQLite memakai rentang index pada kolom berikutnya.
+    # Mengembalikan (WHERE ..., ORDER BY ..., params).
+    clauses, params, fixed = [], [], set()
+    for column, operator, value in conditions:
+        if value is None:
+            continue
+        if operator == 'IN':
+            clauses.append(f"{column} IN ({', '.join('?' * len(value))})")
+            params.extend(value)
+            continue
+        clauses.append(f"{column} {operator} ?")
+        params.append(value)
+        if operator == '=':
+            fixed.add(column)
+    if after is not None:
+        after = after if isinstance(after, tuple) else (after,)
+        columns = list(order)
+        while len(columns) > 1 and columns[0] in fixed:
+            columns.pop(0)
+            after = after[1:]
+        clauses.append(f"({', '.join(columns)}) {'<' if descending else '>'} ({', '.join('?' * len(columns))})")
+        params.extend(after)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+    order_by = ', '.join(f"{column} DESC" if descending else column for column in order)
+    return where, f"ORDER BY {order_by}", params
+
+
+def _attendance_period(employee_id, date):
+    # Tanggal absensi selalu berformat YYYY-MM-DD
+    return employee_id, int(date[5:7]), int(date[:4])
+
+
+def _id_filter(column, ids):
+    if ids is None:
+        return '', ()
+    ids = tuple(ids)
+    return f"WHERE {column} IN ({', '.join('?' * len(ids))})", ids
+
 
 class Database:
-    def __init__(self):
-        self.conn = sqlite3.connect('database/payroll.db')
+    def __init__(self, db_path=DB_PATH):
+        # Koneksi dibagi per thread lewat ConnectionManager; skema hanya diinisialisasi sekali per proses
+        self.manager = ConnectionManager.for_path(db_path)
+        self._thread_conn = self.manager.acquire()
+        self.conn = self._thread_conn.conn
         self.cursor = self.conn.cursor()
+        self.manager.initialize(self.initialize_schema)
+
+    def initialize_schema(self):
         self.create_tables()
         self.create_default_admin()
 
@@ -22,6 +193,7 @@ class Database:
         ''')
 
         # Tabel Karyawan
+        # Kolom uang (basic_salary, amount, net_salary) menjadi INTEGER sen lewat migrasi versi 4
         self.cursor.execute('''
             CREATE TABLE IF NOT EXISTS employees (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -78,6 +250,81 @@ class Database:
 
         self.conn.commit()
 
+        # Index dan perubahan skema lanjutan dikelola oleh migrations.py
+        migrate(self.conn)
+
+    @contextmanager
+    def transaction(self):
+        # Unit of work: semua mutator di dalam blok ini di-commit sekali di akhir.
+        # Blok bersarang ikut transaksi terluar; exception membatalkan semuanya. Kedalaman dan
+        # ChangeEvent tertunda disimpan per koneksi thread (ThreadConnection), bukan per instance,
+        # karena semua instance Database di satu thread memakai koneksi yang sama.
+        state = self._thread_conn
+        state.transaction_depth += 1
+        try:
+            yield self
+        except BaseException:
+            state.transaction_depth -= 1
+            if state.transaction_depth == 0:
+                self.conn.rollback()
+                state.pending_changes = []
+            raise
+        else:
+            state.transaction_depth -= 1
+            if state.transaction_depth == 0:
+                self.conn.commit()
+                self._notify_changes()
+
+    def _commit(self):
+        if self._thread_conn.transaction_depth == 0:
+            self.conn.commit()
+            self._notify_changes()
+
+    def subscribe(self, listener):
+        # listener(ChangeEvent) dipanggil setelah commit, di thread yang melakukan commit.
+        # Pendengar dibagi oleh semua instance Database untuk file yang sama.
+        self.manager.listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        if listener in self.manager.listeners:
+            self.manager.listeners.remove(listener)
+
+    def _record_change(self, table, kind, row_ids=None, periods=None):
+        # Naikkan penghitung data_changes di transaksi yang sama (lewat conn, bukan self.cursor,
+        # agar rowcount/lastrowid pemanggil tidak tertimpa). Kunci tulis sudah dipegang, jadi
+        # version - 1 adalah versi terakhir dari semua proses sebelum perubahan ini.
+        self.conn.execute('UPDATE data_changes SET version = version + 1 WHERE id = 1')
+        version = self.conn.execute('SELECT version FROM data_changes WHERE id = 1').fetchone()[0]
+        self._thread_conn.pending_changes.append(ChangeEvent(
+            table, kind, None if row_ids is None else tuple(row_ids),
+            None if periods is None else tuple(set(periods)), version))
+
+    def get_data_version(self):
+        # Berubah setiap kali data diubah lewat Database, dari proses mana pun (lihat migrasi versi 11)
+        return self.conn.execute('SELECT version FROM data_changes WHERE id = 1').fetchone()[0]
+
+    def _stored_periods(self, table, ids):
+        # Periode baris yang akan diubah/dihapus, dibaca sebelum mutasi; per 500 id agar
+        # tidak melewati batas jumlah parameter SQLite
+        ids = list(ids)
+        periods = []
+        for start in range(0, len(ids), 500):
+            where, params = _id_filter('id', ids[start:start + 500])
+            if table == 'attendance':
+                self.cursor.execute(f'SELECT employee_id, date FROM attendance {where}', params)
+                periods.extend(_attendance_period(*row) for row in self.cursor.fetchall())
+            else:
+                self.cursor.execute(f'SELECT employee_id, month, year FROM salary_components {where}', params)
+                periods.extend(self.cursor.fetchall())
+        return periods
+
+    def _notify_changes(self):
+        state = self._thread_conn
+        changes, state.pending_changes = state.pending_changes, []
+        for event in changes:
+            for listener in list(self.manager.listeners):
+                listener(event)
+
     def create_default_admin(self):
         # Check if admin user exists
         self.cursor.execute('SELECT id FROM users WHERE username = ?', ('admin',))
@@ -87,63 +334,184 @@ class Database:
             print("Default admin user created successfully!")
 
     def add_user(self, username, password, role):
-        hashed = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+        hashed = hash_password(password)
         try:
-            self.cursor.execute('''
-                INSERT INTO users (username, password, role)
-                VALUES (?, ?, ?)
-            ''', (username, hashed.decode('utf-8'), role))
-            self.conn.commit()
-            return True
+            with self.transaction():
+                self.cursor.execute('''
+                    INSERT INTO users (username, password, role)
+                    VALUES (?, ?, ?)
+                ''', (username, hashed, role))
+                return True
         except sqlite3.IntegrityError:
             return False
 
+    def add_users(self, users, executor=None):
+        # users: iterable of (username, password, role); username yang sudah ada dilewati.
+        # executor (mis. ThreadPoolExecutor) membagi hashing bcrypt ke beberapa thread;
+        # bcrypt melepas GIL sehingga hashing benar-benar paralel.
+        users = list(users)
+        hashed = (executor.map if executor else map)(hash_password, [password for _, password, _ in users])
+        rows = [(username, hashed_password, role) for (username, _, role), hashed_password in zip(users, hashed)]
+        with self.transaction():
+            self.cursor.executemany('''
+                INSERT OR IGNORE INTO users (username, password, role)
+                VALUES (?, ?, ?)
+            ''', rows)
+        return self.cursor.rowcount
+
+    def get_existing_usernames(self, usernames):
+        usernames = tuple(usernames)
+        if not usernames:
+            return set()
+        self.cursor.execute(f"SELECT username FROM users WHERE username IN ({', '.join('?' * len(usernames))})", usernames)
+        return {row[0] for row in self.cursor.fetchall()}
+
     def verify_user(self, username, password):
-        self.cursor.execute('SELECT password, role FROM users WHERE username = ?', (username,))
-        result = self.cursor.fetchone()
-        if result:
-            stored_password, role = result
-            if bcrypt.checkpw(password.encode('utf-8'), stored_password.encode('utf-8')):
-                return role
-        return None
+        # Role jika cocok, None jika tidak; auth.LoginThrottled jika username sedang dikunci.
+        # bcrypt makan ratusan milidetik, jadi GUI memanggil ini dari worker thread (lihat main.py).
+        guard = login_guard(self.manager.db_path)
+        guard.begin(username)
+        role = None
+        try:
+            self.cursor.execute('SELECT password, role FROM users WHERE username = ?', (username,))
+            result = self.cursor.fetchone()
+            if result:
+                stored_password, stored_role = result
+                if guard.is_verified(username, password, stored_password):
+                    role = stored_role
+                elif check_password(password, stored_password):
+                    role = stored_role
+                    guard.remember(username, password, stored_password)
+                if role and needs_rehash(stored_password):
+                    stored_password = self._rehash_password(username, password, stored_password)
+                    guard.remember(username, password, stored_password)
+        finally:
+            guard.end(username, role is not None)
+        return role
+
+    def _rehash_password(self, username, password, stored_password):
+        # Cost bcrypt berubah (auth.BCRYPT_ROUNDS): simpan hash baru selagi kata sandi asli tersedia.
+        # Tidak menimpa jika kata sandi sudah diganti di antara SELECT dan UPDATE.
+        hashed = hash_password(password)
+        self.cursor.execute('UPDATE users SET password = ? WHERE username = ? AND password = ?',
+                            (hashed, username, stored_password))
+        self._commit()
+        return hashed if self.cursor.rowcount else stored_password
 
     def add_employee(self, nip, name, position, department, basic_salary, join_date, status):
         try:
-            self.cursor.execute('''
-                INSERT INTO employees (nip, name, position, department, basic_salary, join_date, status)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (nip, name, position, department, basic_salary, join_date, status))
-            self.conn.commit()
-            return True
+            with self.transaction():
+                self.cursor.execute('''
+                    INSERT INTO employees (nip, name, position, department, basic_salary, join_date, status)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', (nip, name, position, department, basic_salary, join_date, status))
+                self._record_change('employees', INSERTED, [self.cursor.lastrowid])
+                return True
         except sqlite3.IntegrityError:
             return False
 
+    def add_employees(self, employees):
+        # employees: iterable of (nip, name, position, department, basic_salary, join_date, status)
+        with self.transaction():
+            self.cursor.executemany('''
+                INSERT INTO employees (nip, name, position, department, basic_salary, join_date, status)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', employees)
+            self._record_change('employees', INSERTED)
+            rowcount = self.cursor.rowcount
+        return rowcount
+
     def get_employee(self, employee_id=None, nip=None):
         if employee_id:
-            self.cursor.execute('SELECT * FROM employees WHERE id = ?', (employee_id,))
+            where, key = 'id = ?', employee_id
         elif nip:
-            self.cursor.execute('SELECT * FROM employees WHERE nip = ?', (nip,))
-        return self.cursor.fetchone()
+            where, key = 'nip = ?', nip
+        else:
+            return None
+        return self._select(EmployeeRow, f'''
+            SELECT id, nip, name, position, department, basic_salary, join_date, status
+            FROM employees WHERE {where}
+        ''', (key,)).fetchone()
+
+    def _select(self, row_type, sql, params=()):
+        # Cursor sendiri dengan row_factory; hasilnya dibaca dengan fetchone()/fetchall() seperti biasa
+        cursor = self.conn.cursor()
+        cursor.row_factory = row_factory(row_type)
+        return cursor.execute(sql, params)
+
+    def _iter_pages(self, fetch_page, page_key, **filters):
+        # Alirkan semua baris per halaman keyset; setiap halaman query pendek, jadi tidak ada
+        # cursor atau transaksi baca yang terbuka selama ekspor berjalan
+        after = None
+        while True:
+            rows = fetch_page(STREAM_BATCH_SIZE, after, **filters)
+            yield from rows
+            if len(rows) < STREAM_BATCH_SIZE:
+                return
+            after = page_key(rows[-1])
+
+    def get_departments(self):
+        self.cursor.execute('SELECT DISTINCT department FROM employees ORDER BY department')
+        return [row[0] for row in self.cursor.fetchall()]
+
+    def iter_employees(self, department=None, status=None):
+        return self._iter_pages(self.get_all_employees, EMPLOYEE_PAGE_KEY, department=department, status=status)
+
+    def get_existing_nips(self, nips):
+        nips = tuple(nips)
+        if not nips:
+            return set()
+        self.cursor.execute(f"SELECT nip FROM employees WHERE nip IN ({', '.join('?' * len(nips))})", nips)
+        return {row[0] for row in self.cursor.fetchall()}
+
+    def get_employee_ids_by_nip(self, nips):
+        # {nip: id} untuk NIP yang terdaftar, per 500 agar tidak melewati batas parameter SQLite
+        nips = list(nips)
+        employee_ids = {}
+        for start in range(0, len(nips), 500):
+            batch = nips[start:start + 500]
+            self.cursor.execute(f"SELECT nip, id FROM employees WHERE nip IN ({', '.join('?' * len(batch))})", batch)
+            employee_ids.update(self.cursor.fetchall())
+        return employee_ids
+
+    def get_existing_employee_ids(self, employee_ids):
+        employee_ids = list(employee_ids)
+        existing = set()
+        for start in range(0, len(employee_ids), 500):
+            where, params = _id_filter('id', employee_ids[start:start + 500])
+            self.cursor.execute(f'SELECT id FROM employees {where}', params)
+            existing.update(row[0] for row in self.cursor.fetchall())
+        return existing
 
-    def get_all_employees(self):
-        self.cursor.execute('SELECT id, nip, name, position, department, basic_salary, join_date, status FROM employees')
-        return self.cursor.fetchall()
+    def get_all_employees(self, limit=-1, after=None, ids=None, department=None, status=None):
+        where, order_by, params = _page_query([
+            ('id', 'IN', None if ids is None else tuple(ids)),
+            ('department', '=', department),
+            ('status', '=', status),
+        ], ['id'], after)
+        return self._select(EmployeeRow, f'''
+            SELECT id, nip, name, position, department, basic_salary, join_date, status
+            FROM employees {where} {order_by} LIMIT ?
+        ''', (*params, limit)).fetchall()
 
     def update_employee(self, employee_id, nip, name, position, department, basic_salary, join_date, status):
         try:
-            self.cursor.execute('''
-                UPDATE employees
-                SET nip = ?, name = ?, position = ?, department = ?, basic_salary = ?, join_date = ?, status = ?
-                WHERE id = ?
-            ''', (nip, name, position, department, basic_salary, join_date, status, employee_id))
-            self.conn.commit()
-            
-            if self.cursor.rowcount == 0:
-                print(f"[DEBUG] Database: Update employee (ID: {employee_id}) tidak mempengaruhi baris. Mungkin ID tidak ditemukan.")
-                return False # Indicate failure if no rows were updated
-            
-            print(f"[DEBUG] Database: Menerima Basic Salary untuk update: {basic_salary}, Baris terpengaruh: {self.cursor.rowcount}")
-            return True
+            with self.transaction():
+                self.cursor.execute('''
+                    UPDATE employees
+                    SET nip = ?, name = ?, position = ?, department = ?, basic_salary = ?, join_date = ?, status = ?
+                    WHERE id = ?
+                ''', (nip, name, position, department, basic_salary, join_date, status, employee_id))
+                updated = self.cursor.rowcount
+                if updated:
+                    self._record_change('employees', UPDATED, [employee_id])
+
+                if updated == 0:
+                    print(f"[DEBUG] Database: Update employee (ID: {employee_id}) tidak mempengaruhi baris. Mungkin ID tidak ditemukan.")
+                    return False # Indicate failure if no rows were updated
+
+                print(f"[DEBUG] Database: Menerima Basic Salary untuk update: {basic_salary}, Baris terpengaruh: {updated}")
+                return True
         except sqlite3.IntegrityError:
             print(f"[DEBUG] Database: IntegrityError saat update employee dengan NIP: {nip}")
             return False
@@ -151,9 +519,23 @@ class Database:
             print(f"[DEBUG] Database: Error tak terduga saat update employee: {e}")
             return False
 
+    def update_employees(self, employees):
+        # employees: iterable of (employee_id, nip, name, position, department, basic_salary, join_date, status)
+        employees = list(employees)
+        with self.transaction():
+            self.cursor.executemany('''
+                UPDATE employees
+                SET nip = ?, name = ?, position = ?, department = ?, basic_salary = ?, join_date = ?, status = ?
+                WHERE id = ?
+            ''', ((*employee[1:], employee[0]) for employee in employees))
+            self._record_change('employees', UPDATED, [employee[0] for employee in employees])
+            rowcount = self.cursor.rowcount
+        return rowcount
+
     def delete_employee(self, employee_id):
         self.cursor.execute('DELETE FROM employees WHERE id = ?', (employee_id,))
-        self.conn.commit()
+        self._record_change('employees', DELETED, [employee_id])
+        self._commit()
         return True
 
     def add_salary_component(self, employee_id, component_type, amount, month, year):
@@ -161,123 +543,479 @@ class Database:
             INSERT INTO salary_components (employee_id, component_type, amount, month, year)
             VALUES (?, ?, ?, ?, ?)
         ''', (employee_id, component_type, amount, month, year))
-        self.conn.commit()
+        self._record_change('salary_components', INSERTED, [self.cursor.lastrowid], [(employee_id, month, year)])
+        self._commit()
 
-    def get_all_salary_components(self):
-        self.cursor.execute('SELECT sc.id, e.name, sc.component_type, sc.amount, sc.month, sc.year FROM salary_components sc JOIN employees e ON sc.employee_id = e.id')
-        return self.cursor.fetchall()
+    def add_salary_components(self, components):
+        # components: iterable of (employee_id, component_type, amount, month, year)
+        components = list(components)
+        with self.transaction():
+            self.cursor.executemany('''
+                INSERT INTO salary_components (employee_id, component_type, amount, month, year)
+                VALUES (?, ?, ?, ?, ?)
+            ''', components)
+            self._record_change('salary_components', INSERTED,
+                                periods=[(component[0], component[3], component[4]) for component in components])
+            rowcount = self.cursor.rowcount
+        return rowcount
+
+    def get_all_salary_components(self, limit=-1, after=None, ids=None, employee_id=None, month=None, year=None,
+                                  component_type=None, department=None):
+        # Filter periode memakai idx_salary_components_period_id (year, month, id)
+        where, order_by, params = _page_query([
+            ('sc.id', 'IN', None if ids is None else tuple(ids)),
+            ('sc.employee_id', '=', employee_id),
+            ('sc.year', '=', year),
+            ('sc.month', '=', month),
+            ('sc.component_type', '=', component_type),
+            ('e.department', '=', department),
+        ], ['sc.id'], after)
+        return self._select(SalaryComponentRow, f'''
+            SELECT sc.id, e.name, sc.component_type, sc.amount, sc.month, sc.year
+            FROM salary_components sc JOIN employees e ON sc.employee_id = e.id
+            {where} {order_by} LIMIT ?
+        ''', (*params, limit)).fetchall()
+
+    def iter_salary_components(self, month=None, year=None, department=None, component_type=None):
+        return self._iter_pages(self.get_all_salary_components, SALARY_COMPONENT_PAGE_KEY, month=month, year=year,
+                                department=department, component_type=component_type)
 
     def get_salary_components(self, employee_id, month, year):
-        self.cursor.execute('''
-            SELECT * FROM salary_components 
+        return self._select(SalaryComponent, '''
+            SELECT id, employee_id, component_type, amount, month, year FROM salary_components
             WHERE employee_id = ? AND month = ? AND year = ?
-        ''', (employee_id, month, year))
-        return self.cursor.fetchall()
+        ''', (employee_id, month, year)).fetchall()
+
+    def get_employee_salary_components(self, employee_id, component_types):
+        # Riwayat komponen gaji karyawan untuk tipe tertentu (halaman karyawan)
+        component_types = tuple(component_types)
+        return self._select(SalaryComponent, f'''
+            SELECT id, employee_id, component_type, amount, month, year FROM salary_components
+            WHERE employee_id = ? AND component_type IN ({', '.join('?' * len(component_types))})
+            ORDER BY id
+        ''', (employee_id, *component_types)).fetchall()
+
+    def get_month_salary_components(self, month, year):
+        # Semua komponen gaji satu bulan (proses gaji). Urut id lewat idx_salary_components_period_id,
+        # jadi urutan komponen per karyawan tetap sama tanpa sort tambahan
+        return self._select(SalaryComponent, '''
+            SELECT id, employee_id, component_type, amount, month, year FROM salary_components
+            WHERE month = ? AND year = ?
+            ORDER BY id
+        ''', (month, year)).fetchall()
 
     def add_attendance(self, employee_id, date, check_in, check_out, status):
         try:
-            self.cursor.execute('''
+            with self.transaction():
+                self.cursor.execute('''
+                    INSERT INTO attendance (employee_id, date, check_in, check_out, status)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (employee_id, date, check_in, check_out, status))
+                self._record_change('attendance', INSERTED, [self.cursor.lastrowid], [_attendance_period(employee_id, date)])
+                return True
+        except Exception as e:
+            print(f"[DEBUG] Database: Error adding attendance: {e}")
+            return False
+
+    def add_attendance_records(self, records):
+        # records: iterable of (employee_id, date, check_in, check_out, status)
+        records = list(records)
+        with self.transaction():
+            self.cursor.executemany('''
                 INSERT INTO attendance (employee_id, date, check_in, check_out, status)
                 VALUES (?, ?, ?, ?, ?)
-            ''', (employee_id, date, check_in, check_out, status))
-            self.conn.commit()
-            return True
+            ''', records)
+            self._record_change('attendance', INSERTED,
+                                periods=[_attendance_period(record[0], record[1]) for record in records])
+            rowcount = self.cursor.rowcount
+        return rowcount
+
+    def add_check_in(self, employee_id, date, check_in, status):
+        # Jam masuk manual; False jika absensi karyawan pada tanggal itu sudah ada.
+        # Dicek lewat index unik (employee_id, date), bukan SELECT lalu INSERT.
+        # Di dalam transaction(): jalur duplikat (tanpa baris baru) juga menutup transaksi tulis,
+        # kalau tidak koneksi GUI menahan kunci dan job/impor di thread lain kena "database is locked".
+        try:
+            with self.transaction():
+                self.cursor.execute('''
+                    INSERT INTO attendance (employee_id, date, check_in, check_out, status)
+                    VALUES (?, ?, ?, NULL, ?)
+                    ON CONFLICT (employee_id, date) DO NOTHING
+                ''', (employee_id, date, check_in, status))
+                if not self.cursor.rowcount:
+                    return False
+                self._record_change('attendance', INSERTED, [self.cursor.lastrowid], [_attendance_period(employee_id, date)])
+                return True
         except Exception as e:
-            print(f"[DEBUG] Database: Error adding attendance: {e}")
+            print(f"[DEBUG] Database: Error adding check_in: {e}")
             return False
 
+    def upsert_attendance_punches(self, records):
+        # records: iterable of (employee_id, date, check_in, check_out, status) hasil pasangan tap
+        # mesin absensi. Baris yang sudah ada digabung: jam masuk paling awal, jam keluar paling
+        # akhir (dibuang jika tidak lebih akhir dari jam masuk); status yang sudah ada dipertahankan.
+        # Menggabungkan file yang sama dua kali tidak mengubah hasil.
+        check_in = 'MIN(COALESCE(check_in, excluded.check_in), COALESCE(excluded.check_in, check_in))'
+        check_out = 'MAX(COALESCE(check_out, excluded.check_out), COALESCE(excluded.check_out, check_out))'
+        records = list(records)
+        with self.transaction():
+            self.cursor.executemany(f'''
+                INSERT INTO attendance (employee_id, date, check_in, check_out, status)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (employee_id, date) DO UPDATE SET
+                    check_in = {check_in},
+                    check_out = CASE WHEN {check_in} IS NULL OR {check_out} > {check_in} THEN {check_out} END
+            ''', records)
+            self._record_change('attendance', UPDATED,
+                                periods=[_attendance_period(record[0], record[1]) for record in records])
+            rowcount = self.cursor.rowcount
+        return rowcount
+
     def get_attendance(self, employee_id, start_date, end_date):
-        self.cursor.execute('''
-            SELECT * FROM attendance 
+        return self._select(Attendance, '''
+            SELECT id, employee_id, date, check_in, check_out, status FROM attendance
             WHERE employee_id = ? AND date BETWEEN ? AND ?
-        ''', (employee_id, start_date, end_date))
-        return self.cursor.fetchall()
+        ''', (employee_id, start_date, end_date)).fetchall()
 
-    def get_all_attendance_with_employee_names(self):
-        self.cursor.execute('''
-            SELECT a.id, e.name, a.date, a.check_in, a.check_out, a.status
+    def get_attendance_histogram(self, start_date, end_date, employee_id=None):
+        # Jumlah hari per status absensi untuk setiap (karyawan, tahun, bulan) dalam rentang tanggal,
+        # dihitung SQLite dalam satu GROUP BY di atas index absensi yang sudah memuat status.
+        # {(employee_id, tahun, bulan): {status: jumlah hari}}; status yang tidak muncul tidak ada di dict.
+        employee_filter, params = ('AND employee_id = ?', (employee_id,)) if employee_id is not None else ('', ())
+        self.cursor.execute(f'''
+            SELECT substr(date, 1, 7) AS period, employee_id, status, COUNT(*)
+            FROM attendance
+            WHERE date BETWEEN ? AND ? {employee_filter}
+            GROUP BY period, employee_id, status
+        ''', (start_date, end_date, *params))
+        histogram = {}
+        for period, row_employee_id, status, days in self.cursor.fetchall():
+            histogram.setdefault((row_employee_id, int(period[:4]), int(period[5:])), {})[status] = days
+        return histogram
+
+    def get_all_attendance_with_employee_names(self, limit=-1, after=None, ids=None, employee_id=None, status=None,
+                                               start_date=None, end_date=None, department=None):
+        # Urutan (date, employee_id) unik dan dilayani idx_attendance_date / idx_attendance_employee_date.
+        # Batas akhir tanggal sudah tersirat oleh `after` dari halaman sebelumnya; jika tetap
+        # disertakan, SQLite memindai dari end_date sampai posisi halaman setiap kali.
+        if after is not None and end_date is not None and after[0] <= end_date:
+            end_date = None
+        where, order_by, params = _page_query([
+            ('a.id', 'IN', None if ids is None else tuple(ids)),
+            ('a.employee_id', '=', employee_id),
+            ('a.status', '=', status),
+            ('a.date', '>=', start_date),
+            ('a.date', '<=', end_date),
+            ('e.department', '=', department),
+        ], ['a.date', 'a.employee_id'], after, descending=True)
+        return self._select(AttendanceRow, f'''
+            SELECT a.id, e.name, a.date, a.check_in, a.check_out, a.status, a.employee_id
             FROM attendance a JOIN employees e ON a.employee_id = e.id
-            ORDER BY a.date DESC
-        ''')
-        return self.cursor.fetchall()
+            {where} {order_by} LIMIT ?
+        ''', (*params, limit)).fetchall()
 
     def update_attendance(self, attendance_id, employee_id, date, check_in, check_out, status):
         try:
-            self.cursor.execute('''
-                UPDATE attendance
-                SET employee_id = ?, date = ?, check_in = ?, check_out = ?, status = ?
-                WHERE id = ?
-            ''', (employee_id, date, check_in, check_out, status, attendance_id))
-            self.conn.commit()
-            return True
+            with self.transaction():
+                periods = self._stored_periods('attendance', [attendance_id]) + [_attendance_period(employee_id, date)]
+                self.cursor.execute('''
+                    UPDATE attendance
+                    SET employee_id = ?, date = ?, check_in = ?, check_out = ?, status = ?
+                    WHERE id = ?
+                ''', (employee_id, date, check_in, check_out, status, attendance_id))
+                self._record_change('attendance', UPDATED, [attendance_id], periods)
+                return True
         except Exception as e:
             print(f"[DEBUG] Database: Error updating attendance: {e}")
             return False
 
+    def update_attendance_records(self, records):
+        # records: iterable of (attendance_id, employee_id, date, check_in, check_out, status)
+        records = list(records)
+        with self.transaction():
+            periods = self._stored_periods('attendance', [record[0] for record in records])
+            periods += [_attendance_period(record[1], record[2]) for record in records]
+            self.cursor.executemany('''
+                UPDATE attendance
+                SET employee_id = ?, date = ?, check_in = ?, check_out = ?, status = ?
+                WHERE id = ?
+            ''', ((*record[1:], record[0]) for record in records))
+            self._record_change('attendance', UPDATED, [record[0] for record in records], periods)
+            rowcount = self.cursor.rowcount
+        return rowcount
+
     def delete_attendance(self, attendance_id):
         try:
-            self.cursor.execute('DELETE FROM attendance WHERE id = ?', (attendance_id,))
-            self.conn.commit()
-            return True
+            with self.transaction():
+                periods = self._stored_periods('attendance', [attendance_id])
+                self.cursor.execute('DELETE FROM attendance WHERE id = ?', (attendance_id,))
+                self._record_change('attendance', DELETED, [attendance_id], periods)
+                return True
         except Exception as e:
             print(f"[DEBUG] Database: Error deleting attendance: {e}")
             return False
 
+    def delete_attendance_records(self, attendance_ids):
+        attendance_ids = list(attendance_ids)
+        with self.transaction():
+            periods = self._stored_periods('attendance', attendance_ids)
+            self.cursor.executemany('DELETE FROM attendance WHERE id = ?', ((attendance_id,) for attendance_id in attendance_ids))
+            self._record_change('attendance', DELETED, attendance_ids, periods)
+            rowcount = self.cursor.rowcount
+        return rowcount
+
     def update_salary_component(self, component_id, employee_id, component_type, amount, month, year):
         try:
-            self.cursor.execute('''
+            with self.transaction():
+                periods = self._stored_periods('salary_components', [component_id]) + [(employee_id, month, year)]
+                self.cursor.execute('''
+                    UPDATE salary_components
+                    SET employee_id = ?, component_type = ?, amount = ?, month = ?, year = ?
+                    WHERE id = ?
+                ''', (employee_id, component_type, amount, month, year, component_id))
+                self._record_change('salary_components', UPDATED, [component_id], periods)
+                return True
+        except Exception:
+            return False
+
+    def update_salary_components(self, components):
+        # components: iterable of (component_id, employee_id, component_type, amount, month, year)
+        components = list(components)
+        with self.transaction():
+            periods = self._stored_periods('salary_components', [component[0] for component in components])
+            periods += [(component[1], component[4], component[5]) for component in components]
+            self.cursor.executemany('''
                 UPDATE salary_components
                 SET employee_id = ?, component_type = ?, amount = ?, month = ?, year = ?
                 WHERE id = ?
-            ''', (employee_id, component_type, amount, month, year, component_id))
-            self.conn.commit()
-            return True
-        except Exception:
-            return False
+            ''', ((*component[1:], component[0]) for component in components))
+            self._record_change('salary_components', UPDATED, [component[0] for component in components], periods)
+            rowcount = self.cursor.rowcount
+        return rowcount
 
     def delete_salary_component(self, component_id):
+        periods = self._stored_periods('salary_components', [component_id])
         self.cursor.execute('DELETE FROM salary_components WHERE id = ?', (component_id,))
-        self.conn.commit()
+        self._record_change('salary_components', DELETED, [component_id], periods)
+        self._commit()
         return True
 
+    def delete_salary_components(self, component_ids):
+        component_ids = list(component_ids)
+        with self.transaction():
+            periods = self._stored_periods('salary_components', component_ids)
+            self.cursor.executemany('DELETE FROM salary_components WHERE id = ?', ((component_id,) for component_id in component_ids))
+            self._record_change('salary_components', DELETED, component_ids, periods)
+            rowcount = self.cursor.rowcount
+        return rowcount
+
     def add_processed_payslip(self, employee_id, month, year, net_salary, pdf_path):
         try:
-            self.cursor.execute('''
-                INSERT INTO processed_payslips (employee_id, month, year, net_salary, pdf_path)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (employee_id, month, year, net_salary, pdf_path))
-            self.conn.commit()
-            return True
+            with self.transaction():
+                self.cursor.execute('''
+                    INSERT INTO processed_payslips (employee_id, month, year, net_salary, pdf_path)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (employee_id, month, year, net_salary, pdf_path))
+                self._record_change('processed_payslips', INSERTED, [self.cursor.lastrowid])
+                return True
         except sqlite3.IntegrityError:
             return False
 
-    def get_processed_payslips_for_employee(self, employee_id):
-        self.cursor.execute('SELECT * FROM processed_payslips WHERE employee_id = ? ORDER BY year DESC, month DESC', (employee_id,))
-        return self.cursor.fetchall()
+    def add_processed_payslips(self, payslips):
+        # payslips: iterable of (employee_id, month, year, net_salary, pdf_path)
+        # Slip yang sudah ada (UNIQUE employee_id, month, year) dilewati seperti add_processed_payslip
+        with self.transaction():
+            self.cursor.executemany('''
+                INSERT OR IGNORE INTO processed_payslips (employee_id, month, year, net_salary, pdf_path)
+                VALUES (?, ?, ?, ?, ?)
+            ''', payslips)
+            self._record_change('processed_payslips', INSERTED)
+            rowcount = self.cursor.rowcount
+        return rowcount
+
+    def rebuild_payroll_summary(self):
+        # Bangun ulang seluruh payroll_monthly_summary dari data mentah dalam satu transaksi;
+        # mengembalikan jumlah baris. Normalnya trigger sudah menjaga tabel ini (lihat payroll_summary.py)
+        with self.transaction():
+            self.cursor.execute('DELETE FROM payroll_monthly_summary')
+            self.cursor.execute(f'''
+                INSERT INTO payroll_monthly_summary
+                    (year, month, employee_id, total_allowances, total_deductions, alpha_days, net_salary)
+                {SUMMARY_SELECT}
+            ''')
+            count = self.cursor.rowcount
+            self._record_change('payroll_monthly_summary', UPDATED)
+        return count
 
-    def get_all_processed_payslips(self):
+    def get_processed_payslip_hashes(self, month, year):
+        # employee_id -> (input_hash, pdf_path, archive_member) slip yang sudah dibuat untuk periode ini
         self.cursor.execute('''
-            SELECT pp.id, e.name, pp.month, pp.year, pp.net_salary, pp.pdf_path 
+            SELECT employee_id, input_hash, pdf_path, archive_member FROM processed_payslips
+            WHERE month = ? AND year = ?
+        ''', (month, year))
+        return {row[0]: tuple(row[1:]) for row in self.cursor.fetchall()}
+
+    def get_payslip_cache_paths(self, input_hashes):
+        # input_hash -> path PDF di cache render; per 500 hash agar tidak melewati batas parameter SQLite
+        input_hashes = list(input_hashes)
+        paths = {}
+        for start in range(0, len(input_hashes), 500):
+            batch = input_hashes[start:start + 500]
+            self.cursor.execute(f'''
+                SELECT input_hash, pdf_path FROM payslip_render_cache
+                WHERE input_hash IN ({', '.join('?' * len(batch))})
+            ''', batch)
+            paths.update(self.cursor.fetchall())
+        return paths
+
+    def add_payslip_cache_entries(self, entries):
+        # entries: iterable of (input_hash, pdf_path); entri lama dengan hash sama diganti
+        with self.transaction():
+            self.cursor.executemany('''
+                INSERT OR REPLACE INTO payslip_render_cache (input_hash, pdf_path) VALUES (?, ?)
+            ''', entries)
+
+    def start_payroll_run(self, month, year, total):
+        # Lanjutkan run terakhir periode ini yang belum selesai, atau mulai run baru.
+        # Mengembalikan (run_id, resumed).
+        with self.transaction():
+            self.cursor.execute('''
+                SELECT id, status FROM payroll_runs
+                WHERE year = ? AND month = ? ORDER BY id DESC LIMIT 1
+            ''', (year, month))
+            row = self.cursor.fetchone()
+            if row is not None and row[1] != 'completed':
+                run_id, resumed = row[0], True
+                self.cursor.execute('''
+                    UPDATE payroll_runs SET status = 'running', total = ?, finished_at = NULL WHERE id = ?
+                ''', (total, run_id))
+                self._record_change('payroll_runs', UPDATED, [run_id])
+            else:
+                self.cursor.execute('INSERT INTO payroll_runs (month, year, total) VALUES (?, ?, ?)',
+                                    (month, year, total))
+                run_id, resumed = self.cursor.lastrowid, False
+                self._record_change('payroll_runs', INSERTED, [run_id])
+        return run_id, resumed
+
+    def set_payroll_run_items(self, run_id, items):
+        # items: iterable of (employee_id, input_hash, status) dengan status 'pending' atau 'skipped'.
+        # Karyawan yang sudah 'done' di run yang dilanjutkan tetap 'done' selama hash-nya sama.
+        with self.transaction():
+            self.cursor.executemany('''
+                INSERT INTO payroll_run_items (run_id, employee_id, input_hash, status) VALUES (?, ?, ?, ?)
+                ON CONFLICT (run_id, employee_id) DO UPDATE SET
+                    status = CASE WHEN payroll_run_items.status = 'done'
+                                       AND payroll_run_items.input_hash = excluded.input_hash
+                                  THEN 'done' ELSE excluded.status END,
+                    input_hash = excluded.input_hash,
+                    error = NULL
+            ''', ((run_id, employee_id, input_hash, status) for employee_id, input_hash, status in items))
+            # Karyawan yang sudah dihapus sejak run dimulai
+            self.cursor.execute('''
+                DELETE FROM payroll_run_items
+                WHERE run_id = ? AND employee_id NOT IN (SELECT id FROM employees)
+            ''', (run_id,))
+            self._update_payroll_run_counts(run_id)
+
+    def checkpoint_payroll_run(self, run_id, payslips, failures):
+        # Simpan satu potongan run dalam satu transaksi: slip yang berhasil (beserta hash input)
+        # dan karyawan yang gagal. Jika proses berhenti, run dilanjutkan dari checkpoint terakhir.
+        # payslips: list of (employee_id, month, year, net_salary, pdf_path, archive_member, input_hash)
+        # failures: dict employee_id -> pesan error
+        with self.transaction():
+            self.cursor.executemany('''
+                INSERT INTO processed_payslips (employee_id, month, year, net_salary, pdf_path, archive_member, input_hash)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (employee_id, month, year) DO UPDATE SET
+                    net_salary = excluded.net_salary,
+                    pdf_path = excluded.pdf_path,
+                    archive_member = excluded.archive_member,
+                    input_hash = excluded.input_hash,
+                    processed_at = CURRENT_TIMESTAMP
+            ''', payslips)
+            self.cursor.executemany('''
+                UPDATE payroll_run_items SET status = 'done', error = NULL WHERE run_id = ? AND employee_id = ?
+            ''', ((run_id, payslip[0]) for payslip in payslips))
+            self.cursor.executemany('''
+                UPDATE payroll_run_items SET status = 'failed', error = ? WHERE run_id = ? AND employee_id = ?
+            ''', ((error, run_id, employee_id) for employee_id, error in failures.items()))
+            self._update_payroll_run_counts(run_id)
+            if payslips:
+                self._record_change('processed_payslips', UPDATED)
+            self._record_change('payroll_runs', UPDATED, [run_id])
+
+    def finish_payroll_run(self, run_id, status):
+        # status: 'completed' atau 'incomplete' (dibatalkan / ada yang gagal, bisa dilanjutkan)
+        with self.transaction():
+            self._update_payroll_run_counts(run_id)
+            self.cursor.execute('''
+                UPDATE payroll_runs SET status = ?, finished_at = CURRENT_TIMESTAMP WHERE id = ?
+            ''', (status, run_id))
+            self._record_change('payroll_runs', UPDATED, [run_id])
+
+    def _update_payroll_run_counts(self, run_id):
+        self.cursor.execute('''
+            UPDATE payroll_runs SET
+                total = (SELECT COUNT(*) FROM payroll_run_items WHERE run_id = :run_id),
+                rendered = (SELECT COUNT(*) FROM payroll_run_items WHERE run_id = :run_id AND status = 'done'),
+                skipped = (SELECT COUNT(*) FROM payroll_run_items WHERE run_id = :run_id AND status = 'skipped'),
+                failed = (SELECT COUNT(*) FROM payroll_run_items WHERE run_id = :run_id AND status = 'failed')
+            WHERE id = :run_id
+        ''', {'run_id': run_id})
+
+    def get_payroll_runs(self, month=None, year=None, limit=20):
+        # Run terbaru lebih dulu; month dan year masing-masing boleh diisi sendiri
+        filters = [(column, value) for column, value in (('year', year), ('month', month)) if value is not None]
+        where = f"WHERE {' AND '.join(f'{column} = ?' for column, _ in filters)}" if filters else ''
+        params = tuple(value for _, value in filters)
+        return self._select(PayrollRun, f'''
+            SELECT id, month, year, status, total, rendered, skipped, failed, started_at, finished_at
+            FROM payroll_runs {where} ORDER BY id DESC LIMIT ?
+        ''', (*params, limit)).fetchall()
+
+    def get_processed_payslip(self, employee_id, month, year):
+        # PayslipFile slip karyawan untuk satu bulan, atau None (juga jika slip perlu dibuat ulang,
+        # lihat migrasi versi 10)
+        return self._select(PayslipFile, '''
+            SELECT pdf_path, archive_member FROM processed_payslips
+            WHERE employee_id = ? AND month = ? AND year = ? AND pdf_path != ''
+        ''', (employee_id, month, year)).fetchone()
+
+    def get_all_processed_payslips(self, limit=-1, after=None, ids=None, employee_id=None, month=None, year=None,
+                                   department=None):
+        where, order_by, params = _page_query([
+            ('pp.id', 'IN', None if ids is None else tuple(ids)),
+            ('pp.employee_id', '=', employee_id),
+            ('pp.year', '=', year),
+            ('pp.month', '=', month),
+            ('e.department', '=', department),
+        ], ['pp.year', 'pp.month', 'pp.id'], after, descending=True)
+        return self._select(PayslipRow, f'''
+            SELECT pp.id, e.name, pp.month, pp.year, pp.net_salary, pp.pdf_path, pp.archive_member
             FROM processed_payslips pp JOIN employees e ON pp.employee_id = e.id
-            ORDER BY pp.year DESC, pp.month DESC
-        ''')
-        return self.cursor.fetchall()
+            {where} {order_by} LIMIT ?
+        ''', (*params, limit)).fetchall()
 
     def update_check_out(self, employee_id, date, check_out_time):
         try:
-            self.cursor.execute('''
-                UPDATE attendance
-                SET check_out = ?
-                WHERE employee_id = ? AND date = ? AND check_out IS NULL
-            ''', (check_out_time, employee_id, date))
-            self.conn.commit()
-            if self.cursor.rowcount > 0:
+            with self.transaction():
+                self.cursor.execute('''
+                    SELECT id FROM attendance
+                    WHERE employee_id = ? AND date = ? AND check_out IS NULL
+                ''', (employee_id, date))
+                attendance_ids = [row[0] for row in self.cursor.fetchall()]
+                if not attendance_ids:
+                    return False # No record was updated
+                self.cursor.executemany('UPDATE attendance SET check_out = ? WHERE id = ?',
+                                        ((check_out_time, attendance_id) for attendance_id in attendance_ids))
+                self._record_change('attendance', UPDATED, attendance_ids, [_attendance_period(employee_id, date)])
                 return True
-            else:
-                return False # No record was updated
         except Exception as e:
             print(f"[DEBUG] Database: Error updating check_out: {e}")
             return False
 
     def close(self):
-        self.conn.close() 
\ No newline at end of file
+        # Lepas koneksi thread ini; koneksi baru ditutup jika tidak ada instance lain yang memakainya
+        if self._thread_conn is not None:
+            self.manager.release(self._thread_conn)
+            self._thread_conn = None
\ No newline at end of file
@@ -0,0 +1,224 @@
+import csv
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from typing import NamedTuple
+
+from money import to_sen
+
+DEFAULT_PASSWORD = "123456"  # sama dengan akun yang dibuat lewat form Tambah Karyawan
+EMPLOYEE_STATUSES = ("Aktif", "Tidak Aktif")
+CHUNK_SIZE = 500
+
+# Nama kolom file -> field. Kolom hasil "Ekspor Karyawan ke Excel" bisa diimpor ulang;
+# kolom lain (mis. "ID") diabaikan.
+HEADER_ALIASES = {
+    'nip': 'nip',
+    'nama': 'name', 'name': 'name',
+    'jabatan': 'position', 'position': 'position',
+    'departemen': 'department', 'department': 'department',
+    'gaji pokok': 'basic_salary', 'basic_salary': 'basic_salary',
+    'tanggal bergabung': 'join_date', 'join_date': 'join_date',
+    'status': 'status',
+    'password': 'password', 'kata sandi': 'password',
+}
+REQUIRED_FIELDS = ('nip', 'name', 'position', 'department', 'basic_salary', 'join_date')
+FIELD_LABELS = {
+    'nip': 'NIP', 'name': 'Nama', 'position': 'Jabatan', 'department': 'Departemen',
+    'basic_salary': 'Gaji Pokok', 'join_date': 'Tanggal Bergabung',
+}
+
+
+class RowError(NamedTuple):
+    line: int  # nomor baris di file (header = baris 1)
+    nip: str
+    message: str
+
+
+class ImportReport:
+    ERROR_HEADER = ("Baris", "NIP", "Kesalahan")
+
+    def __init__(self):
+        self.total = 0
+        self.imported = 0
+        self.errors = []  # RowError
+        self.cancelled = False
+        self.elapsed = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.total / self.elapsed if self.elapsed else 0.0
+
+    def write_errors(self, filepath):
+        with open(filepath, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(self.ERROR_HEADER)
+            writer.writerows(self.errors)
+        return filepath
+
+
+def read_csv(filepath):
+    # Baris CSV (list str) satu per satu, header lebih dulu. Pemisah (koma, titik koma, tab) dikenali
+    # dari awal file. Dipakai juga impor absensi (attendance_import), jadi perbaikan dialek cukup di sini.
+    with open(filepath, newline='', encoding='utf-8-sig') as f:
+        sample = f.read(4096)
+        f.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=',;\t')
+        except csv.Error:
+            dialect = csv.excel
+        yield from csv.reader(f, dialect)
+
+
+def _read_xlsx(filepath):
+    import openpyxl  # dimuat saat impor Excel pertama
+    workbook = openpyxl.load_workbook(filepath, read_only=True, data_only=True)
+    try:
+        yield from workbook.active.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def read_rows(filepath):
+    # Membaca file baris demi baris (streaming); menghasilkan (nomor_baris, dict field)
+    if os.path.splitext(filepath)[1].lower() in ('.xlsx', '.xlsm'):
+        rows = _read_xlsx(filepath)
+    else:
+        rows = read_csv(filepath)
+    header = next(rows, None)
+    if header is None:
+        return
+    fields = [HEADER_ALIASES.get(str(name or '').strip().lower()) for name in header]
+    missing = [FIELD_LABELS[field] for field in REQUIRED_FIELDS if field not in fields]
+    if missing:
+        raise ValueError(f"Kolom wajib tidak ditemukan: {', '.join(missing)}")
+    for line, values in enumerate(rows, start=2):
+        if all(value is None or str(value).strip() == '' for value in values):
+            continue
+        yield line, {field: value for field, value in zip(fields, values) if field}
+
+
+def count_rows(filepath):
+    # Perkiraan jumlah baris data untuk progres (tanpa baris kosong/header)
+    if os.path.splitext(filepath)[1].lower() in ('.xlsx', '.xlsm'):
+        import openpyxl
+        workbook = openpyxl.load_workbook(filepath, read_only=True)
+        try:
+            return max((workbook.active.max_row or 1) - 1, 0)
+        finally:
+            workbook.close()
+    with open(filepath, newline='', encoding='utf-8-sig') as f:
+        return max(sum(1 for _ in csv.reader(f)) - 1, 0)
+
+
+def _text(value):
+    # Excel menyimpan NIP numerik sebagai float (2324100052.0)
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return '' if value is None else str(value).strip()
+
+
+def validate_row(values):
+    # Mengembalikan (tuple employee untuk Database.add_employees, password) atau ValueError
+    employee = {field: _text(values.get(field)) for field in REQUIRED_FIELDS}
+    for field in REQUIRED_FIELDS:
+        if not employee[field]:
+            raise ValueError(f"{FIELD_LABELS[field]} harus diisi")
+
+    try:
+        basic_salary = to_sen(values['basic_salary'])
+    except ValueError:
+        raise ValueError("Gaji Pokok harus berupa angka")
+    if basic_salary < 0:
+        raise ValueError("Gaji Pokok tidak boleh negatif")
+
+    join_date = values['join_date']
+    if isinstance(join_date, datetime):
+        join_date = join_date.date()
+    if isinstance(join_date, date):
+        join_date = join_date.isoformat()
+    else:
+        try:
+            join_date = datetime.strptime(employee['join_date'], "%Y-%m-%d").date().isoformat()
+        except ValueError:
+            raise ValueError("Tanggal Bergabung harus berformat YYYY-MM-DD")
+
+    status = _text(values.get('status')) or "Aktif"
+    if status not in EMPLOYEE_STATUSES:
+        raise ValueError(f"Status harus salah satu dari: {', '.join(EMPLOYEE_STATUSES)}")
+
+    password = _text(values.get('password')) or DEFAULT_PASSWORD
+    return (employee['nip'], employee['name'], employee['position'], employee['department'],
+            basic_salary, join_date, status), password
+
+
+def chunks(rows, size):
+    # Potongan list berisi size baris (potongan terakhir bisa lebih pendek)
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def import_employees(db, filepath, chunk_size=CHUNK_SIZE, jobs=None, progress=None, cancelled=None):
+    # Impor karyawan + akun login (username = NIP) dari CSV/XLSX.
+    # Baris yang tidak valid dicatat di report.errors tanpa menghentikan impor;
+    # setiap potongan chunk_size baris ditulis dalam satu transaksi.
+    report = ImportReport()
+    start = time.perf_counter()
+    total = count_rows(filepath) if progress else 0
+    seen_nips = set()
+
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as executor:
+        for chunk in chunks(read_rows(filepath), chunk_size):
+            if cancelled and cancelled():
+                report.cancelled = True
+                break
+            valid = []
+            for line, values in chunk:
+                report.total += 1
+                nip = _text(values.get('nip'))
+                try:
+                    employee, password = validate_row(values)
+                except ValueError as e:
+                    report.errors.append(RowError(line, nip, str(e)))
+                    continue
+                if nip in seen_nips:
+                    report.errors.append(RowError(line, nip, "NIP duplikat di dalam file"))
+                    continue
+                seen_nips.add(nip)
+                valid.append((line, employee, password))
+
+            nips = [employee[0] for _, employee, _ in valid]
+            existing = db.get_existing_nips(nips) | db.get_existing_usernames(nips)
+            for line, employee, _ in valid:
+                if employee[0] in existing:
+                    report.errors.append(RowError(line, employee[0], "NIP sudah terdaftar"))
+            valid = [row for row in valid if row[1][0] not in existing]
+
+            if valid:
+                try:
+                    with db.transaction():
+                        # Akun dulu: hashing bcrypt selesai sebelum INSERT pertama mengunci database
+                        db.add_users(((employee[0], password, 'employee') for _, employee, password in valid),
+                                     executor=executor)
+                        db.add_employees(employee for _, employee, _ in valid)
+                    report.imported += len(valid)
+                except sqlite3.IntegrityError as e:
+                    # Bentrok dengan data yang masuk bersamaan; seluruh potongan dibatalkan
+                    report.errors.extend(RowError(line, employee[0], f"Gagal disimpan: {e}")
+                                         for line, employee, _ in valid)
+            if progress:
+                progress(report.total, max(total, report.total))
+
+    report.elapsed = time.perf_counter() - start
+    report.errors.sort()
+    print(f"[DEBUG] Impor karyawan: {report.imported}/{report.total} baris dalam {report.elapsed:.2f} s "
+          f"({report.rows_per_second:,.1f} baris/detik), {len(report.errors)} gagal")
+    return report
@@ -2,15 +2,18 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                             QPushButton, QTableWidget, QTableWidgetItem,
                             QComboBox, QDateEdit, QMessageBox)
 from PyQt6.QtCore import Qt, QDate
-from database import Database
+from database import ATTENDANCE_STATUSES, Database
+from money import format_rupiah
+from payroll_engine import ALLOWANCE_TYPES, DEDUCTION_TYPES, employee_payroll
+from payslip_archive import payslip_file
 import os
 from datetime import datetime
 
 class EmployeeView(QWidget):
-    def __init__(self, main_window=None):
+    def __init__(self, main_window=None, db=None):
         super().__init__()
         self.main_window = main_window # Store reference to main_window
-        self.db = Database()
+        self.db = db or Database()
         self.init_ui()
 
     def init_ui(self):
@@ -126,6 +129,13 @@ class EmployeeView(QWidget):
             "Tanggal", "Check In", "Check Out", "Status"
         ])
         attendance_layout.addWidget(self.attendance_table)
+
+        # Rekap jumlah hari per status untuk setiap bulan dalam rentang tanggal
+        self.attendance_summary_table = QTableWidget()
+        self.attendance_summary_table.setColumnCount(len(ATTENDANCE_STATUSES) + 2)
+        self.attendance_summary_table.setHorizontalHeaderLabels(["Bulan", *ATTENDANCE_STATUSES, "Total"])
+        attendance_layout.addWidget(QLabel("Rekap Absensi per Bulan"))
+        attendance_layout.addWidget(self.attendance_summary_table)
         
         layout.addLayout(attendance_layout)
         
@@ -140,6 +150,8 @@ class EmployeeView(QWidget):
         self.employee_payslip_table.setHorizontalHeaderLabels([
             "Tipe Komponen", "Jumlah", "Bulan", "Tahun"
         ])
+        # Klik dua kali membuka slip gaji bulan tersebut
+        self.employee_payslip_table.cellDoubleClicked.connect(self.open_employee_payslip)
         payslips_layout.addWidget(self.employee_payslip_table)
 
         layout.addLayout(payslips_layout)
@@ -149,13 +161,13 @@ class EmployeeView(QWidget):
     def set_employee_info(self, employee_id):
         employee = self.db.get_employee(employee_id=employee_id)
         if employee:
-            self.employee_id = employee[0]  # Store employee ID
-            self.profile_label.setText(f"Profil Karyawan: {employee[2]} ({employee[1]})")
-            self.name_label.setText(f"Nama: {employee[2]}")
-            self.position_label.setText(f"Jabatan: {employee[3]}")
-            self.department_label.setText(f"Departemen: {employee[4]}")
-            self.join_date_label.setText(f"Tanggal Bergabung: {employee[6]}")
-            self.header_label.setText(f"Selamat Datang, {employee[2]}!") # Update header
+            self.employee_id = employee.id  # Store employee ID
+            self.profile_label.setText(f"Profil Karyawan: {employee.name} ({employee.nip})")
+            self.name_label.setText(f"Nama: {employee.name}")
+            self.position_label.setText(f"Jabatan: {employee.position}")
+            self.department_label.setText(f"Departemen: {employee.department}")
+            self.join_date_label.setText(f"Tanggal Bergabung: {employee.join_date}")
+            self.header_label.setText(f"Selamat Datang, {employee.name}!") # Update header
             # Load initial salary and attendance data for the employee
             self.view_salary()
             self.view_attendance()
@@ -176,19 +188,16 @@ class EmployeeView(QWidget):
         year = int(self.year_combo.currentText())
         
         salary_components = self.db.get_salary_components(employee_id, month, year)
-        total_salary = 0.0
         for row_num, component in enumerate(salary_components):
             self.salary_table.insertRow(row_num)
-            self.salary_table.setItem(row_num, 0, QTableWidgetItem(str(component[2])))
-            self.salary_table.setItem(row_num, 1, QTableWidgetItem(f"{component[3]:,.2f}"))
-            self.salary_table.setItem(row_num, 2, QTableWidgetItem(f"{component[4]}/{component[5]}")) # Month/Year
+            self.salary_table.setItem(row_num, 0, QTableWidgetItem(component.component_type))
+            self.salary_table.setItem(row_num, 1, QTableWidgetItem(format_rupiah(component.amount)))
+            self.salary_table.setItem(row_num, 2, QTableWidgetItem(f"{component.month}/{component.year}"))
 
-            # Perbaikan: Potongan, Pajak, Asuransi harus mengurangi total gaji
-            if component[2] in ["Potongan", "Pajak", "Asuransi"]:
-                total_salary -= component[3]
-            else:
-                total_salary += component[3]
-        self.total_salary_label.setText(f"Total Gaji: Rp {total_salary:,.2f}")
+        # Total memakai hitungan yang sama dengan slip gaji: gaji pokok + tunjangan - potongan - potongan Alpha
+        result = employee_payroll(self.db, employee_id, month, year)
+        total_salary = result.net_salary if result else 0
+        self.total_salary_label.setText(f"Total Gaji: Rp {format_rupiah(total_salary)}")
 
     def view_attendance(self):
         self.attendance_table.setRowCount(0)
@@ -203,14 +212,22 @@ class EmployeeView(QWidget):
         attendance_records = self.db.get_attendance(employee_id, start_date, end_date)
         for row_num, record in enumerate(attendance_records):
             self.attendance_table.insertRow(row_num)
-            self.attendance_table.setItem(row_num, 0, QTableWidgetItem(str(record[2])))
-            self.attendance_table.setItem(row_num, 1, QTableWidgetItem(str(record[3] or "-")))
-            self.attendance_table.setItem(row_num, 2, QTableWidgetItem(str(record[4] or "-")))
-            self.attendance_table.setItem(row_num, 3, QTableWidgetItem(str(record[5])))
+            self.attendance_table.setItem(row_num, 0, QTableWidgetItem(record.date))
+            self.attendance_table.setItem(row_num, 1, QTableWidgetItem(record.check_in or "-"))
+            self.attendance_table.setItem(row_num, 2, QTableWidgetItem(record.check_out or "-"))
+            self.attendance_table.setItem(row_num, 3, QTableWidgetItem(record.status))
+        self.view_attendance_summary(employee_id, start_date, end_date)
 
-    def calculate_total_salary(self, components):
-        total = sum(component[3] for component in components)  # Assuming amount is at index 3
-        self.total_salary_label.setText(f"Total Gaji: Rp {total:,.2f}")
+    def view_attendance_summary(self, employee_id, start_date, end_date):
+        self.attendance_summary_table.setRowCount(0)
+        histogram = self.db.get_attendance_histogram(start_date, end_date, employee_id)
+        for row_num, ((_, year, month), counts) in enumerate(sorted(histogram.items())):
+            self.attendance_summary_table.insertRow(row_num)
+            self.attendance_summary_table.setItem(row_num, 0, QTableWidgetItem(f"{month}/{year}"))
+            for col_num, status in enumerate(ATTENDANCE_STATUSES, start=1):
+                self.attendance_summary_table.setItem(row_num, col_num, QTableWidgetItem(str(counts.get(status, 0))))
+            self.attendance_summary_table.setItem(row_num, len(ATTENDANCE_STATUSES) + 1,
+                                                  QTableWidgetItem(str(sum(counts.values()))))
 
     def load_employee_payslips(self):
         self.employee_payslip_table.setRowCount(0)
@@ -218,21 +235,32 @@ class EmployeeView(QWidget):
         if not employee_id:
             return
         # Ambil komponen gaji yang termasuk tunjangan, lembur, bonus, potongan, pajak, asuransi
-        allowed_types = ["Tunjangan", "Lembur", "Bonus", "Potongan", "Pajak", "Asuransi"]
-        components = self.db.cursor.execute(
-            "SELECT component_type, amount, month, year FROM salary_components WHERE employee_id = ? AND component_type IN (?, ?, ?, ?, ?, ?)",
-            (employee_id, *allowed_types)
-        ).fetchall()
+        components = self.db.get_employee_salary_components(employee_id, ALLOWANCE_TYPES + DEDUCTION_TYPES)
         self.employee_payslip_table.setColumnCount(4)
         self.employee_payslip_table.setHorizontalHeaderLabels([
             "Tipe Komponen", "Jumlah", "Bulan", "Tahun"
         ])
         for row_num, comp in enumerate(components):
             self.employee_payslip_table.insertRow(row_num)
-            self.employee_payslip_table.setItem(row_num, 0, QTableWidgetItem(str(comp[0])))
-            self.employee_payslip_table.setItem(row_num, 1, QTableWidgetItem(f"{comp[1]:,.2f}"))
-            self.employee_payslip_table.setItem(row_num, 2, QTableWidgetItem(str(comp[2])))
-            self.employee_payslip_table.setItem(row_num, 3, QTableWidgetItem(str(comp[3])))
+            self.employee_payslip_table.setItem(row_num, 0, QTableWidgetItem(comp.component_type))
+            self.employee_payslip_table.setItem(row_num, 1, QTableWidgetItem(format_rupiah(comp.amount)))
+            self.employee_payslip_table.setItem(row_num, 2, QTableWidgetItem(str(comp.month)))
+            self.employee_payslip_table.setItem(row_num, 3, QTableWidgetItem(str(comp.year)))
+
+    def open_employee_payslip(self, row, column):
+        month = int(self.employee_payslip_table.item(row, 2).text())
+        year = int(self.employee_payslip_table.item(row, 3).text())
+        payslip = self.db.get_processed_payslip(self.employee_id, month, year)
+        if payslip is None:
+            QMessageBox.information(self, "Slip Gaji", f"Slip gaji {month}/{year} belum diproses.")
+            return
+        try:
+            # Slip dalam arsip zip diekstrak satu per satu saat dibuka
+            filepath = payslip_file(*payslip)
+        except Exception as e:
+            QMessageBox.warning(self, "Error", f"Gagal membaca slip gaji: {e}")
+            return
+        self.open_pdf(filepath)
 
     def open_pdf(self, filepath):
         try:
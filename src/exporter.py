@@ -0,0 +1,69 @@
+import csv
+import os
+
+from money import to_rupiah
+
+EMPLOYEE_COLUMNS = ["ID", "NIP", "Nama", "Jabatan", "Departemen", "Gaji Pokok", "Tanggal Bergabung", "Status"]
+SALARY_COMPONENT_COLUMNS = ["ID Komponen", "Nama Karyawan", "Tipe Komponen", "Jumlah", "Bulan", "Tahun"]
+
+# progress(done, 0) dipanggil setiap sekian baris; total tidak diketahui saat streaming
+PROGRESS_EVERY = 5000
+
+
+def is_xlsx(filepath):
+    return os.path.splitext(filepath)[1].lower() == '.xlsx'
+
+
+def _write_csv(filepath, columns, rows, progress):
+    # utf-8-sig agar Excel mengenali encoding; bisa dibaca ulang oleh employee_import
+    with open(filepath, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        count = 0
+        for count, row in enumerate(rows, start=1):
+            writer.writerow(row)
+            if progress and count % PROGRESS_EVERY == 0:
+                progress(count, 0)
+    return count
+
+
+def _write_xlsx(filepath, columns, rows, progress):
+    import openpyxl  # dimuat saat ekspor Excel pertama
+    # Mode write-only: setiap baris langsung ditulis ke file sementara, bukan disimpan di workbook
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet("Sheet1")
+    sheet.append(columns)
+    count = 0
+    for count, row in enumerate(rows, start=1):
+        sheet.append(row)
+        if progress and count % PROGRESS_EVERY == 0:
+            progress(count, 0)
+    workbook.save(filepath)
+    return count
+
+
+def write_rows(filepath, columns, rows, progress=None):
+    # Tulis rows (iterable, boleh generator dari cursor) ke .xlsx atau .csv dalam memori konstan.
+    # Jika progress melempar exception (mis. job dibatalkan), file setengah jadi dihapus.
+    try:
+        count = (_write_xlsx if is_xlsx(filepath) else _write_csv)(filepath, columns, rows, progress)
+    except BaseException:
+        if os.path.exists(filepath):
+            os.remove(filepath)
+        raise
+    if progress:
+        progress(count, count)
+    return count
+
+
+def export_employees(db, filepath, department=None, progress=None, status=None):
+    # Gaji Pokok ditulis dalam rupiah (Decimal 2 desimal) agar file bisa diimpor ulang
+    rows = (row[:5] + (to_rupiah(row.basic_salary),) + row[6:] for row in db.iter_employees(department, status))
+    return write_rows(filepath, EMPLOYEE_COLUMNS, rows, progress)
+
+
+def export_salary_components(db, filepath, month=None, year=None, department=None, progress=None,
+                             component_type=None):
+    rows = (row[:3] + (to_rupiah(row.amount),) + row[4:]
+            for row in db.iter_salary_components(month, year, department, component_type))
+    return write_rows(filepath, SALARY_COMPONENT_COLUMNS, rows, progress)
@@ -0,0 +1,193 @@
+import threading
+import traceback
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
+                            QPushButton, QTableWidget, QTableWidgetItem,
+                            QHeaderView, QAbstractItemView)
+
+from database import Database
+
+STATUS_QUEUED = "Menunggu"
+STATUS_RUNNING = "Berjalan"
+STATUS_DONE = "Selesai"
+STATUS_FAILED = "Gagal"
+STATUS_CANCELLED = "Dibatalkan"
+FINISHED_STATUSES = (STATUS_DONE, STATUS_FAILED, STATUS_CANCELLED)
+
+# Job yang sudah selesai disimpan sebagai riwayat di panel; yang lebih lama dibuang
+MAX_FINISHED_JOBS = 20
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class JobSignals(QObject):
+    # Sinyal dipancarkan dari worker thread, diterima di GUI thread (queued connection)
+    progress = pyqtSignal(int, int)
+    status_changed = pyqtSignal(str)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+
+class Job(QRunnable):
+    # func(job, *args) berjalan di worker thread; akses database lewat job.db
+    # (koneksi sqlite milik thread itu sendiri, ditutup saat job selesai), laporkan progres
+    # dengan job.report_progress(done, total) dan panggil job.check_cancelled() secara berkala.
+    def __init__(self, title, db_path, func, *args):
+        super().__init__()
+        self.title = title
+        self.db_path = db_path
+        self.func = func
+        self.args = args
+        self.status = STATUS_QUEUED
+        self.done = 0
+        self.total = 0
+        self.db = None
+        self.signals = JobSignals()
+        self._cancel_event = threading.Event()
+        self.setAutoDelete(False)
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def is_cancelled(self):
+        return self._cancel_event.is_set()
+
+    def check_cancelled(self):
+        if self.is_cancelled():
+            raise JobCancelled()
+
+    def report_progress(self, done, total):
+        self.done, self.total = done, total
+        self.signals.progress.emit(done, total)
+
+    def _set_status(self, status):
+        self.status = status
+        self.signals.status_changed.emit(status)
+
+    def run(self):
+        if self.is_cancelled():
+            self._set_status(STATUS_CANCELLED)
+            return
+        self._set_status(STATUS_RUNNING)
+        try:
+            self.db = Database(self.db_path)
+            result = self.func(self, *self.args)
+        except JobCancelled:
+            self._set_status(STATUS_CANCELLED)
+        except Exception as e:
+            print(f"[DEBUG] Job '{self.title}' gagal:\n{traceback.format_exc()}")
+            self._set_status(STATUS_FAILED)
+            self.signals.failed.emit(str(e))
+        else:
+            self._set_status(STATUS_CANCELLED if self.is_cancelled() else STATUS_DONE)
+            self.signals.finished.emit(result)
+        finally:
+            # Thread pool dipakai ulang; tanpa close koneksi thread ini tetap terbuka selamanya
+            if self.db is not None:
+                self.db.close()
+                self.db = None
+
+
+class JobManager(QObject):
+    # jobs: job yang masih menunggu/berjalan ditambah MAX_FINISHED_JOBS job selesai terakhir
+    job_added = pyqtSignal(object)
+    job_removed = pyqtSignal(object)
+
+    def __init__(self, db_path, max_threads=2, parent=None):
+        super().__init__(parent)
+        self.db_path = db_path
+        self.jobs = []
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(max_threads)
+
+    def submit(self, title, func, *args, on_finished=None, on_failed=None):
+        job = Job(title, self.db_path, func, *args)
+        if on_finished:
+            job.signals.finished.connect(on_finished)
+        if on_failed:
+            job.signals.failed.connect(on_failed)
+        self._forget_finished()
+        self.jobs.append(job)
+        self.job_added.emit(job)
+        self.pool.start(job)
+        return job
+
+    def _forget_finished(self):
+        finished = [job for job in self.jobs if job.status in FINISHED_STATUSES]
+        for job in finished[:-MAX_FINISHED_JOBS]:
+            self.jobs.remove(job)
+            self.job_removed.emit(job)
+
+    def cancel_all(self):
+        for job in self.jobs:
+            job.cancel()
+
+    def wait_for_done(self, msecs=-1):
+        return self.pool.waitForDone(msecs)
+
+
+class JobPanel(QWidget):
+    # Panel status job di bagian bawah AdminView
+    def __init__(self, job_manager, parent=None):
+        super().__init__(parent)
+        self.job_manager = job_manager
+        self.job_items = {}  # id(job) -> item kolom "Proses"; nomor baris bergeser saat riwayat dibuang
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        header_layout = QHBoxLayout()
+        header_label = QLabel("Status Proses")
+        header_label.setStyleSheet("font-weight: bold;")
+        self.cancel_button = QPushButton("Batalkan Proses")
+        self.cancel_button.clicked.connect(self.cancel_selected)
+        header_layout.addWidget(header_label)
+        header_layout.addStretch(1)
+        header_layout.addWidget(self.cancel_button)
+        layout.addLayout(header_layout)
+
+        self.job_table = QTableWidget()
+        self.job_table.setColumnCount(3)
+        self.job_table.setHorizontalHeaderLabels(["Proses", "Status", "Progres"])
+        self.job_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.job_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.job_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.job_table.setMaximumHeight(130)
+        layout.addWidget(self.job_table)
+
+        self.setLayout(layout)
+        job_manager.job_added.connect(self.add_job)
+        job_manager.job_removed.connect(self.remove_job)
+
+    def add_job(self, job):
+        row = self.job_table.rowCount()
+        self.job_table.insertRow(row)
+        title_item, status_item, progress_item = (QTableWidgetItem(job.title), QTableWidgetItem(job.status),
+                                                  QTableWidgetItem("-"))
+        self.job_items[id(job)] = title_item
+        self.job_table.setItem(row, 0, title_item)
+        self.job_table.setItem(row, 1, status_item)
+        self.job_table.setItem(row, 2, progress_item)
+        job.signals.status_changed.connect(status_item.setText)
+        # total 0: jumlah akhir belum diketahui (mis. ekspor streaming)
+        job.signals.progress.connect(lambda done, total: progress_item.setText(f"{done}/{total}" if total else str(done)))
+        self.job_table.scrollToBottom()
+
+    def remove_job(self, job):
+        title_item = self.job_items.pop(id(job), None)
+        if title_item is not None:
+            # Item baris dihapus bersama barisnya; sinyal job yang masih antre tidak boleh menyentuhnya
+            job.signals.status_changed.disconnect()
+            job.signals.progress.disconnect()
+            self.job_table.removeRow(self.job_table.row(title_item))
+
+    def cancel_selected(self):
+        selected_rows = {index.row() for index in self.job_table.selectionModel().selectedRows()}
+        for job in self.job_manager.jobs:
+            title_item = self.job_items.get(id(job))
+            if not selected_rows or (title_item is not None and self.job_table.row(title_item) in selected_rows):
+                if job.status in (STATUS_QUEUED, STATUS_RUNNING):
+                    job.cancel()
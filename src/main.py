@@ -1,19 +1,32 @@
 import sys
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                             QHBoxLayout, QLabel, QLineEdit, QPushButton,
-                            QMessageBox, QStackedWidget, QSizePolicy, QSpacerItem)
-from PyQt6.QtCore import Qt
+                            QMessageBox, QStackedWidget, QSizePolicy, QSpacerItem,
+                            QProgressBar)
+from PyQt6.QtCore import Qt, QThreadPool
 from PyQt6.QtGui import QPixmap, QIcon
+from auth import LoginThrottled
 from database import Database
+from jobs import Job
 from admin_view import AdminView
 from employee_view import EmployeeView
-import qt_material
+
+def verify_login(job, username, password):
+    # Berjalan di worker thread: bcrypt tidak membekukan GUI dan login bersamaan tidak antre
+    try:
+        return job.db.verify_user(username, password), None
+    except LoginThrottled as e:
+        return None, str(e)
 
 class LoginWindow(QWidget):
     def __init__(self, main_window):
         super().__init__()
         self.main_window = main_window
-        self.db = Database()
+        self.db = main_window.db # Pakai instance Database yang sama dengan MainWindow
+        self.login_pool = QThreadPool()
+        self.login_pool.setMaxThreadCount(2)
+        self.login_job = None  # job terakhir tetap dirujuk sampai login berikutnya (setAutoDelete False)
+        self.login_pending = False
         self.init_ui()
 
     def init_ui(self):
@@ -84,8 +97,9 @@ class LoginWindow(QWidget):
         card_layout.addWidget(self.password_input)
 
         # Login button
-        login_button = QPushButton("Login")
+        self.login_button = login_button = QPushButton("Login")
         login_button.clicked.connect(self.login)
+        self.password_input.returnPressed.connect(self.login)
         login_button.setStyleSheet("""
             padding: 10px;
             font-weight: bold;
@@ -98,6 +112,18 @@ class LoginWindow(QWidget):
         login_button.setMinimumWidth(0)
         card_layout.addWidget(login_button)
 
+        # Indikator selama kata sandi diperiksa di latar belakang
+        self.login_spinner = QProgressBar()
+        self.login_spinner.setRange(0, 0)
+        self.login_spinner.setTextVisible(False)
+        self.login_spinner.setMaximumHeight(6)
+        self.login_status = QLabel("Memeriksa kata sandi...")
+        self.login_status.setStyleSheet("color: #aaa; font-size: 13px;")
+        self.login_status.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        card_layout.addWidget(self.login_spinner)
+        card_layout.addWidget(self.login_status)
+        self.set_busy(False)
+
         main_layout.addWidget(card, alignment=Qt.AlignmentFlag.AlignCenter)
         # Spacer bawah
         main_layout.addSpacerItem(QSpacerItem(20, 60, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Expanding))
@@ -105,16 +131,40 @@ class LoginWindow(QWidget):
         self.setLayout(main_layout)
         self.setStyleSheet("background: #181a20;")
 
+    def set_busy(self, busy):
+        self.login_spinner.setVisible(busy)
+        self.login_status.setVisible(busy)
+        for widget in (self.username_input, self.password_input, self.login_button):
+            widget.setEnabled(not busy)
+
     def login(self):
+        if self.login_pending:
+            return
         username = self.username_input.text()
         password = self.password_input.text()
-        
-        role = self.db.verify_user(username, password)
+
+        self.login_pending = True
+        self.set_busy(True)
+        job = self.login_job = Job("Login", self.db.manager.db_path, verify_login, username, password)
+        job.signals.finished.connect(lambda result: self.login_finished(username, *result))
+        job.signals.failed.connect(self.login_failed)
+        self.login_pool.start(job)
+
+    def login_finished(self, username, role, throttled_message):
+        self.login_pending = False
+        self.set_busy(False)
         if role:
             self.main_window.show_main_window(role, username)
+        elif throttled_message:
+            QMessageBox.warning(self, "Error", throttled_message)
         else:
             QMessageBox.warning(self, "Error", "Nama pengguna atau kata sandi tidak valid!")
 
+    def login_failed(self, message):
+        self.login_pending = False
+        self.set_busy(False)
+        QMessageBox.critical(self, "Error", f"Gagal memeriksa login: {message}")
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -127,8 +177,8 @@ class MainWindow(QMainWindow):
         self.setCentralWidget(self.stacked_widget)
         
         # Create admin and employee views
-        self.admin_view = AdminView(main_window=self)
-        self.employee_view = EmployeeView(main_window=self)
+        self.admin_view = AdminView(main_window=self, db=self.db)
+        self.employee_view = EmployeeView(main_window=self, db=self.db)
         
         # Add views to stacked widget
         self.stacked_widget.addWidget(self.admin_view)
@@ -148,21 +198,34 @@ class MainWindow(QMainWindow):
             # For employee view, we need to set the employee info
             employee = self.db.get_employee(nip=username)
             if employee:
-                self.employee_view.set_employee_info(employee[0])  # employee[0] is the ID
+                self.employee_view.set_employee_info(employee.id)
                 self.stacked_widget.setCurrentWidget(self.employee_view)
             else:
                 QMessageBox.warning(self, "Error", "Employee data not found")
 
+    def closeEvent(self, event):
+        # Hentikan job latar belakang sebelum koneksi database ditutup
+        self.admin_view.job_manager.cancel_all()
+        self.admin_view.job_manager.wait_for_done()
+        self.login_window.login_pool.waitForDone()
+        super().closeEvent(event)
+
     def show_login_window(self):
         self.stacked_widget.setCurrentWidget(self.login_window)
         # Optionally clear login fields
         self.login_window.username_input.clear()
         self.login_window.password_input.clear()
 
+def apply_theme(app):
+    # qt_material (beserta jinja2) hanya dimuat saat aplikasi GUI benar-benar dijalankan
+    import qt_material
+    qt_material.apply_stylesheet(app, theme='dark_blue.xml')
+
 def main():
     app = QApplication(sys.argv)
-    qt_material.apply_stylesheet(app, theme='dark_blue.xml')
+    apply_theme(app)
     window = MainWindow()
+    print(f"[DEBUG] Startup database: {window.db.manager.startup_report()}")
     window.show()
     sys.exit(app.exec())
 
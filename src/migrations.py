@@ -0,0 +1,369 @@
+# Migrasi skema bertingkat, versi disimpan di PRAGMA user_version.
+# Tambahkan migrasi baru di akhir MIGRATIONS dengan nomor versi berikutnya;
+# jangan ubah migrasi yang sudah pernah dirilis. Tiap langkah boleh berupa
+# string SQL atau callable(conn) untuk migrasi data.
+
+
+# Versi 3: payroll_monthly_summary, dijaga trigger. Setiap trigger menghitung ulang satu
+# baris (karyawan, bulan, tahun) dari data mentah lewat index, sehingga hasilnya sama dengan
+# agregasi penuh dan tidak menumpuk selisih pembulatan. Rumus gaji bersih sama dengan
+# payroll_engine: gaji pokok + tunjangan - potongan - (gaji pokok / hari dalam bulan) * hari Alpha.
+# Versi 4 membuat ulang tabel dan trigger yang sama dengan rumus integer (lihat _V4_NET_SALARY).
+_V3_NET_SALARY = "{basic} + {allowances} - {deductions} - {basic} / {days} * {alpha}"
+
+
+def _v3_days_in_month(month, year):
+    return f"CAST(strftime('%d', date(printf('%04d-%02d-01', {year}, {month}), '+1 month', '-1 day')) AS INTEGER)"
+
+
+def _v3_net_salary(formula):
+    # Rumus gaji bersih atas kolom subquery ringkasan
+    return formula.format(basic='basic_salary', allowances='allowances', deductions='deductions',
+                          alpha='alpha_days', days='days_in_month')
+
+
+# Jenis komponen yang dijumlahkan ringkasan, sama dengan payroll_engine.ALLOWANCE_TYPES/DEDUCTION_TYPES
+_SUMMARY_ALLOWANCE_TYPES = "'Tunjangan', 'Lembur', 'Bonus'"
+_SUMMARY_DEDUCTION_TYPES = "'Potongan', 'Pajak', 'Asuransi'"
+
+
+def summary_select(formula):
+    # Agregasi penuh dari data mentah per (tahun, bulan, karyawan), kolom sama dengan
+    # payroll_monthly_summary. Dipakai isi awal migrasi dan payroll_summary (rebuild/check);
+    # trigger _v3_refresh_summary menghitung rumus yang sama untuk satu baris.
+    return f"""
+        SELECT year, month, employee_id, allowances, deductions, alpha_days, {_v3_net_salary(formula)}
+        FROM (
+            SELECT p.year, p.month, e.id AS employee_id, e.basic_salary,
+                   COALESCE(sc.allowances, 0) AS allowances, COALESCE(sc.deductions, 0) AS deductions,
+                   COALESCE(a.alpha_days, 0) AS alpha_days, {_v3_days_in_month('p.month', 'p.year')} AS days_in_month
+            FROM (
+                SELECT employee_id, month, year FROM salary_components
+                UNION
+                SELECT employee_id, CAST(substr(date, 6, 2) AS INTEGER), CAST(substr(date, 1, 4) AS INTEGER)
+                FROM attendance
+            ) p
+            JOIN employees e ON e.id = p.employee_id
+            LEFT JOIN (
+                SELECT employee_id, month, year,
+                       SUM(CASE WHEN component_type IN ({_SUMMARY_ALLOWANCE_TYPES}) THEN amount END) AS allowances,
+                       SUM(CASE WHEN component_type IN ({_SUMMARY_DEDUCTION_TYPES}) THEN amount END) AS deductions
+                FROM salary_components GROUP BY employee_id, month, year
+            ) sc ON sc.employee_id = p.employee_id AND sc.month = p.month AND sc.year = p.year
+            LEFT JOIN (
+                SELECT employee_id, CAST(substr(date, 6, 2) AS INTEGER) AS month,
+                       CAST(substr(date, 1, 4) AS INTEGER) AS year, SUM(status = 'Alpha') AS alpha_days
+                FROM attendance GROUP BY 1, 2, 3
+            ) a ON a.employee_id = p.employee_id AND a.month = p.month AND a.year = p.year
+        )"""
+
+
+def _v3_refresh_summary(employee_id, month, year, formula=_V3_NET_SALARY):
+    start = f"printf('%04d-%02d-01', {year}, {month})"
+    # DELETE + INSERT, bukan INSERT OR REPLACE: klausa OR pada statement pemicu
+    # (mis. INSERT OR IGNORE INTO attendance) menimpa klausa konflik di dalam trigger
+    return f"""
+        DELETE FROM payroll_monthly_summary
+        WHERE year = {year} AND month = {month} AND employee_id = {employee_id};
+        INSERT INTO payroll_monthly_summary
+            (year, month, employee_id, total_allowances, total_deductions, alpha_days, net_salary)
+        SELECT year, month, id, allowances, deductions, alpha_days, {_v3_net_salary(formula)}
+        FROM (
+            SELECT {year} AS year, {month} AS month, e.id, e.basic_salary,
+                   COALESCE((SELECT SUM(amount) FROM salary_components
+                             WHERE year = {year} AND month = {month} AND employee_id = e.id
+                               AND component_type IN ({_SUMMARY_ALLOWANCE_TYPES})), 0) AS allowances,
+                   COALESCE((SELECT SUM(amount) FROM salary_components
+                             WHERE year = {year} AND month = {month} AND employee_id = e.id
+                               AND component_type IN ({_SUMMARY_DEDUCTION_TYPES})), 0) AS deductions,
+                   (SELECT COUNT(*) FROM attendance
+                    WHERE employee_id = e.id AND status = 'Alpha'
+                      AND date BETWEEN {start} AND date({start}, '+1 month', '-1 day')) AS alpha_days,
+                   {_v3_days_in_month(month, year)} AS days_in_month
+            FROM employees e
+            WHERE e.id = {employee_id}
+              -- periode yang sudah tidak punya data sumber tidak disimpan
+              AND (EXISTS (SELECT 1 FROM salary_components
+                           WHERE year = {year} AND month = {month} AND employee_id = e.id)
+                   OR EXISTS (SELECT 1 FROM attendance
+                              WHERE employee_id = e.id
+                                AND date BETWEEN {start} AND date({start}, '+1 month', '-1 day')))
+        );"""
+
+
+def _v3_attendance_period(row):
+    return (f"{row}.employee_id", f"CAST(substr({row}.date, 6, 2) AS INTEGER)",
+            f"CAST(substr({row}.date, 1, 4) AS INTEGER)")
+
+
+def _v3_summary_steps(money_type, formula):
+    employee_net_salary = formula.format(basic='NEW.basic_salary', allowances='total_allowances',
+                                         deductions='total_deductions', alpha='alpha_days',
+                                         days=_v3_days_in_month('month', 'year'))
+    return [
+        f'''CREATE TABLE IF NOT EXISTS payroll_monthly_summary (
+               year INTEGER NOT NULL,
+               month INTEGER NOT NULL,
+               employee_id INTEGER NOT NULL,
+               total_allowances {money_type} NOT NULL,
+               total_deductions {money_type} NOT NULL,
+               alpha_days INTEGER NOT NULL,
+               net_salary {money_type} NOT NULL,
+               PRIMARY KEY (year, month, employee_id)
+           ) WITHOUT ROWID''',
+        '''CREATE INDEX IF NOT EXISTS idx_payroll_monthly_summary_employee
+           ON payroll_monthly_summary (employee_id)''',
+        f"""CREATE TRIGGER IF NOT EXISTS trg_summary_salary_insert AFTER INSERT ON salary_components
+            BEGIN {_v3_refresh_summary('NEW.employee_id', 'NEW.month', 'NEW.year', formula)} END""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_summary_salary_update
+            AFTER UPDATE OF employee_id, component_type, amount, month, year ON salary_components
+            BEGIN {_v3_refresh_summary('OLD.employee_id', 'OLD.month', 'OLD.year', formula)}
+                  {_v3_refresh_summary('NEW.employee_id', 'NEW.month', 'NEW.year', formula)} END""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_summary_salary_delete AFTER DELETE ON salary_components
+            BEGIN {_v3_refresh_summary('OLD.employee_id', 'OLD.month', 'OLD.year', formula)} END""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_summary_attendance_insert AFTER INSERT ON attendance
+            BEGIN {_v3_refresh_summary(*_v3_attendance_period('NEW'), formula)} END""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_summary_attendance_update
+            AFTER UPDATE OF employee_id, date, status ON attendance
+            BEGIN {_v3_refresh_summary(*_v3_attendance_period('OLD'), formula)}
+                  {_v3_refresh_summary(*_v3_attendance_period('NEW'), formula)} END""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_summary_attendance_delete AFTER DELETE ON attendance
+            BEGIN {_v3_refresh_summary(*_v3_attendance_period('OLD'), formula)} END""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_summary_employee_salary
+            AFTER UPDATE OF basic_salary ON employees
+            BEGIN
+                UPDATE payroll_monthly_summary SET net_salary = {employee_net_salary}
+                WHERE employee_id = NEW.id;
+            END""",
+        '''CREATE TRIGGER IF NOT EXISTS trg_summary_employee_delete AFTER DELETE ON employees
+           BEGIN DELETE FROM payroll_monthly_summary WHERE employee_id = OLD.id; END''',
+        # Isi awal dari data yang sudah ada
+        f"""INSERT INTO payroll_monthly_summary
+                (year, month, employee_id, total_allowances, total_deductions, alpha_days, net_salary)
+            {summary_select(formula)}""",
+    ]
+
+
+# Versi 4: uang sebagai INTEGER sen (lihat money.py). Tabel dibuat ulang karena SQLite tidak bisa
+# mengubah tipe kolom; CHECK typeof menolak nilai float yang lolos tanpa dikonversi ke sen.
+# Potongan Alpha dibulatkan ke sen terdekat (half up) dengan pembagian integer.
+_V4_NET_SALARY = "{basic} + {allowances} - {deductions} - ({basic} * {alpha} * 2 + {days}) / (2 * {days})"
+
+# Agregasi ringkasan dengan rumus yang berlaku sekarang (dipakai payroll_summary)
+SUMMARY_SELECT = summary_select(_V4_NET_SALARY)
+
+_V4_SUMMARY_TRIGGERS = (
+    'trg_summary_salary_insert', 'trg_summary_salary_update', 'trg_summary_salary_delete',
+    'trg_summary_attendance_insert', 'trg_summary_attendance_update', 'trg_summary_attendance_delete',
+    'trg_summary_employee_salary', 'trg_summary_employee_delete',
+)
+
+# (tabel, kolom uang, CREATE TABLE dengan placeholder {name})
+_V4_MONEY_TABLES = (
+    ('employees', 'basic_salary', '''
+        CREATE TABLE {name} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nip TEXT UNIQUE NOT NULL,
+            name TEXT NOT NULL,
+            position TEXT NOT NULL,
+            department TEXT NOT NULL,
+            basic_salary INTEGER NOT NULL CHECK (typeof(basic_salary) = 'integer'),
+            join_date DATE NOT NULL,
+            status TEXT NOT NULL
+        )'''),
+    ('salary_components', 'amount', '''
+        CREATE TABLE {name} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            employee_id INTEGER,
+            component_type TEXT NOT NULL,
+            amount INTEGER NOT NULL CHECK (typeof(amount) = 'integer'),
+            month INTEGER NOT NULL,
+            year INTEGER NOT NULL,
+            FOREIGN KEY (employee_id) REFERENCES employees (id)
+        )'''),
+    ('processed_payslips', 'net_salary', '''
+        CREATE TABLE {name} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            employee_id INTEGER NOT NULL,
+            month INTEGER NOT NULL,
+            year INTEGER NOT NULL,
+            net_salary INTEGER NOT NULL CHECK (typeof(net_salary) = 'integer'),
+            pdf_path TEXT NOT NULL,
+            processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(employee_id, month, year),
+            FOREIGN KEY (employee_id) REFERENCES employees (id)
+        )'''),
+)
+
+
+def _v4_integer_money(conn):
+    # Salin tiap tabel ke versi INTEGER (rupiah REAL * 100, dibulatkan), lalu ganti nama.
+    # Nilai AUTOINCREMENT dipertahankan agar id yang pernah dihapus tidak dipakai ulang.
+    for table, money_column, create_sql in _V4_MONEY_TABLES:
+        sequence = conn.execute('SELECT seq FROM sqlite_sequence WHERE name = ?', (table,)).fetchone()
+        columns = [row[1] for row in conn.execute(f'PRAGMA table_info({table})')]
+        values = [f'CAST(ROUND({column} * 100) AS INTEGER)' if column == money_column else column
+                  for column in columns]
+        conn.execute(create_sql.format(name=f'{table}_v4'))
+        conn.execute(f'INSERT INTO {table}_v4 ({", ".join(columns)}) SELECT {", ".join(values)} FROM {table}')
+        conn.execute(f'DROP TABLE {table}')
+        conn.execute(f'ALTER TABLE {table}_v4 RENAME TO {table}')
+        if sequence:
+            conn.execute('DELETE FROM sqlite_sequence WHERE name = ?', (table,))
+            conn.execute('INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)', (table, sequence[0]))
+
+
+MIGRATIONS = [
+    (1, [
+        # get_salary_components (employee_id, month, year) dan payroll_engine
+        # (month, year untuk semua karyawan) memakai index yang sama
+        '''CREATE INDEX IF NOT EXISTS idx_salary_components_period
+           ON salary_components (year, month, employee_id, component_type, amount)''',
+        # get_attendance, update_check_out, cek duplikat record_check_in
+        '''CREATE INDEX IF NOT EXISTS idx_attendance_employee_date
+           ON attendance (employee_id, date, status, check_in, check_out)''',
+        # payroll_engine (date BETWEEN) dan daftar absensi ORDER BY date DESC
+        '''CREATE INDEX IF NOT EXISTS idx_attendance_date
+           ON attendance (date, employee_id, status)''',
+    ]),
+    (2, [
+        # Tabel slip gaji di tab Penggajian: ORDER BY year DESC, month DESC, id DESC
+        '''CREATE INDEX IF NOT EXISTS idx_processed_payslips_period
+           ON processed_payslips (year, month, id)''',
+    ]),
+    # Ringkasan gaji per (tahun, bulan, karyawan) untuk laporan; lihat _v3_summary_steps
+    (3, _v3_summary_steps('REAL', _V3_NET_SALARY)),
+    # Uang sebagai integer sen; ringkasan dibuat ulang dengan kolom dan rumus integer
+    (4, [
+        *(f'DROP TRIGGER IF EXISTS {trigger}' for trigger in _V4_SUMMARY_TRIGGERS),
+        'DROP TABLE IF EXISTS payroll_monthly_summary',
+        _v4_integer_money,
+        # Index ikut terhapus bersama tabel lama
+        '''CREATE INDEX IF NOT EXISTS idx_salary_components_period
+           ON salary_components (year, month, employee_id, component_type, amount)''',
+        '''CREATE INDEX IF NOT EXISTS idx_processed_payslips_period
+           ON processed_payslips (year, month, id)''',
+        *_v3_summary_steps('INTEGER', _V4_NET_SALARY),
+    ]),
+    # Proses gaji yang bisa dilanjutkan: satu baris per run, status per karyawan sebagai checkpoint,
+    # dan hash input slip agar proses ulang hanya membuat slip yang datanya berubah
+    (5, [
+        '''CREATE TABLE IF NOT EXISTS payroll_runs (
+               id INTEGER PRIMARY KEY AUTOINCREMENT,
+               month INTEGER NOT NULL,
+               year INTEGER NOT NULL,
+               status TEXT NOT NULL DEFAULT 'running' CHECK (status IN ('running', 'completed', 'incomplete')),
+               total INTEGER NOT NULL DEFAULT 0,
+               rendered INTEGER NOT NULL DEFAULT 0,
+               skipped INTEGER NOT NULL DEFAULT 0,
+               failed INTEGER NOT NULL DEFAULT 0,
+               started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+               finished_at TIMESTAMP
+           )''',
+        # Run terakhir per periode (lanjutkan run yang belum selesai)
+        '''CREATE INDEX IF NOT EXISTS idx_payroll_runs_period
+           ON payroll_runs (year, month, id)''',
+        '''CREATE TABLE IF NOT EXISTS payroll_run_items (
+               run_id INTEGER NOT NULL REFERENCES payroll_runs (id),
+               employee_id INTEGER NOT NULL,
+               status TEXT NOT NULL DEFAULT 'pending' CHECK (status IN ('pending', 'done', 'failed', 'skipped')),
+               input_hash TEXT NOT NULL,
+               error TEXT,
+               PRIMARY KEY (run_id, employee_id)
+           ) WITHOUT ROWID''',
+        'ALTER TABLE processed_payslips ADD COLUMN input_hash TEXT',
+    ]),
+    # Cache render slip berbasis isi: hash input slip -> salinan PDF di folder cache (payslip_cache.py)
+    (6, [
+        '''CREATE TABLE IF NOT EXISTS payslip_render_cache (
+               input_hash TEXT PRIMARY KEY,
+               pdf_path TEXT NOT NULL,
+               created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+           ) WITHOUT ROWID''',
+    ]),
+    # Mode arsip: pdf_path menunjuk ke zip bulanan dan archive_member ke PDF di dalamnya (payslip_archive.py)
+    (7, [
+        'ALTER TABLE processed_payslips ADD COLUMN archive_member TEXT',
+    ]),
+    # Satu baris absensi per (karyawan, tanggal) agar mesin absensi bisa upsert tanpa SELECT dulu
+    # (attendance_import.py). Baris ganda lama digabung ke baris dengan id terkecil: jam masuk
+    # paling awal dan jam keluar paling akhir; status baris yang dipertahankan tidak berubah.
+    (8, [
+        # Absensi baru hanya mengubah ringkasan jika statusnya Alpha atau periode itu belum punya
+        # baris ringkasan; selain itu hasil hitung ulang sama persis, jadi trigger dilewati
+        'DROP TRIGGER IF EXISTS trg_summary_attendance_insert',
+        f"""CREATE TRIGGER trg_summary_attendance_insert AFTER INSERT ON attendance
+            WHEN NEW.status = 'Alpha' OR NOT EXISTS (
+                SELECT 1 FROM payroll_monthly_summary
+                WHERE year = {_v3_attendance_period('NEW')[2]} AND month = {_v3_attendance_period('NEW')[1]}
+                  AND employee_id = NEW.employee_id)
+            BEGIN {_v3_refresh_summary(*_v3_attendance_period('NEW'), _V4_NET_SALARY)} END""",
+        '''UPDATE attendance
+           SET check_in = (SELECT MIN(a.check_in) FROM attendance a
+                           WHERE a.employee_id = attendance.employee_id AND a.date = attendance.date),
+               check_out = (SELECT MAX(a.check_out) FROM attendance a
+                            WHERE a.employee_id = attendance.employee_id AND a.date = attendance.date)
+           WHERE id IN (SELECT MIN(id) FROM attendance GROUP BY employee_id, date HAVING COUNT(*) > 1)''',
+        '''DELETE FROM attendance
+           WHERE id NOT IN (SELECT MIN(id) FROM attendance GROUP BY employee_id, date)''',
+        '''CREATE UNIQUE INDEX IF NOT EXISTS idx_attendance_employee_day
+           ON attendance (employee_id, date)''',
+    ]),
+    # Halaman keyset daftar komponen gaji per periode (WHERE year/month, ORDER BY id) tanpa
+    # mengurutkan ulang seluruh bulan di setiap halaman
+    (9, [
+        '''CREATE INDEX IF NOT EXISTS idx_salary_components_period_id
+           ON salary_components (year, month, id)''',
+    ]),
+    # Nama slip sekarang memuat employee_id. Sebelumnya karyawan dengan nama sama berbagi satu PDF
+    # atau member arsip, dan isinya milik siapa pun yang dirender terakhir. Baris seperti itu dilepas
+    # dari file-nya (pdf_path kosong, tanpa hash) sehingga tidak bisa dibuka dan dibuat ulang oleh
+    # proses gaji berikutnya.
+    (10, [
+        '''UPDATE processed_payslips SET pdf_path = '', archive_member = NULL, input_hash = NULL
+           WHERE (pdf_path, COALESCE(archive_member, '')) IN (
+               SELECT pdf_path, COALESCE(archive_member, '') FROM processed_payslips
+               GROUP BY pdf_path, COALESCE(archive_member, '') HAVING COUNT(*) > 1)''',
+    ]),
+    # Penghitung perubahan data, dinaikkan Database._record_change di transaksi yang sama dengan
+    # perubahannya. Cache dalam proses (payroll_engine.PayrollCache) membandingkannya sebelum
+    # menyajikan hasil, sehingga tulisan dari proses lain (CLI, impor, cron) ikut terdeteksi.
+    (11, [
+        '''CREATE TABLE IF NOT EXISTS data_changes (
+               id INTEGER PRIMARY KEY CHECK (id = 1),
+               version INTEGER NOT NULL
+           )''',
+        'INSERT OR IGNORE INTO data_changes (id, version) VALUES (1, 0)',
+    ]),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn):
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+
+def migrate(conn):
+    # Jalankan semua migrasi yang belum diterapkan, masing-masing dalam satu transaksi
+    if conn.in_transaction:
+        conn.commit()
+    current = get_schema_version(conn)
+    for version, steps in MIGRATIONS:
+        if version <= current:
+            continue
+        try:
+            conn.execute('BEGIN')
+            for step in steps:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.execute(step)
+            conn.execute(f'PRAGMA user_version = {version}')
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        print(f"[DEBUG] Database: Migrasi skema ke versi {version} selesai.")
+        current = version
+    return current
@@ -0,0 +1,36 @@
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+
+# Uang disimpan dan dijumlahkan sebagai integer sen (1 rupiah = 100 sen), bukan float,
+# sehingga total jutaan komponen tetap eksak. Konversi hanya terjadi di batas: input form,
+# impor/ekspor file dan tampilan.
+SEN_PER_RUPIAH = 100
+_CENT = Decimal('0.01')
+
+
+def to_sen(value):
+    # Rupiah (int/float/str/Decimal, boleh dengan pemisah ribuan ",") -> integer sen.
+    # Pecahan di bawah sen dibulatkan half up; ValueError jika bukan angka.
+    if isinstance(value, bool):
+        raise ValueError(f"Nilai uang tidak valid: {value!r}")
+    if isinstance(value, int):
+        return value * SEN_PER_RUPIAH
+    if isinstance(value, float):
+        # repr() memberi desimal terpendek (0.1 -> "0.1"), bukan ekspansi biner penuh
+        value = repr(value)
+    try:
+        rupiah = Decimal(str(value).strip().replace(',', ''))
+    except InvalidOperation:
+        raise ValueError(f"Nilai uang tidak valid: {value!r}")
+    if not rupiah.is_finite():
+        raise ValueError(f"Nilai uang tidak valid: {value!r}")
+    return int(rupiah.quantize(_CENT, rounding=ROUND_HALF_UP) * SEN_PER_RUPIAH)
+
+
+def to_rupiah(sen):
+    # Integer sen -> Decimal rupiah dengan dua angka desimal (untuk form dan ekspor)
+    return Decimal(sen).scaleb(-2)
+
+
+def format_rupiah(sen):
+    # Format tampilan yang sama dengan sebelumnya: 5,000,000.00
+    return f"{to_rupiah(sen):,.2f}"
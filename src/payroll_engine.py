@@ -0,0 +1,377 @@
+import calendar
+import contextlib
+import os
+import tempfile
+import threading
+from collections import defaultdict
+
+import payslip_archive
+import payslip_cache
+from database import DELETED, INSERTED
+from payslip_renderer import PayslipRecord, RenderReport, payslip_input_hash, render_payslips, render_pool
+
+# Folder slip gaji PDF (relatif terhadap folder kerja aplikasi)
+PAYSLIP_DIR = os.path.join('resources', 'payslips')
+
+# Tipe komponen yang menambah / mengurangi gaji bersih
+ALLOWANCE_TYPES = ("Tunjangan", "Lembur", "Bonus")
+DEDUCTION_TYPES = ("Potongan", "Pajak", "Asuransi")
+
+# Jumlah slip per checkpoint proses gaji; run yang terhenti dilanjutkan dari checkpoint terakhir
+CHECKPOINT_SIZE = 250
+
+
+class PayrollResult:
+    __slots__ = ("employee_id", "name", "basic_salary", "total_allowances",
+                 "total_deductions", "alpha_days", "deduction_for_alpha", "net_salary")
+
+    def __init__(self, employee_id, name, basic_salary, total_allowances,
+                 total_deductions, alpha_days, deduction_for_alpha, net_salary):
+        self.employee_id = employee_id
+        self.name = name
+        self.basic_salary = basic_salary
+        self.total_allowances = total_allowances
+        self.total_deductions = total_deductions
+        self.alpha_days = alpha_days
+        self.deduction_for_alpha = deduction_for_alpha
+        self.net_salary = net_salary
+
+
+def month_bounds(month, year):
+    days_in_month = calendar.monthrange(year, month)[1]
+    start_date = f"{year:04d}-{month:02d}-01"
+    end_date = f"{year:04d}-{month:02d}-{days_in_month:02d}"
+    return start_date, end_date, days_in_month
+
+
+# Di atas jumlah karyawan yang hilang dari cache ini, hitung ulang satu bulan penuh
+MAX_PARTIAL_RECOMPUTE = 500
+
+
+def compute_payroll(db, month, year, employee_ids=None):
+    # Satu range read di payroll_monthly_summary (dijaga trigger, lihat migrations versi 3 dan 4).
+    # Karyawan tanpa komponen/absensi bulan itu tidak punya baris ringkasan: gaji bersih = gaji pokok.
+    # Semua nilai uang integer sen; potongan Alpha adalah sisa rumus yang sudah dibulatkan di SQL.
+    # Jangan dipanggil langsung untuk tampilan/laporan; pakai month_payroll()/employee_payroll() yang di-cache.
+    if employee_ids is None:
+        employee_filter, ids = '', ()
+    else:
+        ids = tuple(employee_ids)
+        employee_filter = f"WHERE e.id IN ({', '.join('?' * len(ids))})"
+    db.cursor.execute(f'''
+        SELECT e.id, e.name, e.basic_salary,
+               COALESCE(s.total_allowances, 0), COALESCE(s.total_deductions, 0),
+               COALESCE(s.alpha_days, 0), COALESCE(s.net_salary, e.basic_salary)
+        FROM employees e
+        LEFT JOIN payroll_monthly_summary s
+               ON s.year = ? AND s.month = ? AND s.employee_id = e.id
+        {employee_filter}
+        ORDER BY e.id
+    ''', (year, month, *ids))
+
+    results = []
+    for employee_id, name, basic_salary, allowances, deductions, alpha_days, net_salary in db.cursor.fetchall():
+        # Potongan sederhana untuk hari Alpha (gaji pokok / jumlah hari * hari alpha)
+        deduction_for_alpha = basic_salary + allowances - deductions - net_salary
+        results.append(PayrollResult(employee_id, name, basic_salary, allowances,
+                                     deductions, alpha_days, deduction_for_alpha, net_salary))
+    return results
+
+
+class PayrollCache:
+    # Memo PayrollResult per (employee_id, bulan, tahun), dibagi semua Database untuk file yang sama.
+    # Entri dibuang lewat ChangeEvent: komponen gaji/absensi per periode, data karyawan per employee_id.
+    # Tulisan dari proses lain tidak memancarkan ChangeEvent; itu terlihat dari data_changes.version
+    # (Database.get_data_version) yang melompat, dan seluruh cache dibuang.
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._months = {}  # (month, year) -> {employee_id: PayrollResult}
+        self._complete = set()  # (month, year) yang memuat semua karyawan
+        self._generation = 0  # naik setiap invalidasi; hasil hitungan yang basi tidak disimpan
+        self._version = None  # data_changes.version yang sudah diperhitungkan cache
+        self.hits = 0
+        self.misses = 0
+
+    def _clear(self):
+        self._generation += 1
+        self._months.clear()
+        self._complete.clear()
+
+    def _sync_version(self, version, own_change):
+        # Dipanggil dengan _lock. own_change: version berasal dari ChangeEvent proses ini, yang
+        # menaikkan penghitung tepat satu. Selisih lain berarti ada perubahan yang tidak diumumkan.
+        if version is None:
+            return
+        expected = version - 1 if own_change else version
+        if self._version is not None and version > self._version and expected != self._version:
+            self._clear()
+        if self._version is None or version > self._version:
+            self._version = version
+
+    def validate(self, db):
+        # Sebelum menyajikan entri: buang semuanya jika data diubah dari luar proses ini
+        version = db.get_data_version()
+        with self._lock:
+            if self._version is not None and version < self._version:
+                self._clear()  # file database diganti atau dipulihkan
+                self._version = version
+            self._sync_version(version, False)
+
+    def on_change(self, event):
+        with self._lock:
+            self._sync_version(event.version, True)
+            if event.table not in ('salary_components', 'attendance', 'employees', 'payroll_monthly_summary'):
+                return
+            self._generation += 1
+            if event.table == 'payroll_monthly_summary':
+                # Ringkasan dibangun ulang (Database.rebuild_payroll_summary)
+                self._months.clear()
+                self._complete.clear()
+            elif event.table in ('salary_components', 'attendance'):
+                if event.periods is None:
+                    self._months.clear()
+                    self._complete.clear()
+                    return
+                for employee_id, month, year in event.periods:
+                    self._months.get((month, year), {}).pop(employee_id, None)
+                    self._complete.discard((month, year))
+            elif event.table == 'employees':
+                if event.kind == INSERTED:
+                    # Karyawan baru muncul di setiap bulan (minimal dengan gaji pokok)
+                    self._complete.clear()
+                elif event.row_ids is None:
+                    self._months.clear()
+                    self._complete.clear()
+                else:
+                    for key, results in self._months.items():
+                        for employee_id in event.row_ids:
+                            if results.pop(employee_id, None) is not None and event.kind != DELETED:
+                                self._complete.discard(key)
+
+    def month_results(self, db, month, year):
+        key = (month, year)
+        self.validate(db)
+        with self._lock:
+            if key in self._complete:
+                self.hits += 1
+                return list(self._months[key].values())
+            self.misses += 1
+            generation = self._generation
+            cached = dict(self._months.get(key, {}))
+
+        db.cursor.execute('SELECT id FROM employees ORDER BY id')
+        employee_ids = [row[0] for row in db.cursor.fetchall()]
+        missing = [employee_id for employee_id in employee_ids if employee_id not in cached]
+        if len(missing) > MAX_PARTIAL_RECOMPUTE or len(missing) == len(employee_ids):
+            cached = {result.employee_id: result for result in compute_payroll(db, month, year)}
+        elif missing:
+            cached.update((result.employee_id, result) for result in compute_payroll(db, month, year, missing))
+        results = {employee_id: cached[employee_id] for employee_id in employee_ids if employee_id in cached}
+
+        with self._lock:
+            if generation == self._generation:
+                self._months[key] = results
+                self._complete.add(key)
+        return list(results.values())
+
+    def employee_result(self, db, employee_id, month, year):
+        key = (month, year)
+        self.validate(db)
+        with self._lock:
+            result = self._months.get(key, {}).get(employee_id)
+            if result is not None:
+                self.hits += 1
+                return result
+            self.misses += 1
+            generation = self._generation
+
+        results = compute_payroll(db, month, year, [employee_id])
+        result = results[0] if results else None
+        with self._lock:
+            if result is not None and generation == self._generation:
+                self._months.setdefault(key, {})[employee_id] = result
+        return result
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def payroll_cache(db):
+    # Satu cache per file database; berlangganan ChangeEvent saat pertama dibuat
+    with _caches_lock:
+        cache = _caches.get(db.manager.db_path)
+        if cache is None:
+            cache = _caches[db.manager.db_path] = PayrollCache()
+            db.subscribe(cache.on_change)
+        return cache
+
+
+def month_payroll(db, month, year):
+    # Hasil gaji semua karyawan (urut id) untuk satu bulan; dipakai laporan, ekspor PDF dan proses gaji
+    return payroll_cache(db).month_results(db, month, year)
+
+
+def employee_payroll(db, employee_id, month, year):
+    return payroll_cache(db).employee_result(db, employee_id, month, year)
+
+
+def load_month_details(db, month, year):
+    # Komponen gaji dan jumlah hari per status absensi bulan ini, dikelompokkan per karyawan dalam
+    # satu kali baca. Jumlah hari dihitung SQLite (GROUP BY), baris absensi tidak dibaca ke Python.
+    start_date, end_date, _ = month_bounds(month, year)
+    components = defaultdict(list)
+    for component in db.get_month_salary_components(month, year):
+        components[component.employee_id].append(component)
+
+    histogram = db.get_attendance_histogram(start_date, end_date)
+    attendance_counts = {employee_id: counts for (employee_id, _, _), counts in histogram.items()}
+    return components, attendance_counts
+
+
+def payslip_filename(result, month, year):
+    # employee_id membuat nama unik: karyawan dengan nama sama tidak saling menimpa slip
+    return f"slip_gaji_{result.employee_id}_{result.name.replace(' ', '_')}_{month}_{year}.pdf"
+
+
+def build_payslip_record(result, month, year, components, attendance_counts, filepath):
+    # attendance_counts: status -> jumlah hari (load_month_details)
+    return PayslipRecord(
+        employee_id=result.employee_id,
+        employee_name=result.name,
+        month=month,
+        year=year,
+        basic_salary=result.basic_salary,
+        components=tuple((component.component_type, component.amount) for component in components),
+        deduction_for_alpha=result.deduction_for_alpha,
+        net_salary=result.net_salary,
+        attendance_counts=dict(attendance_counts),
+        days_in_month=calendar.monthrange(year, month)[1],
+        filepath=filepath,
+    )
+
+
+class PayrollRunReport(RenderReport):
+    def __init__(self, run_id, resumed):
+        super().__init__()
+        self.run_id = run_id
+        self.resumed = resumed  # melanjutkan run periode ini yang sebelumnya terhenti
+        self.skipped = []  # employee_id yang slipnya sudah ada dengan input yang sama
+        self.cache_hits = 0  # slip yang disalin dari cache render (tanpa reportlab)
+        self.cache_misses = 0  # slip yang dirender dengan reportlab
+
+
+def run_payroll(db, month, year, payslip_dir, jobs=None, progress=None, cancelled=None, archive=False):
+    # Proses gaji yang idempoten: slip hanya dibuat untuk karyawan yang input slipnya
+    # (hash PayslipRecord) berubah atau PDF-nya hilang. Hasil disimpan per CHECKPOINT_SIZE slip,
+    # sehingga run yang dibatalkan/terhenti dilanjutkan tanpa mengulang slip yang sudah jadi.
+    # Slip yang isinya pernah dirender (hash sama, misalnya koreksi yang dibatalkan) disalin dari payslip_cache.
+    # archive=True: semua slip bulan ini masuk ke satu zip (payslip_archive); PDF dirender di folder
+    # sementara lokal lalu ditambahkan ke arsip per checkpoint, tanpa cache render per file.
+    results = month_payroll(db, month, year)
+    components, attendance_counts = load_month_details(db, month, year)
+    processed = db.get_processed_payslip_hashes(month, year)
+
+    with contextlib.ExitStack() as stack:
+        if archive:
+            archive_file = payslip_archive.archive_path(payslip_dir, month, year)
+            members = payslip_archive.archive_members(archive_file)
+            render_dir = stack.enter_context(tempfile.TemporaryDirectory(prefix='slip_gaji_'))
+        else:
+            render_dir = payslip_dir
+
+        # Slip dilewati hanya jika baris processed_payslips karyawan itu sendiri (per employee_id) punya
+        # hash yang sama dan menunjuk ke file/member miliknya yang masih ada. payslip_filename memuat
+        # employee_id, jadi PDF rekan kerja bernama sama tidak bisa membuat slip dianggap sudah jadi.
+        pending, items, skipped = [], [], []
+        for result in results:
+            pdf_filename = payslip_filename(result, month, year)
+            record = build_payslip_record(result, month, year,
+                                          components.get(result.employee_id, []),
+                                          attendance_counts.get(result.employee_id, {}),
+                                          os.path.join(render_dir, pdf_filename))
+            input_hash = payslip_input_hash(record)
+            stored = processed.get(result.employee_id, (None, None, None))
+            if archive:
+                unchanged = stored == (input_hash, archive_file, pdf_filename) and pdf_filename in members
+            else:
+                unchanged = stored == (input_hash, record.filepath, None) and os.path.exists(record.filepath)
+            if unchanged:
+                items.append((result.employee_id, input_hash, 'skipped'))
+                skipped.append(result.employee_id)
+            else:
+                items.append((result.employee_id, input_hash, 'pending'))
+                pending.append((record, input_hash))
+
+        run_id, resumed = db.start_payroll_run(month, year, len(items))
+        db.set_payroll_run_items(run_id, items)
+        report = PayrollRunReport(run_id, resumed)
+        report.skipped = skipped
+        print(f"[DEBUG] Proses gaji {month}/{year} (run {run_id}{', dilanjutkan' if resumed else ''}): "
+              f"{len(pending)} slip dibuat, {len(skipped)} tidak berubah")
+
+        done = 0
+
+        def chunk_progress(chunk_done, chunk_total):
+            progress(done + chunk_done, len(pending))
+
+        # Satu pool worker untuk semua potongan; PDF dirender paralel dan karyawan yang gagal
+        # tidak dicatat sebagai sudah diproses
+        pool = render_pool(jobs, len(pending))
+        if pool is not None:
+            stack.enter_context(pool)
+        for start in range(0, len(pending), CHECKPOINT_SIZE):
+            if cancelled and cancelled():
+                report.cancelled = True
+                break
+            chunk = pending[start:start + CHECKPOINT_SIZE]
+            hits = []
+            if not archive:
+                cached = db.get_payslip_cache_paths(input_hash for _, input_hash in chunk)
+                hits = [record.employee_id for record, input_hash in chunk
+                        if input_hash in cached and payslip_cache.restore(cached[input_hash], record.filepath)]
+            if progress and hits:
+                progress(done + len(hits), len(pending))
+            hit_ids = set(hits)
+            misses = [(record, input_hash) for record, input_hash in chunk if record.employee_id not in hit_ids]
+            done += len(hits)
+            chunk_report = render_payslips([record for record, _ in misses], jobs=jobs,
+                                           progress=chunk_progress if progress else None,
+                                           cancelled=cancelled, executor=pool)
+            rendered = set(chunk_report.rendered)
+            finished = [(record, input_hash) for record, input_hash in chunk
+                        if record.employee_id in hit_ids or record.employee_id in rendered]
+            if archive:
+                payslip_archive.append_members(archive_file, [(os.path.basename(record.filepath), record.filepath)
+                                                              for record, _ in finished])
+                for record, _ in misses:
+                    if os.path.exists(record.filepath):
+                        os.remove(record.filepath)
+                cache_entries = []
+                payslips = [(record.employee_id, month, year, record.net_salary, archive_file,
+                             os.path.basename(record.filepath), input_hash) for record, input_hash in finished]
+            else:
+                cache_entries = [(input_hash, payslip_cache.store(record.filepath, payslip_dir, input_hash))
+                                 for record, input_hash in misses if record.employee_id in rendered]
+                payslips = [(record.employee_id, month, year, record.net_salary, record.filepath, None, input_hash)
+                            for record, input_hash in finished]
+            with db.transaction():
+                db.add_payslip_cache_entries(cache_entries)
+                db.checkpoint_payroll_run(run_id, payslips, chunk_report.failures)
+            report.rendered.extend(hits)
+            report.rendered.extend(chunk_report.rendered)
+            report.failures.update(chunk_report.failures)
+            report.cache_hits += len(hits)
+            report.cache_misses += len(chunk_report.rendered)
+            done += len(misses)
+            if chunk_report.cancelled:
+                report.cancelled = True
+                break
+
+    if archive and not report.cancelled:
+        # Buang versi lama slip yang dibuat ulang dan slip karyawan yang sudah dihapus
+        if payslip_archive.compact(archive_file, (payslip_filename(result, month, year) for result in results)):
+            print(f"[DEBUG] Arsip slip gaji {archive_file} dipadatkan")
+    db.finish_payroll_run(run_id, 'incomplete' if report.failures or report.cancelled else 'completed')
+    print(f"[DEBUG] Cache slip gaji: {report.cache_hits} hit, {report.cache_misses} miss")
+    return results, report
@@ -0,0 +1,55 @@
+import argparse
+import time
+
+from database import DB_PATH, Database
+from migrations import SUMMARY_SELECT  # agregasi penuh, SQL yang sama dengan isi awal migrasi
+
+
+def rebuild_summary(db):
+    # Bangun ulang seluruh payroll_monthly_summary dari data mentah (Database.rebuild_payroll_summary)
+    start = time.perf_counter()
+    count = db.rebuild_payroll_summary()
+    print(f"[DEBUG] Ringkasan gaji: {count} baris dibangun ulang dalam {time.perf_counter() - start:.2f} s")
+    return count
+
+
+def check_summary(db):
+    # Bandingkan ringkasan dengan agregasi penuh; kembalikan list (year, month, employee_id, masalah)
+    expected = {row[:3]: row[3:] for row in db.cursor.execute(SUMMARY_SELECT).fetchall()}
+    db.cursor.execute('''
+        SELECT year, month, employee_id, total_allowances, total_deductions, alpha_days, net_salary
+        FROM payroll_monthly_summary
+    ''')
+    problems = []
+    for row in db.cursor.fetchall():
+        values = expected.pop(row[:3], None)
+        if values is None:
+            problems.append((*row[:3], "baris ringkasan tanpa data sumber"))
+        elif tuple(row[3:]) != tuple(values):
+            problems.append((*row[:3], f"tersimpan {tuple(row[3:])}, seharusnya {tuple(values)}"))
+    problems.extend((*key, "baris ringkasan hilang") for key in expected)
+    problems.sort()
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Periksa atau bangun ulang tabel payroll_monthly_summary")
+    parser.add_argument('--db', default=DB_PATH, help=f"path database (default {DB_PATH})")
+    parser.add_argument('--rebuild', action='store_true', help="bangun ulang ringkasan dari data mentah")
+    args = parser.parse_args()
+
+    db = Database(args.db)
+    try:
+        if args.rebuild:
+            rebuild_summary(db)
+        problems = check_summary(db)
+        for year, month, employee_id, message in problems:
+            print(f"{year:04d}-{month:02d} karyawan {employee_id}: {message}")
+        print(f"{len(problems)} baris ringkasan tidak konsisten")
+        return 1 if problems else 0
+    finally:
+        db.close()
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,82 @@
+import os
+import tempfile
+import warnings
+import zipfile
+
+# Mode arsip proses gaji: semua slip satu bulan disimpan sebagai member di satu file zip
+# (<folder slip>/slip_gaji_<bulan>_<tahun>.zip), bukan puluhan ribu file PDF kecil.
+# processed_payslips.pdf_path menunjuk ke file zip dan archive_member ke nama PDF di dalamnya;
+# slip dibaca satu per satu lewat central directory zip tanpa mengekstrak seluruh arsip.
+#
+# Slip yang dibuat ulang ditambahkan ke akhir arsip (mode 'a'), sehingga setiap checkpoint
+# langsung tersimpan; zipfile membaca member terakhir dengan nama yang sama. Arsip dipadatkan
+# (member lama dibuang) jika jumlah member lebih dari COMPACT_RATIO kali jumlah slip aktif.
+COMPACT_RATIO = 2
+
+# Folder sementara untuk slip yang diekstrak saat dibuka dari aplikasi
+EXTRACT_DIR = os.path.join(tempfile.gettempdir(), 'payroll_payslips')
+
+
+def archive_path(payslip_dir, month, year):
+    return os.path.join(payslip_dir, f"slip_gaji_{month}_{year}.zip")
+
+
+def archive_members(path):
+    # Nama member di arsip (set kosong jika arsip belum ada)
+    if not os.path.exists(path):
+        return set()
+    with zipfile.ZipFile(path) as archive:
+        return set(archive.namelist())
+
+
+def append_members(path, files):
+    # files: list of (member, filepath). PDF reportlab sudah terkompresi, jadi disimpan tanpa deflate.
+    if not files:
+        return
+    with warnings.catch_warnings():
+        # Member dengan nama sama (slip dibuat ulang) memang disengaja
+        warnings.simplefilter('ignore', UserWarning)
+        with zipfile.ZipFile(path, 'a', compression=zipfile.ZIP_STORED) as archive:
+            for member, filepath in files:
+                archive.write(filepath, member)
+
+
+def compact(path, live_members):
+    # Tulis ulang arsip hanya dengan versi terakhir slip aktif; False jika belum perlu.
+    # Member yang bukan slip aktif (karyawan dihapus, nama slip format lama) langsung dibuang.
+    live_members = set(live_members)
+    if not os.path.exists(path):
+        return False
+    with zipfile.ZipFile(path) as archive:
+        entries = archive.infolist()
+        if (len(entries) <= COMPACT_RATIO * len(live_members)
+                and all(info.filename in live_members for info in entries)):
+            return False
+        latest = {}
+        for info in entries:
+            if info.filename in live_members:
+                latest[info.filename] = info
+        with zipfile.ZipFile(path + '.tmp', 'w', compression=zipfile.ZIP_STORED) as compacted:
+            for info in sorted(latest.values(), key=lambda info: info.header_offset):
+                compacted.writestr(info, archive.read(info))
+    os.replace(path + '.tmp', path)
+    return True
+
+
+def read_member(path, member):
+    with zipfile.ZipFile(path) as archive:
+        return archive.read(member)
+
+
+def payslip_file(pdf_path, archive_member=None):
+    # Path PDF yang bisa dibuka: file slip biasa apa adanya, atau satu member arsip
+    # yang diekstrak ke EXTRACT_DIR
+    if not pdf_path:
+        raise FileNotFoundError("slip gaji perlu dibuat ulang, jalankan lagi proses gaji bulan ini")
+    if not archive_member:
+        return pdf_path
+    os.makedirs(EXTRACT_DIR, exist_ok=True)
+    target = os.path.join(EXTRACT_DIR, os.path.basename(archive_member))
+    with open(target, 'wb') as output:
+        output.write(read_member(pdf_path, archive_member))
+    return target
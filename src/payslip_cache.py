@@ -0,0 +1,31 @@
+import os
+import shutil
+
+# Cache render slip gaji berbasis isi: PDF disimpan sekali per hash input slip
+# (payslip_renderer.payslip_input_hash) di <folder slip>/.cache/ab/abcdef....pdf dan dicatat di
+# tabel payslip_render_cache. Slip dengan hash yang sudah pernah dirender cukup disalin, tanpa reportlab.
+# Folder .cache boleh dihapus kapan saja; entri yang file-nya hilang dianggap miss dan dirender ulang.
+CACHE_DIRNAME = '.cache'
+
+
+def cache_path(payslip_dir, input_hash):
+    return os.path.join(payslip_dir, CACHE_DIRNAME, input_hash[:2], f"{input_hash}.pdf")
+
+
+def restore(cached_path, filepath):
+    # Salin PDF dari cache ke lokasi slip; False jika file cache sudah tidak ada
+    try:
+        shutil.copyfile(cached_path, filepath)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def store(filepath, payslip_dir, input_hash):
+    # Simpan salinan PDF yang baru dirender ke cache; mengembalikan path cache
+    path = cache_path(payslip_dir, input_hash)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Lewat file sementara agar cache tidak pernah berisi PDF setengah jadi
+    shutil.copyfile(filepath, path + '.tmp')
+    os.replace(path + '.tmp', path)
+    return path
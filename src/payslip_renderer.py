@@ -0,0 +1,287 @@
+import contextlib
+import hashlib
+import json
+import os
+from typing import NamedTuple
+
+from database import ATTENDANCE_STATUSES
+from money import format_rupiah
+
+# Di bawah jumlah ini render langsung di proses utama; biaya start worker lebih mahal
+MIN_PARALLEL_PAYSLIPS = 8
+
+# Naikkan jika tampilan slip berubah, agar semua slip dibuat ulang pada proses gaji berikutnya
+PAYSLIP_TEMPLATE_VERSION = 2
+
+
+class PayslipRecord(NamedTuple):
+    # Data polos (tanpa objek Qt/sqlite) agar bisa dikirim ke worker process
+    employee_id: int
+    employee_name: str
+    month: int
+    year: int
+    basic_salary: int  # semua nilai uang dalam integer sen (money.py)
+    components: tuple  # ((component_type, amount), ...)
+    deduction_for_alpha: int
+    net_salary: int
+    attendance_counts: dict  # status -> jumlah hari
+    days_in_month: int
+    filepath: str
+
+
+def payslip_input_hash(record):
+    # Sidik jari isi PDF (tanpa lokasi file); slip dengan hash sama menghasilkan PDF yang sama
+    data = dict(record._asdict(), template_version=PAYSLIP_TEMPLATE_VERSION)
+    del data['filepath']
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class RenderReport:
+    def __init__(self):
+        self.rendered = []  # employee_id yang berhasil dibuat PDF-nya
+        self.failures = {}  # employee_id -> pesan error
+        self.cancelled = False
+
+    @property
+    def ok(self):
+        return not self.failures
+
+
+def _pdf_number(value):
+    return ('%.2f' % value).rstrip('0').rstrip('.')
+
+
+class PayslipTemplate:
+    # Slip gaji digambar langsung sebagai operator PDF, tanpa layout platypus per slip.
+    # Semua bagian tetap (teks statis, posisi baris tabel, warna, garis) diformat sekali per
+    # proses; setiap slip hanya memformat teks variabel dan lebar kolom jumlah.
+    # Posisi sama dengan layout platypus lama: halaman letter, margin 1 inci, Helvetica 10.
+    PAGE_TOP = 714  # batas atas frame (margin atas + padding)
+    PAGE_BOTTOM = 78
+    LEFT = 78
+    RIGHT = 534
+    LEADING = 12
+    FONT_SIZE = 10
+    TABLE_LEFT = 108
+    TABLE_SPLIT = 360  # 3.5 inci kolom tipe komponen
+    TABLE_RIGHT = 504  # + 2 inci kolom jumlah
+    TABLE_TOP = 630  # tabel halaman pertama, di bawah nama dan gaji pokok
+    ROW_HEIGHT = 18
+    CELL_PADDING = 6
+    TEXT_OFFSET = 5  # baseline teks di atas garis bawah sel
+    HEADER_FILL = '.8 .8 .8 rg'  # #CCCCCC
+    TOTAL_FILL = '.933333 .933333 .933333 rg'  # #EEEEEE
+
+    def __init__(self):
+        from reportlab.lib.pagesizes import letter
+        from reportlab.pdfbase.pdfmetrics import stringWidth
+
+        self.pagesize = letter
+        self.font = 'Helvetica'
+        self.bold_font = 'Helvetica-Bold'
+        self.string_width = stringWidth
+        # Font standar memakai WinAnsiEncoding (cp1252); tabel escape string PDF per byte
+        self._escape = [chr(b) if 32 <= b < 127 and b not in (40, 41, 92) else
+                        ('\\' + chr(b) if b in (40, 41, 92) else '\\%03o' % b) for b in range(256)]
+        self.center = (self.LEFT + self.RIGHT) / 2
+        self.title = self._text_at((self.LEFT + self.RIGHT - self._width("SLIP GAJI KARYAWAN")) / 2,
+                                   self.PAGE_TOP - 10, "SLIP GAJI KARYAWAN")
+        self.closing = [(self.RIGHT - self._width(text), text) for text in ("Hormat kami,", "Admin Perusahaan")]
+        self.header = ("Tipe Komponen", "Jumlah")
+        self.header_right_x = _pdf_number(self.TABLE_RIGHT - self.CELL_PADDING
+                                          - self._width("Jumlah", self.bold_font))
+        self.label_x = _pdf_number(self.TABLE_LEFT + self.CELL_PADDING)
+        # Operator isian dan garis satu baris tabel, per posisi atas baris yang mungkin
+        self._rows = {}
+
+    def _width(self, text, font=None):
+        return self.string_width(text, font or self.font, self.FONT_SIZE)
+
+    def _string(self, text):
+        escape = self._escape
+        return '(' + ''.join([escape[b] for b in text.encode('cp1252', 'replace')]) + ')'
+
+    def _text_at(self, x, y, text):
+        return f"1 0 0 1 {_pdf_number(x)} {_pdf_number(y)} Tm {self._string(text)} Tj"
+
+    def _row_ops(self, top):
+        # (kotak isian, garis sel, baseline teks) untuk baris tabel dengan sisi atas di top
+        ops = self._rows.get(top)
+        if ops is None:
+            bottom = top - self.ROW_HEIGHT
+            box = (f"{self.TABLE_LEFT} {_pdf_number(bottom)} {self.TABLE_RIGHT - self.TABLE_LEFT} "
+                   f"{self.ROW_HEIGHT} re")
+            grid = (f"n {box} S n {self.TABLE_SPLIT} {_pdf_number(bottom)} m "
+                    f"{self.TABLE_SPLIT} {_pdf_number(top)} l S")
+            ops = self._rows[top] = (f"n {box} f*", grid, _pdf_number(bottom + self.TEXT_OFFSET))
+        return ops
+
+    def render(self, record):
+        from reportlab.pdfgen.canvas import Canvas
+
+        canvas = Canvas(record.filepath, pagesize=self.pagesize)
+        # Operator ganti font dari text object reportlab (setFont juga mendaftarkan font di dokumen ini).
+        # Font dan leading termasuk graphics state, jadi tetap berlaku setelah blok teks dibuka ulang.
+        fonts = {}
+        for font in (self.font, self.bold_font):
+            text = canvas.beginText()
+            text.setFont(font, self.FONT_SIZE)
+            fonts[font] = f"ET {text.getCode()} BT"
+        page = _PayslipPage(self, canvas, fonts)
+
+        page.text(self.font, self.title)
+        month_line = f"Bulan: {record.month} Tahun: {record.year}"
+        page.text(self.font, self._text_at(self.center - self._width(month_line) / 2, self.PAGE_TOP - 36.4,
+                                           month_line))
+        page.text(self.font, self._text_at(self.LEFT, self.PAGE_TOP - 62.8,
+                                           f"Nama Karyawan: {record.employee_name}"))
+        page.text(self.font, self._text_at(self.LEFT, self.PAGE_TOP - 74.8,
+                                           f"Gaji Pokok: Rp {format_rupiah(record.basic_salary)}"))
+
+        # Tabel komponen; baris yang tidak muat lanjut ke halaman berikutnya
+        rows = [(comp_type, f"Rp {format_rupiah(amount)}") for comp_type, amount in record.components]
+        if record.deduction_for_alpha > 0:
+            rows.append(('Potongan Absensi (Alpha)', f"Rp {format_rupiah(record.deduction_for_alpha)}"))
+        top = self.TABLE_TOP
+        page.row(top, self.header, self.bold_font, self.HEADER_FILL, self.header_right_x)
+        for row in rows:
+            top = page.next_row(top - self.ROW_HEIGHT)
+            page.row(top, row, self.font)
+        top = page.next_row(top - self.ROW_HEIGHT)
+        page.row(top, ("Total Gaji Bersih", f"Rp {format_rupiah(record.net_salary)}"), self.bold_font,
+                 self.TOTAL_FILL)
+
+        # Ringkasan absensi dan penutup
+        lines = ["Ringkasan Absensi:", f"Total Hari Kerja Bulan Ini: {record.days_in_month} hari"]
+        lines += [f"{status}: {record.attendance_counts.get(status, 0)} hari" for status in ATTENDANCE_STATUSES]
+        y = top - self.ROW_HEIGHT - 24.4
+        if y - 132 < self.PAGE_BOTTOM:
+            page.end()
+            y = self.PAGE_TOP - 10
+        for line in lines:
+            page.text(self.font, self._text_at(self.LEFT, y, line))
+            y -= self.LEADING
+        y -= 36  # spacer 0.5 inci
+        for x, line in self.closing:
+            page.text(self.font, self._text_at(x, y, line))
+            y -= self.LEADING
+        page.end()
+        canvas.save()
+
+
+class _PayslipPage:
+    # Mengumpulkan operator satu halaman dan menulisnya ke canvas sekaligus saat halaman selesai
+    def __init__(self, template, canvas, fonts):
+        self.template = template
+        self.canvas = canvas
+        self.fonts = fonts
+        self.fills = []
+        self.lines = []
+        self.texts = []
+        self.font = None
+
+    def text(self, font, operator):
+        if font != self.font:
+            self.font = font
+            self.texts.append(self.fonts[font])
+        self.texts.append(operator)
+
+    def row(self, top, cells, font, fill=None, right_x=None):
+        template = self.template
+        box, grid, baseline = template._row_ops(top)
+        if fill:
+            self.fills.append(f"{fill} {box}")
+        self.lines.append(grid)
+        label, amount = cells
+        if right_x is None:
+            right_x = _pdf_number(template.TABLE_RIGHT - template.CELL_PADDING - template._width(amount, font))
+        self.text(font, f"1 0 0 1 {template.label_x} {baseline} Tm {template._string(label)} Tj "
+                        f"1 0 0 1 {right_x} {baseline} Tm {template._string(amount)} Tj")
+
+    def next_row(self, top):
+        if top - self.template.ROW_HEIGHT >= self.template.PAGE_BOTTOM:
+            return top
+        self.end()
+        return self.template.PAGE_TOP
+
+    def end(self):
+        # Seperti platypus: semua isian dulu, lalu teks, lalu garis tabel
+        self.canvas.addLiteral('\n'.join(self.fills + ['0 0 0 rg', 'BT'] + self.texts + ['ET']
+                                         + ['q 1 J 1 j 0 0 0 RG 1 w'] + self.lines + ['Q']))
+        self.canvas.showPage()
+        self.fills = []
+        self.lines = []
+        self.texts = []
+        self.font = None
+
+
+_template = None
+
+
+def payslip_template():
+    # Satu template per proses (termasuk setiap worker process)
+    global _template
+    if _template is None:
+        _template = PayslipTemplate()
+    return _template
+
+
+def render_payslip(record):
+    # reportlab baru dimuat saat slip pertama dibuat (termasuk di worker process),
+    # agar tidak ikut memperlambat pembukaan aplikasi
+    payslip_template().render(record)
+    return record.employee_id
+
+
+def render_pool(jobs, total):
+    # ProcessPoolExecutor yang bisa dipakai ulang oleh beberapa render_payslips (None = render serial)
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or total < MIN_PARALLEL_PAYSLIPS:
+        return None
+    from concurrent.futures import ProcessPoolExecutor
+    return ProcessPoolExecutor(max_workers=jobs)
+
+
+def render_payslips(records, jobs=None, progress=None, cancelled=None, executor=None):
+    # Render semua slip; kegagalan satu karyawan dicatat tanpa menghentikan run.
+    # progress(done, total) dipanggil di proses pemanggil setiap satu slip selesai;
+    # jika cancelled() bernilai True, slip yang belum mulai dibatalkan.
+    # executor dari render_pool() dipakai bila ada, agar worker tidak dibuat ulang per potongan.
+    records = list(records)
+    report = RenderReport()
+    total = len(records)
+    jobs = jobs or os.cpu_count() or 1
+
+    if executor is None and (jobs == 1 or total < MIN_PARALLEL_PAYSLIPS):
+        for done, record in enumerate(records, start=1):
+            if cancelled and cancelled():
+                report.cancelled = True
+                break
+            try:
+                report.rendered.append(render_payslip(record))
+            except Exception as e:
+                report.failures[record.employee_id] = str(e)
+            if progress:
+                progress(done, total)
+        return report
+
+    from concurrent.futures import CancelledError, as_completed
+    with contextlib.ExitStack() as stack:
+        if executor is None:
+            executor = stack.enter_context(render_pool(jobs, total))
+        futures = {executor.submit(render_payslip, record): record for record in records}
+        for done, future in enumerate(as_completed(futures), start=1):
+            record = futures[future]
+            try:
+                report.rendered.append(future.result())
+            except CancelledError:
+                continue
+            except Exception as e:
+                report.failures[record.employee_id] = str(e)
+            if progress:
+                progress(done, total)
+            if cancelled and not report.cancelled and cancelled():
+                report.cancelled = True
+                for pending in futures:
+                    pending.cancel()
+    return report
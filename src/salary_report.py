@@ -0,0 +1,39 @@
+from money import format_rupiah
+from payroll_engine import month_payroll
+
+REPORT_COLUMNS = ["Nama Karyawan", "Gaji Pokok", "Total Tunjangan/Bonus", "Total Gaji Bersih"]
+
+
+def salary_report_rows(db, month, year):
+    # Hitungan gaji sama dengan proses gaji dan slip (payroll_engine), diambil dari cache bila ada;
+    # laporan lalu ekspor PDF untuk bulan yang sama hanya menghitung sekali
+    return [[
+        result.name,
+        format_rupiah(result.basic_salary),
+        format_rupiah(result.total_allowances),
+        format_rupiah(result.net_salary)
+    ] for result in month_payroll(db, month, year)]
+
+
+def write_salary_report_pdf(report_rows, month, year, filepath):
+    from reportlab.lib.pagesizes import letter
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib.units import inch
+    doc = SimpleDocTemplate(filepath, pagesize=letter)
+    styles = getSampleStyleSheet()
+    story = []
+    story.append(Paragraph(f"Laporan Rekapitulasi Gaji Bulan {month} Tahun {year}", styles['Title']))
+    story.append(Spacer(1, 0.2 * inch))
+    data = [REPORT_COLUMNS] + report_rows
+    table = Table(data, colWidths=[2.5*inch, 1.5*inch, 1.5*inch, 1.5*inch])
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), '#CCCCCC'),
+        ('GRID', (0, 0), (-1, -1), 1, 'black'),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('ALIGN', (1, 0), (-1, -1), 'RIGHT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ]))
+    story.append(table)
+    doc.build(story)
+    return filepath
@@ -0,0 +1,203 @@
+from PyQt6.QtCore import Qt, QAbstractTableModel, QEvent, QModelIndex, QObject, pyqtSignal
+from PyQt6.QtWidgets import QApplication, QStyle, QStyledItemDelegate, QStyleOptionButton
+
+from database import DELETED
+
+PAGE_SIZE = 200
+
+
+def format_cell(value):
+    # Sama seperti tampilan QTableWidget lama: None jadi kosong, sisanya str()
+    return '' if value is None else str(value)
+
+
+class QueryTableModel(QAbstractTableModel):
+    # Model read-only di atas query Database yang dibaca per halaman keyset.
+    # fetch_page(limit, after, **filters) mengembalikan list tuple; kolom pertama tuple
+    # selalu id baris. columns memilih indeks tuple yang ditampilkan.
+    # sort_key(row) adalah kunci halaman (nilai kolom ORDER BY query, mis. ATTENDANCE_PAGE_KEY):
+    # halaman berikutnya dibaca dengan after=sort_key(baris terakhir), sehingga scroll ke
+    # baris ke-sejuta sama murahnya dengan halaman pertama. fetch_rows(ids, **filters) dan
+    # sort_key juga dipakai apply_change() untuk menambal baris tanpa memuat ulang semuanya.
+    def __init__(self, headers, fetch_page, columns=None, formatters=None, page_size=PAGE_SIZE,
+                 fetch_rows=None, sort_key=None, descending=False, parent=None):
+        super().__init__(parent)
+        self.headers = headers
+        self.fetch_page = fetch_page
+        self.columns = columns or list(range(len(headers)))
+        self.formatters = formatters or {}
+        self.page_size = page_size
+        self.fetch_rows = fetch_rows
+        self.sort_key = sort_key
+        self.descending = descending
+        self.filters = {}
+        self.rows = []
+        self._exhausted = False
+        self._positions = None  # id -> indeks baris, dibangun saat dibutuhkan
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.headers[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        value = self.rows[index.row()][self.columns[index.column()]]
+        return self.formatters.get(index.column(), format_cell)(value)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._exhausted:
+            return
+        after = self.sort_key(self.rows[-1]) if self.rows else None
+        page = self.fetch_page(self.page_size, after, **self.filters)
+        if len(page) < self.page_size:
+            self._exhausted = True
+        if page:
+            first = len(self.rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+            self.rows.extend(page)
+            self.endInsertRows()
+            if self._positions is not None:
+                self._positions.update((row[0], i) for i, row in enumerate(page, start=first))
+
+    def set_filters(self, **filters):
+        # Filter server-side (argumen fetch_page/fetch_rows); nilai None berarti semua
+        self.filters = filters
+        self.reload()
+
+    def reload(self):
+        # Buang semua baris lalu baca ulang halaman pertama
+        self.beginResetModel()
+        self.rows = []
+        self._exhausted = False
+        self._positions = None
+        self.endResetModel()
+        self.fetchMore()
+
+    def apply_change(self, event):
+        # Tambal baris yang terdampak ChangeEvent; update satu baris tetap O(1).
+        # Posisi semua baris dicari di indeks sebelum tabel diubah, baris dihapus dari belakang
+        # (posisi di depannya tetap benar) dan disisipkan lewat binary search, jadi indeks
+        # dibangun paling banyak sekali per event, bukan sekali per baris yang berubah
+        if event.row_ids is None or self.fetch_rows is None or self.sort_key is None:
+            self.reload()
+            return
+        row_ids = list(dict.fromkeys(event.row_ids))
+        if event.kind == DELETED:
+            fetched = {}
+        else:
+            # Baris yang tidak lagi cocok dengan filter tidak ikut terbaca dan dihapus dari tabel
+            fetched = {row[0]: row for row in self.fetch_rows(row_ids, **self.filters)}
+        removed, inserted = [], []
+        for row_id in row_ids:
+            row = fetched.get(row_id)
+            position = self._position(row_id)
+            if row is None:
+                # Dihapus, atau sudah dihapus lagi sebelum event ini diproses
+                if position is not None:
+                    removed.append(position)
+            elif position is None:
+                inserted.append(row)
+            elif self.sort_key(row) == self.sort_key(self.rows[position]):
+                self.rows[position] = row
+                self.dataChanged.emit(self.index(position, 0), self.index(position, self.columnCount() - 1))
+            else:
+                removed.append(position)
+                inserted.append(row)
+        if not removed and not inserted:
+            return
+        for position in sorted(removed, reverse=True):
+            self.beginRemoveRows(QModelIndex(), position, position)
+            del self.rows[position]
+            self.endRemoveRows()
+        for row in inserted:
+            self._insert_row(row)
+        self._positions = None
+
+    def _position(self, row_id):
+        if self._positions is None:
+            self._positions = {row[0]: i for i, row in enumerate(self.rows)}
+        return self._positions.get(row_id)
+
+    def _insert_row(self, row):
+        # Binary search posisi sesuai ORDER BY; baris di luar halaman yang sudah
+        # dimuat dilewati karena akan ikut terbaca oleh fetchMore berikutnya.
+        # Tidak memperbarui _positions, apply_change membuangnya sekali di akhir
+        key = self.sort_key(row)
+        low, high = 0, len(self.rows)
+        while low < high:
+            middle = (low + high) // 2
+            other = self.sort_key(self.rows[middle])
+            if (other > key) if self.descending else (other < key):
+                low = middle + 1
+            else:
+                high = middle
+        if low == len(self.rows) and not self._exhausted:
+            return
+        self.beginInsertRows(QModelIndex(), low, low)
+        self.rows.insert(low, row)
+        self.endInsertRows()
+
+    def row_id(self, row):
+        return self.rows[row][0]
+
+    def row_data(self, row):
+        return self.rows[row]
+
+
+class DatabaseChangeRelay(QObject):
+    # Meneruskan ChangeEvent dari Database.subscribe ke GUI thread. Event dari
+    # worker thread (job) maupun GUI thread selalu diantre, sehingga tabel
+    # ditambal setelah mutator selesai dan tidak memakai cursor yang sama di tengah jalan.
+    changed = pyqtSignal(object)
+    _received = pyqtSignal(object)
+
+    def __init__(self, db, parent=None):
+        super().__init__(parent)
+        self._received.connect(self.changed, Qt.ConnectionType.QueuedConnection)
+        listener = self._received.emit
+        db.subscribe(listener)
+        # Lepas langganan saat relay dihapus agar Database tidak memanggil objek Qt yang sudah mati
+        self.destroyed.connect(lambda: db.unsubscribe(listener))
+
+
+class ButtonDelegate(QStyledItemDelegate):
+    # Menggambar tombol di sel tanpa membuat QPushButton per baris;
+    # klik pada sel memancarkan clicked(row).
+    clicked = pyqtSignal(int)
+
+    def __init__(self, text, parent=None):
+        super().__init__(parent)
+        self.text = text
+        self._pressed_row = None
+
+    def paint(self, painter, option, index):
+        button = QStyleOptionButton()
+        button.rect = option.rect.adjusted(4, 2, -4, -2)
+        button.text = self.text
+        button.state = QStyle.StateFlag.State_Enabled | QStyle.StateFlag.State_Raised
+        if self._pressed_row == index.row():
+            button.state |= QStyle.StateFlag.State_Sunken
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawControl(QStyle.ControlElement.CE_PushButton, button, painter, option.widget)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.Type.MouseButtonPress and event.button() == Qt.MouseButton.LeftButton:
+            self._pressed_row = index.row()
+            return True
+        if event.type() == QEvent.Type.MouseButtonRelease and event.button() == Qt.MouseButton.LeftButton:
+            pressed_row, self._pressed_row = self._pressed_row, None
+            if pressed_row == index.row() and option.rect.contains(event.position().toPoint()):
+                self.clicked.emit(index.row())
+            return True
+        return super().editorEvent(event, model, option, index)